@@ -0,0 +1,149 @@
+"""
+Benchmark de latence des endpoints d'agrégation : WSGI synchrone contre ASGI async.
+
+Envoie N requêtes avec une concurrence C et affiche les percentiles de latence
+(p50, p95, p99) pour chaque couple d'endpoints :
+- synchrone : `/api/stats/overview/`, `/api/countries/{id}/`, `/api/pages/games/{id}/`
+- async : `/api/async/stats/overview/`, `/api/async/countries/{id}/`, `/api/async/games/{id}/`
+
+Par défaut les deux piles sont appelées dans le processus (handler WSGI via
+plusieurs threads, handler ASGI via une boucle d'événements) sur la base
+configurée, caches désactivés pour mesurer les requêtes SQL. Avec `--wsgi-url`
+et `--asgi-url`, les requêtes visent deux serveurs lancés séparément, par ex. :
+    gunicorn config.wsgi -w 1 --threads 8 -b :8000
+    uvicorn config.asgi:application --port 8001
+
+Usage :
+    python benchmarks/bench_async.py --requests 400 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Configuration Django
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django
+django.setup()
+
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+
+from predictions.models import OlympicGame, Country
+
+
+DUMMY_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+    'api': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+}
+
+
+def endpoints():
+    """Couples (nom, URL synchrone, URL async) sur le premier pays et le premier jeu."""
+    country_id = Country.objects.values_list('id', flat=True).first()
+    game_id = OlympicGame.objects.values_list('id', flat=True).first()
+    if country_id is None or game_id is None:
+        sys.exit("Base vide : lancer d'abord `python import_data.py`.")
+    return [
+        ('stats overview', '/api/stats/overview/', '/api/async/stats/overview/'),
+        ('country detail', f'/api/countries/{country_id}/', f'/api/async/countries/{country_id}/'),
+        ('game detail', f'/api/pages/games/{game_id}/', f'/api/async/games/{game_id}/'),
+    ]
+
+
+def percentiles(latencies):
+    ordered = sorted(latencies)
+    pick = lambda fraction: ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+    return statistics.median(ordered), pick(0.95), pick(0.99)
+
+
+def timed(call):
+    start = time.perf_counter()
+    status = call()
+    if status != 200:
+        raise RuntimeError(f"Réponse inattendue : {status}")
+    return time.perf_counter() - start
+
+
+def run_threads(call, requests, concurrency):
+    """Latences de `requests` appels de `call()` répartis sur `concurrency` threads."""
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(lambda _: timed(call), range(requests)))
+
+
+def run_in_process_wsgi(url, requests, concurrency):
+    client = Client()
+    return run_threads(lambda: client.get(url).status_code, requests, concurrency)
+
+
+def run_in_process_asgi(url, requests, concurrency):
+    async def main():
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(url)
+                if response.status_code != 200:
+                    raise RuntimeError(f"Réponse inattendue : {response.status_code}")
+                return time.perf_counter() - start
+
+        return await asyncio.gather(*(one() for _ in range(requests)))
+
+    return asyncio.run(main())
+
+
+def run_http(base_url, path, requests, concurrency):
+    def call():
+        with urllib.request.urlopen(base_url.rstrip('/') + path) as response:
+            response.read()
+            return response.status
+    return run_threads(call, requests, concurrency)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--wsgi-url', help="Serveur WSGI déjà lancé (sinon dans le processus).")
+    parser.add_argument('--asgi-url', help="Serveur ASGI déjà lancé (sinon dans le processus).")
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print(f"LATENCE WSGI / ASGI : {args.requests} requêtes, concurrence {args.concurrency}")
+    print("=" * 72)
+    print(f"{'Endpoint':<18}{'Pile':<6}{'p50 (ms)':>12}{'p95 (ms)':>12}{'p99 (ms)':>12}{'req/s':>12}")
+    print("-" * 72)
+
+    with override_settings(CACHES=DUMMY_CACHES, ALLOWED_HOSTS=['*']):
+        for name, sync_url, async_url in endpoints():
+            for stack, run in (
+                ('WSGI', lambda: (
+                    run_http(args.wsgi_url, sync_url, args.requests, args.concurrency) if args.wsgi_url
+                    else run_in_process_wsgi(sync_url, args.requests, args.concurrency)
+                )),
+                ('ASGI', lambda: (
+                    run_http(args.asgi_url, async_url, args.requests, args.concurrency) if args.asgi_url
+                    else run_in_process_asgi(async_url, args.requests, args.concurrency)
+                )),
+            ):
+                start = time.perf_counter()
+                latencies = run()
+                elapsed = time.perf_counter() - start
+                p50, p95, p99 = percentiles(latencies)
+                print(f"{name:<18}{stack:<6}{p50 * 1e3:>12.2f}{p95 * 1e3:>12.2f}"
+                      f"{p99 * 1e3:>12.2f}{len(latencies) / elapsed:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark de l'index d'autocomplétion en mémoire.
+
+Construit un index sur N noms synthétiques puis mesure le temps de réponse
+de saisies typiques (préfixe de prénom, de nom, sous-chaîne), comparé à un
+filtre linéaire équivalent à `LIKE '%x%'`.
+
+Aucune base de données n'est nécessaire : les noms sont générés en mémoire.
+
+Usage :
+    python benchmarks/bench_autocomplete.py --names 300000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+# Configuration Django
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django
+django.setup()
+
+from predictions.autocomplete import AutocompleteIndex, normalize
+
+
+SYLLABLES = ['ma', 'ri', 'ko', 'phe', 'lps', 'an', 'der', 'son', 'li', 'ne', 'to', 'va', 'ch', 'el', 'us', 'bo']
+QUERIES = ['mi', 'phel', 'michael ph', 'erso', 'xyz']
+
+
+def build_names(count, seed=42):
+    rng = random.Random(seed)
+    word = lambda: ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+    names = [f'{word()} {word().upper()}' for _ in range(count)]
+    names[count // 2] = 'Michael PHELPS'
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--names', type=int, default=300000)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    names = build_names(args.names)
+    start = time.perf_counter()
+    index = AutocompleteIndex(('athlete', i, name) for i, name in enumerate(names))
+    build_time = time.perf_counter() - start
+    normalized = [normalize(name) for name in names]
+
+    print("=" * 60)
+    print(f"AUTOCOMPLÉTION SUR {args.names} NOMS (construction {build_time:.2f} s)")
+    print("=" * 60)
+    print(f"{'Saisie':<16}{'index (µs)':>14}{'linéaire (µs)':>16}{'résultats':>12}")
+    print("-" * 60)
+    for query in QUERIES:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            results = index.lookup(query)
+        index_time = (time.perf_counter() - start) / args.repeat
+
+        text = normalize(query)
+        start = time.perf_counter()
+        [name for name in normalized if text in name][:10]
+        linear_time = time.perf_counter() - start
+
+        print(f"{query:<16}{index_time * 1e6:>14.1f}{linear_time * 1e6:>16.1f}{len(results):>12}")
+
+
+if __name__ == '__main__':
+    main()
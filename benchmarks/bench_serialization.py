@@ -0,0 +1,143 @@
+"""
+Benchmark du coût de sérialisation par ligne des listes de l'API.
+
+Compare, pour N médailles :
+1. MedalSerializer (ModelSerializer DRF) sur des instances de modèles
+2. MedalValuesSerializer (chemin rapide) sur des lignes `.values()`
+puis le rendu JSON avec JSONRenderer et ORJSONRenderer, et enfin la
+sélection de 4 champs (`?fields=`) et le format en colonnes (`?format=columnar`).
+
+Aucune base de données n'est nécessaire : les lignes sont construites en mémoire.
+
+Usage :
+    python benchmarks/bench_serialization.py --rows 10000 --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Configuration Django
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django
+django.setup()
+
+from rest_framework.renderers import JSONRenderer
+
+from predictions.models import OlympicGame, Athlete, Country, Medal
+from predictions.renderers import ColumnarRenderer, ORJSONRenderer, orjson
+from predictions.serializers import MedalSerializer, MedalValuesSerializer
+
+
+def build_rows(count):
+    """Construit `count` médailles sous forme d'instances et de lignes `.values()`."""
+    date = datetime(2020, 7, 23, tzinfo=timezone.utc)
+    game = OlympicGame(id=1, game_slug='tokyo-2020', game_name='Tokyo 2020', game_year=2020,
+                       game_season='Summer', game_location='Japan',
+                       game_start_date=date, game_end_date=date)
+    countries = [Country(id=i, country_name=f'Country {i}', country_code='XX',
+                         country_3_letter_code='XXX') for i in range(1, 101)]
+    athletes = [Athlete(id=i, athlete_full_name=f'Athlete {i}',
+                        athlete_url=f'https://olympics.com/en/athletes/{i}') for i in range(1, 1001)]
+
+    instances, rows = [], []
+    for i in range(1, count + 1):
+        country = countries[i % len(countries)]
+        athlete = athletes[i % len(athletes)]
+        medal = Medal(
+            id=i, discipline_title='Athletics', slug_game=game.game_slug,
+            event_title=f'Event {i % 50}', event_gender='Men',
+            medal_type=('GOLD', 'SILVER', 'BRONZE')[i % 3], participant_type='Athlete',
+            participant_title=athlete.athlete_full_name,
+            country=country, athlete=athlete, game=game,
+        )
+        instances.append(medal)
+        rows.append({
+            'id': medal.id, 'discipline_title': medal.discipline_title,
+            'slug_game': medal.slug_game, 'event_title': medal.event_title,
+            'event_gender': medal.event_gender, 'medal_type': medal.medal_type,
+            'participant_type': medal.participant_type,
+            'participant_title': medal.participant_title,
+            'country_id': country.id, 'country__country_name': country.country_name,
+            'athlete_id': athlete.id, 'athlete__athlete_full_name': athlete.athlete_full_name,
+            'game_id': game.id, 'game__game_name': game.game_name,
+        })
+    return instances, rows
+
+
+def best_of(repeat, func):
+    """Meilleur temps (secondes) sur `repeat` exécutions et dernier résultat."""
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    instances, rows = build_rows(args.rows)
+
+    print("=" * 60)
+    print(f"SÉRIALISATION DE {args.rows} MÉDAILLES (meilleur de {args.repeat})")
+    print("=" * 60)
+
+    model_time, model_data = best_of(args.repeat, lambda: MedalSerializer(instances, many=True).data)
+    fast_time, fast_data = best_of(args.repeat, lambda: MedalValuesSerializer.serialize(rows))
+
+    json_time, json_bytes = best_of(args.repeat, lambda: JSONRenderer().render(model_data))
+    if orjson is not None:
+        orjson_time, orjson_bytes = best_of(args.repeat, lambda: ORJSONRenderer().render(fast_data))
+    else:
+        orjson_time, orjson_bytes = None, json_bytes
+
+    per_row = lambda seconds: seconds / args.rows * 1e6
+
+    print(f"{'Étape':<40}{'µs/ligne':>10}")
+    print("-" * 60)
+    print(f"{'MedalSerializer (ModelSerializer)':<40}{per_row(model_time):>10.2f}")
+    print(f"{'MedalValuesSerializer (.values())':<40}{per_row(fast_time):>10.2f}")
+    print(f"{'JSONRenderer':<40}{per_row(json_time):>10.2f}")
+    if orjson_time is not None:
+        print(f"{'ORJSONRenderer':<40}{per_row(orjson_time):>10.2f}")
+    else:
+        print(f"{'ORJSONRenderer':<40}{'orjson absent':>10}")
+    print("-" * 60)
+
+    before = model_time + json_time
+    after = fast_time + (orjson_time if orjson_time is not None else json_time)
+    print(f"{'Total avant':<40}{per_row(before):>10.2f}")
+    print(f"{'Total après':<40}{per_row(after):>10.2f}")
+    print(f"Gain: x{before / after:.1f}")
+    print(f"Sortie JSON identique: {'oui' if json_bytes == orjson_bytes else 'NON'}")
+
+    # Sélection de champs et format en colonnes
+    fields = MedalValuesSerializer.select(['id', 'medal_type', 'discipline_title', 'country_name'])
+    sparse_time, sparse_data = best_of(args.repeat, lambda: MedalValuesSerializer.serialize(rows, fields))
+    columnar_time, columnar_bytes = best_of(args.repeat, lambda: ColumnarRenderer().render(fast_data))
+    sparse_bytes = ORJSONRenderer().render(sparse_data)
+    sparse_columnar_bytes = ColumnarRenderer().render(sparse_data)
+
+    print()
+    print(f"{'Réponse':<40}{'µs/ligne':>10}{'octets/ligne':>14}")
+    print("-" * 64)
+    print(f"{'14 champs, JSON':<40}{per_row(fast_time):>10.2f}{len(orjson_bytes) / args.rows:>14.1f}")
+    print(f"{'14 champs, colonnes':<40}{per_row(fast_time + columnar_time):>10.2f}{len(columnar_bytes) / args.rows:>14.1f}")
+    print(f"{'4 champs (?fields=), JSON':<40}{per_row(sparse_time):>10.2f}{len(sparse_bytes) / args.rows:>14.1f}")
+    print(f"{'4 champs, colonnes':<40}{'':>10}{len(sparse_columnar_bytes) / args.rows:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
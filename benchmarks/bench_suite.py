@@ -0,0 +1,313 @@
+"""
+Suite de benchmarks à plusieurs échelles de données.
+
+Pour chaque échelle (nombre de médailles) :
+1. génère le jeu de données synthétique (`generate_dataset.py`, réutilisé
+   s'il existe déjà pour la même graine) ;
+2. crée une base SQLite dédiée (`DATABASE_PATH`, la base de développement
+   n'est pas touchée) et mesure `import_data.py` complet,
+   `calculate_country_statistics` et `generate_predictions` ;
+3. appelle chaque endpoint de l'API, caches de réponses désactivés : durée
+   du premier appel (index en mémoire à construire), médiane des suivants,
+   statut, taille et nombre de requêtes SQL (en-tête `Server-Timing`, ou
+   mesure finale de la réponse pour les exports en streaming).
+
+Chaque échelle tourne dans un processus séparé. Les résultats sont écrits en
+JSON dans benchmarks/results/ et comparés à une référence (`--baseline`) :
+une durée plus lente que `--tolerance` fois la référence (et d'au moins
+`--min-delta-ms`) est une régression, et la commande sort en erreur.
+
+Usage :
+    python benchmarks/bench_suite.py --scales 10k 100k
+    python benchmarks/bench_suite.py --scales 10k --save-baseline
+    python benchmarks/bench_suite.py --scales 10k --baseline benchmarks/baseline.json --tolerance 1.3
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from generate_dataset import format_scale, generate_dataset, parse_scale
+
+
+BENCH_DIR = Path(__file__).resolve().parent
+BASE_DIR = BENCH_DIR.parent
+DATASETS_DIR = BENCH_DIR / 'datasets'
+RESULTS_DIR = BENCH_DIR / 'results'
+DEFAULT_BASELINE = BENCH_DIR / 'baseline.json'
+
+# Endpoints mesurés ; les champs {…} sont remplis d'après la base (voir `placeholders`)
+ENDPOINTS = [
+    ('games list', '/api/games/'),
+    ('game detail', '/api/games/{game}/'),
+    ('game medal table', '/api/games/{game}/medal_table/'),
+    ('game top countries', '/api/games/{game}/top_countries/'),
+    ('athletes list', '/api/athletes/'),
+    ('athletes by medals', '/api/athletes/?ordering=-total_medals'),
+    ('athlete detail', '/api/athletes/{athlete}/'),
+    ('athletes leaderboard', '/api/athletes/leaderboard/'),
+    ('countries list', '/api/countries/'),
+    ('country detail', '/api/countries/{country}/'),
+    ('country rank history', '/api/countries/{country}/rank_history/'),
+    ('country timeseries', '/api/countries/{country}/timeseries/'),
+    ('countries timeseries', '/api/countries/timeseries/?countries={countries}'),
+    ('countries top', '/api/countries/top/'),
+    ('medals list', '/api/medals/'),
+    ('medals by country', '/api/medals/?country={country}&count=1'),
+    ('medals by discipline', '/api/medals/?discipline=athl'),
+    ('medals columnar', '/api/medals/?format=columnar'),
+    ('medal detail', '/api/medals/{medal}/'),
+    ('medals export', '/api/medals/export/?format=csv&country={country}'),
+    ('predictions list', '/api/predictions/'),
+    ('prediction detail', '/api/predictions/{prediction}/'),
+    ('predictions export', '/api/predictions/export/'),
+    ('stats overview', '/api/stats/overview/'),
+    ('search', '/api/search/?q=martin'),
+    ('autocomplete', '/api/autocomplete/?q=ma'),
+    ('batch', '/api/batch/?countries={countries}&games={game}'),
+    ('page home', '/api/pages/home/'),
+    ('page country', '/api/pages/countries/{country}/'),
+    ('page game', '/api/pages/games/{game}/'),
+    ('compare', '/api/compare/?countries={countries}'),
+    ('changes', '/api/changes/?since={since}'),
+    ('nested query', '/api/query/?resource=countries&ids={countries}&include=games:1.medals.athlete'),
+    ('discipline matrix', '/api/analytics/discipline-matrix/'),
+    ('async stats overview', '/api/async/stats/overview/'),
+    ('async country detail', '/api/async/countries/{country}/'),
+    ('async game detail', '/api/async/games/{game}/'),
+]
+
+
+# --- Mesures (processus enfant, une échelle) --------------------------------
+
+def timed(func, *args, **kwargs):
+    """(secondes, résultat, sortie standard capturée) de `func`."""
+    output = io.StringIO()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        result = func(*args, **kwargs)
+    return time.perf_counter() - started, result, output.getvalue()
+
+
+def placeholders():
+    """Identifiants utilisés dans les URL : pays et jeu les plus médaillés, etc."""
+    from predictions.models import Athlete, Country, CountryPrediction, Medal, OlympicGame
+    from predictions.versioning import get_data_version
+
+    countries = list(Country.objects.order_by('-total_medals').values_list('id', flat=True)[:5])
+    games = OlympicGame.objects.filter(medal__isnull=False).distinct().order_by('-game_year')
+    return {
+        'country': countries[0],
+        'countries': ','.join(map(str, countries)),
+        'game': games.values_list('id', flat=True).first(),
+        'athlete': Athlete.objects.order_by('-total_medals').values_list('id', flat=True).first(),
+        'medal': Medal.objects.values_list('id', flat=True).first(),
+        'prediction': CountryPrediction.objects.values_list('id', flat=True).first(),
+        'since': max(0, get_data_version() - 1),
+    }
+
+
+def measure_endpoints(repeat):
+    """Durées des endpoints, caches de réponses désactivés et throttling levé."""
+    from django.test import Client
+    from django.test.utils import override_settings
+
+    values = placeholders()
+    client = Client()
+    results = {}
+    with override_settings(
+        CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+            'api': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+        },
+        API_THROTTLE={'RATE': 1_000_000, 'BURST': 1_000_000, 'HEAVY_COST': 1_000_000},
+        SERVER_TIMING=True,
+        ALLOWED_HOSTS=['testserver'],
+    ):
+        for name, template in ENDPOINTS:
+            url = template.format(**values)
+            durations = []
+            for _ in range(repeat + 1):
+                started = time.perf_counter()
+                response = client.get(url)
+                content = b''.join(response.streaming_content) if response.streaming else response.content
+                durations.append((time.perf_counter() - started) * 1000)
+            queries = re.search(r'desc="(\d+) queries"', response.get('Server-Timing', ''))
+            queries = int(queries.group(1)) if queries else None
+            if response.streaming and hasattr(response, 'request_timing'):
+                queries = response.request_timing.query_count  # mesuré après l'envoi du corps
+            results[name] = {
+                'url': url,
+                'status': response.status_code,
+                'bytes': len(content),
+                'queries': queries,
+                'cold_ms': round(durations[0], 2),
+                'median_ms': round(statistics.median(durations[1:]), 2),
+            }
+    return results
+
+
+def run_scale(dataset_dir, expected_medals, repeat):
+    """Mesures d'une échelle ; la base `DATABASE_PATH` doit être vide."""
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    import django
+    django.setup()
+
+    from django.conf import settings
+    from django.core.management import call_command
+
+    settings.AUTOCOMPLETE_INDEX_PATH = Path(dataset_dir) / 'autocomplete.pickle'
+    steps = {}
+    steps['migrate'], _, _ = timed(call_command, 'migrate', verbosity=0)
+
+    import import_data
+    import generate_predictions
+    from predictions.models import Medal
+
+    steps['import'], _, output = timed(import_data.main, dataset_dir, limits=None)
+    if Medal.objects.count() != expected_medals:
+        sys.exit(f"Import incomplet ({Medal.objects.count()}/{expected_medals} médailles) :\n{output[-2000:]}")
+    steps['calculate_country_statistics'], _, _ = timed(import_data.calculate_country_statistics)
+    steps['generate_predictions'], _, _ = timed(generate_predictions.generate_predictions, min_medals=5)
+
+    return {
+        'steps': {name: round(seconds, 3) for name, seconds in steps.items()},
+        'endpoints': measure_endpoints(repeat),
+    }
+
+
+# --- Orchestration ----------------------------------------------------------
+
+def prepare_dataset(medals, seed, skew):
+    """Répertoire du jeu de données de l'échelle (généré s'il n'existe pas encore)."""
+    directory = DATASETS_DIR / f'{format_scale(medals)}-seed{seed}-skew{skew:g}'
+    summary_path = directory / 'dataset.json'
+    if summary_path.exists():
+        print(f"Jeu de données existant : {directory}")
+        return directory, json.loads(summary_path.read_text(encoding='utf-8'))
+    print(f"Génération de {directory}")
+    return directory, generate_dataset(directory, medals, seed=seed, skew=skew, log=lambda line: print(f"  {line}"))
+
+
+def bench_scale(medals, args):
+    """Lance la mesure d'une échelle dans un processus séparé (base dédiée)."""
+    directory, dataset = prepare_dataset(medals, args.seed, args.skew)
+    database = directory / 'bench.sqlite3'
+    database.unlink(missing_ok=True)
+    result_path = directory / 'result.json'
+    result_path.unlink(missing_ok=True)
+
+    process = subprocess.run(
+        [sys.executable, __file__, '--worker', str(directory), '--worker-medals', str(medals),
+         '--repeat', str(args.repeat), '--worker-output', str(result_path)],
+        env={**os.environ, 'DATABASE_PATH': str(database)},
+    )
+    if process.returncode:
+        sys.exit(f"Échec des mesures à l'échelle {format_scale(medals)} (code {process.returncode})")
+    result = json.loads(result_path.read_text(encoding='utf-8'))
+    if not args.keep_database:
+        database.unlink(missing_ok=True)
+    return {'dataset': dataset, **result}
+
+
+def compare(results, baseline, tolerance, min_delta_ms):
+    """Lignes (échelle, mesure, référence ms, actuel ms, ratio, régression) des mesures communes."""
+    rows = []
+    for scale, current in results['scales'].items():
+        reference = baseline.get('scales', {}).get(scale)
+        if reference is None:
+            continue
+        pairs = [
+            (f'step {name}', reference['steps'].get(name), seconds)
+            for name, seconds in current['steps'].items()
+        ]
+        pairs = [(label, before * 1000, after * 1000) for label, before, after in pairs if before is not None]
+        pairs += [
+            (name, reference['endpoints'][name]['median_ms'], endpoint['median_ms'])
+            for name, endpoint in current['endpoints'].items() if name in reference['endpoints']
+        ]
+        for label, before, after in pairs:
+            ratio = after / before if before else float('inf')
+            regression = ratio > tolerance and after - before >= min_delta_ms
+            rows.append((scale, label, before, after, ratio, regression))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', nargs='+', type=parse_scale, default=[parse_scale('10k')],
+                        help="Nombres de médailles (10k à 10M, suffixes k/M acceptés)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skew', type=float, default=1.0)
+    parser.add_argument('--repeat', type=int, default=5, help="Appels mesurés par endpoint (après le premier)")
+    parser.add_argument('--output', type=Path, help="Fichier de résultats (défaut : benchmarks/results/<date>.json)")
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE, help="Résultats de référence")
+    parser.add_argument('--save-baseline', action='store_true', help="Enregistre les résultats comme référence")
+    parser.add_argument('--tolerance', type=float, default=1.25, help="Ratio toléré par rapport à la référence")
+    parser.add_argument('--min-delta-ms', type=float, default=5.0, help="Écart minimal signalé (bruit de mesure)")
+    parser.add_argument('--keep-database', action='store_true', help="Conserve la base SQLite de chaque échelle")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--worker-medals', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--worker-output', type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_scale(args.worker, args.worker_medals, args.repeat)
+        args.worker_output.write_text(json.dumps(result, indent=2), encoding='utf-8')
+        return 0
+
+    results = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'seed': args.seed,
+        'skew': args.skew,
+        'repeat': args.repeat,
+        'environment': {'python': platform.python_version(), 'platform': platform.platform()},
+        'scales': {},
+    }
+    for medals in args.scales:
+        print(f"\n=== {format_scale(medals)} médailles ===")
+        scale = results['scales'][format_scale(medals)] = bench_scale(medals, args)
+        for name, seconds in scale['steps'].items():
+            print(f"  {name:<30} {seconds:>10.3f} s")
+        for name, endpoint in scale['endpoints'].items():
+            print(f"  {name:<30} {endpoint['median_ms']:>10.1f} ms  (1er appel {endpoint['cold_ms']:.1f} ms, "
+                  f"{endpoint['queries']} requêtes SQL, HTTP {endpoint['status']})")
+
+    output = args.output or RESULTS_DIR / f"{time.strftime('%Y%m%dT%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding='utf-8')
+    print(f"\nRésultats écrits dans {output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2), encoding='utf-8')
+        print(f"Référence enregistrée dans {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"Pas de référence ({args.baseline}) : relancer avec --save-baseline pour en créer une.")
+        return 0
+
+    rows = compare(results, json.loads(args.baseline.read_text(encoding='utf-8')), args.tolerance, args.min_delta_ms)
+    print(f"\nComparaison avec {args.baseline} (tolérance ×{args.tolerance}) :")
+    for scale, label, before, after, ratio, regression in rows:
+        marker = '✗' if regression else '✓'
+        print(f"  {marker} {scale:>5} {label:<36} {before:>10.1f} ms -> {after:>10.1f} ms  (×{ratio:.2f})")
+    regressions = [row for row in rows if row[-1]]
+    if regressions:
+        print(f"\n{len(regressions)} régression(s) au-delà de ×{args.tolerance}")
+        return 1
+    print("\nAucune régression.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""
+Générateur de jeux de données synthétiques à l'échelle voulue.
+
+Produit dans le répertoire de sortie les trois fichiers lus par
+`import_data.py` :
+- olympic_hosts.xml : les jeux de data/olympic_hosts.xml ;
+- olympic_athletes.json : les athlètes référencés par les médailles ;
+- olympic_medals.xlsx : N médailles, sur plusieurs feuilles au-delà de
+  1 048 575 lignes (limite d'une feuille Excel, en-tête compris).
+
+Les distributions sont calibrées sur l'échantillon data/olympic_medals.xlsx :
+répartition des médailles par jeu, des pays par saison (déséquilibre réaliste :
+quelques pays remportent la majorité des médailles), des disciplines par
+saison et des épreuves par discipline, part des épreuves par équipe.
+`--skew` accentue (> 1) ou atténue (< 1) le déséquilibre entre pays et
+disciplines. Quelques athlètes remportent beaucoup de médailles, la plupart
+une seule. Le générateur est déterministe pour une graine donnée.
+
+Aucune base de données n'est nécessaire.
+
+Usage :
+    python benchmarks/generate_dataset.py --medals 100k --output benchmarks/datasets/100k
+    python benchmarks/generate_dataset.py --medals 10M --seed 7 --skew 1.2 --output /tmp/olympics-10M
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+SAMPLE_DIR = BASE_DIR / 'data'
+
+MEDAL_COLUMNS = [
+    'discipline_title', 'slug_game', 'event_title', 'event_gender', 'medal_type',
+    'participant_type', 'participant_title', 'athlete_url', 'athlete_full_name',
+    'country_name', 'country_code', 'country_3_letter_code',
+]
+MEDAL_TYPES = ['GOLD', 'SILVER', 'BRONZE']
+SHEET_ROWS = 1_048_575  # lignes de données par feuille (1 048 576 avec l'en-tête)
+ATHLETES_PER_MEDAL = 0.35
+FIRST_NAMES = [
+    'Adam', 'Alice', 'Ana', 'Carlos', 'Chen', 'Clara', 'David', 'Elena', 'Emma', 'Hiro',
+    'Ingrid', 'Ivan', 'Jonas', 'Julia', 'Kenji', 'Lea', 'Lucas', 'Maria', 'Mei', 'Nadia',
+    'Olga', 'Omar', 'Paulo', 'Sara', 'Sofia', 'Tom', 'Wei', 'Yuki', 'Zoe', 'Lars',
+]
+LAST_NAMES = [
+    'ANDERSEN', 'BERNARD', 'COSTA', 'DUBOIS', 'FISCHER', 'GARCIA', 'HANSEN', 'IVANOV', 'JOHNSON',
+    'KIM', 'KOWALSKI', 'LI', 'MARTIN', 'MULLER', 'NAKAMURA', 'NOVAK', 'OKAFOR', 'PETROV', 'ROSSI',
+    'SANTOS', 'SATO', 'SILVA', 'SMITH', 'TANAKA', 'WANG', 'WEBER', 'WILSON', 'YILMAZ', 'ZHANG', 'LOPEZ',
+]
+
+
+def parse_scale(value):
+    """'10k', '2.5M', '10000' -> nombre de médailles."""
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)([kKmM]?)', value.strip())
+    if not match:
+        raise argparse.ArgumentTypeError(f"échelle invalide : {value!r} (exemples : 10k, 1M, 250000)")
+    number, suffix = match.groups()
+    return int(float(number) * {'': 1, 'k': 1_000, 'm': 1_000_000}[suffix.lower()])
+
+
+def format_scale(count):
+    """10000 -> '10k', 1000000 -> '1M'."""
+    for divisor, suffix in ((1_000_000, 'M'), (1_000, 'k')):
+        if count >= divisor and count % divisor == 0:
+            return f'{count // divisor}{suffix}'
+    return str(count)
+
+
+def weights(counts, skew=1.0):
+    """Probabilités proportionnelles à `counts` ** skew (lissées : aucune valeur nulle)."""
+    values = (np.asarray(counts, dtype=float) + 1) ** skew
+    return values / values.sum()
+
+
+class SampleProfile:
+    """Distributions observées dans l'échantillon data/ (hôtes XML et médailles XLSX)."""
+
+    def __init__(self, sample_dir=SAMPLE_DIR):
+        self.hosts = [
+            {child.tag: child.text for child in row}
+            for row in ET.parse(sample_dir / 'olympic_hosts.xml').getroot().findall('row')
+        ]
+        medals = pd.read_excel(sample_dir / 'olympic_medals.xlsx').fillna('')
+        seasons = {host['game_slug']: host['game_season'] for host in self.hosts}
+        medals['season'] = medals['slug_game'].map(seasons)
+        medals = medals[medals['season'].notna()]
+
+        self.game_counts = medals['slug_game'].value_counts().reindex(
+            [host['game_slug'] for host in self.hosts], fill_value=0
+        ).to_numpy()
+        countries = medals.drop_duplicates('country_name')
+        self.countries = countries[['country_name', 'country_code', 'country_3_letter_code']].to_numpy().tolist()
+        country_names = [country[0] for country in self.countries]
+
+        self.country_counts = {}     # saison -> médailles par pays (ordre de self.countries)
+        self.disciplines = {}        # saison -> [(discipline, médailles)]
+        for season, group in medals.groupby('season'):
+            self.country_counts[season] = group['country_name'].value_counts().reindex(
+                country_names, fill_value=0
+            ).to_numpy()
+            self.disciplines[season] = list(group['discipline_title'].value_counts().items())
+
+        self.events = {}             # discipline -> ([(épreuve, genre)], médailles)
+        self.team_share = {}         # discipline -> part des médailles par équipe
+        for discipline, group in medals.groupby('discipline_title'):
+            events = group.groupby(['event_title', 'event_gender']).size()
+            self.events[discipline] = (list(events.index), events.to_numpy())
+            self.team_share[discipline] = float((group['participant_type'] == 'GameTeam').mean())
+
+
+def generate_medals(profile, count, rng, skew=1.0, athletes_per_medal=ATHLETES_PER_MEDAL):
+    """
+    Tire `count` médailles ; retourne un dict de colonnes (indices numpy) et
+    le nombre d'athlètes par pays. Les médailles sont triées par jeu.
+    """
+    game = np.sort(rng.choice(len(profile.hosts), size=count, p=weights(profile.game_counts)))
+    game_seasons = np.array([host['game_season'] for host in profile.hosts])
+    discipline_names = sorted(profile.events)
+    discipline_positions = {name: index for index, name in enumerate(discipline_names)}
+
+    discipline = np.zeros(count, dtype=np.int32)
+    country = np.zeros(count, dtype=np.int32)
+    for season, season_disciplines in profile.disciplines.items():
+        rows = np.flatnonzero(game_seasons[game] == season)
+        names, counts = zip(*season_disciplines)
+        choices = rng.choice(len(names), size=len(rows), p=weights(counts, skew))
+        discipline[rows] = np.array([discipline_positions[name] for name in names])[choices]
+        country[rows] = rng.choice(len(profile.countries), size=len(rows),
+                                   p=weights(profile.country_counts[season], skew))
+
+    event = np.zeros(count, dtype=np.int32)
+    team = np.zeros(count, dtype=bool)
+    for index, name in enumerate(discipline_names):
+        rows = np.flatnonzero(discipline == index)
+        events, counts = profile.events[name]
+        event[rows] = rng.choice(len(events), size=len(rows), p=weights(counts))
+        team[rows] = rng.random(len(rows)) < profile.team_share[name]
+
+    # Athlètes : un vivier par pays proportionnel à ses médailles ; u**3 concentre
+    # les médailles sur les premiers athlètes du vivier (quelques multimédaillés)
+    country_medals = np.bincount(country, minlength=len(profile.countries))
+    pool_sizes = np.maximum(1, np.ceil(country_medals * athletes_per_medal)).astype(np.int64)
+    pool_offsets = np.concatenate([[0], np.cumsum(pool_sizes)[:-1]])
+    athlete = pool_offsets[country] + (pool_sizes[country] * rng.random(count) ** 3).astype(np.int64)
+    athlete[team] = -1
+
+    return {
+        'game': game,
+        'discipline': discipline,
+        'discipline_names': discipline_names,
+        'event': event,
+        'medal_type': rng.integers(0, len(MEDAL_TYPES), size=count),
+        'country': country,
+        'athlete': athlete,
+    }, pool_sizes
+
+
+def athlete_identity(athlete_id):
+    """Nom et URL (uniques) de l'athlète `athlete_id`."""
+    first = FIRST_NAMES[athlete_id % len(FIRST_NAMES)]
+    last = LAST_NAMES[(athlete_id // len(FIRST_NAMES)) % len(LAST_NAMES)]
+    name = f'{first} {last}'
+    return name, f'https://olympics.com/en/athletes/{first.lower()}-{last.lower()}-{athlete_id}'
+
+
+def write_hosts(profile, path):
+    root = ET.Element('data')
+    for index, host in enumerate(profile.hosts):
+        row = ET.SubElement(root, 'row')
+        ET.SubElement(row, 'index').text = str(index)
+        for tag, text in host.items():
+            if tag != 'index':
+                ET.SubElement(row, tag).text = text
+    ET.indent(root)
+    ET.ElementTree(root).write(path, encoding='utf-8', xml_declaration=True)
+
+
+def write_athletes(profile, pool_sizes, rng, path):
+    """Écrit les athlètes des viviers en JSON (en flux : un athlète par ligne)."""
+    total = int(pool_sizes.sum())
+    birth_years = rng.integers(1950, 2006, size=total)
+    participations = 1 + rng.poisson(0.8, size=total)
+    first_games = rng.integers(0, len(profile.hosts), size=total)
+    with open(path, 'w', encoding='utf-8') as output:
+        output.write('[\n')
+        for athlete_id in range(total):
+            name, url = athlete_identity(athlete_id)
+            output.write(json.dumps({
+                'athlete_url': url,
+                'athlete_full_name': name,
+                'games_participations': int(participations[athlete_id]),
+                'first_game': profile.hosts[first_games[athlete_id]]['game_name'],
+                'athlete_year_birth': int(birth_years[athlete_id]),
+            }, ensure_ascii=False))
+            output.write(',\n' if athlete_id < total - 1 else '\n')
+        output.write(']\n')
+    return total
+
+
+def write_medals(profile, medals, path, sheet_rows=SHEET_ROWS, progress=None):
+    """Écrit les médailles en XLSX (mode flux d'openpyxl), `sheet_rows` lignes par feuille."""
+    count = len(medals['game'])
+    slugs = [host['game_slug'] for host in profile.hosts]
+    discipline_names = medals['discipline_names']
+    columns = (
+        medals['game'].tolist(), medals['discipline'].tolist(), medals['event'].tolist(),
+        medals['medal_type'].tolist(), medals['country'].tolist(), medals['athlete'].tolist(),
+    )
+
+    workbook = Workbook(write_only=True)
+    sheet = None
+    for index, (game, discipline, event, medal_type, country, athlete) in enumerate(zip(*columns)):
+        if index % sheet_rows == 0:
+            sheet = workbook.create_sheet(f'medals_{index // sheet_rows + 1}')
+            sheet.append([None, *MEDAL_COLUMNS])
+            if progress and index:
+                progress(index, count)
+        discipline_name = discipline_names[discipline]
+        event_title, event_gender = profile.events[discipline_name][0][event]
+        country_name, country_code, country_3_letter_code = profile.countries[country]
+        if athlete < 0:
+            participant_type, participant_title, athlete_url, athlete_name = 'GameTeam', country_name, None, None
+        else:
+            athlete_name, athlete_url = athlete_identity(athlete)
+            participant_type, participant_title = 'Athlete', None
+        sheet.append([
+            index, discipline_name, slugs[game], event_title, event_gender, MEDAL_TYPES[medal_type],
+            participant_type, participant_title, athlete_url, athlete_name,
+            country_name, country_code, country_3_letter_code,
+        ])
+    workbook.save(path)
+    return -(-count // sheet_rows)
+
+
+def generate_dataset(output, medals, seed=42, skew=1.0, sample_dir=SAMPLE_DIR, log=print):
+    """Génère les trois fichiers dans `output` ; retourne un résumé (compteurs et durées)."""
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    started = time.perf_counter()
+
+    profile = SampleProfile(sample_dir)
+    columns, pool_sizes = generate_medals(profile, medals, rng, skew)
+    log(f"✓ {medals} médailles tirées ({time.perf_counter() - started:.1f} s)")
+
+    write_hosts(profile, output / 'olympic_hosts.xml')
+    athletes = write_athletes(profile, pool_sizes, rng, output / 'olympic_athletes.json')
+    log(f"✓ {len(profile.hosts)} jeux, {athletes} athlètes écrits")
+    sheets = write_medals(
+        profile, columns, output / 'olympic_medals.xlsx',
+        progress=lambda done, total: log(f"  {done}/{total} médailles écrites"),
+    )
+    log(f"✓ olympic_medals.xlsx : {sheets} feuille(s) ({time.perf_counter() - started:.1f} s)")
+
+    summary = {
+        'medals': medals, 'athletes': athletes, 'games': len(profile.hosts),
+        'countries': int((np.bincount(columns['country']) > 0).sum()),
+        'sheets': sheets, 'seed': seed, 'skew': skew,
+        'seconds': round(time.perf_counter() - started, 2),
+    }
+    (output / 'dataset.json').write_text(json.dumps(summary, indent=2), encoding='utf-8')
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--medals', type=parse_scale, default=parse_scale('10k'),
+                        help="Nombre de médailles (10k à 10M, suffixes k/M acceptés)")
+    parser.add_argument('--output', type=Path, help="Répertoire de sortie (défaut : benchmarks/datasets/<échelle>)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skew', type=float, default=1.0,
+                        help="Exposant appliqué aux fréquences des pays et disciplines (1 : comme l'échantillon)")
+    args = parser.parse_args()
+
+    output = args.output or Path(__file__).resolve().parent / 'datasets' / format_scale(args.medals)
+    summary = generate_dataset(output, args.medals, seed=args.seed, skew=args.skew)
+    print(f"\nJeu de données écrit dans {output} : {json.dumps(summary)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
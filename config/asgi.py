@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_asgi_application()
+
+# Index d'autocomplétion construit au démarrage du worker
+from predictions.autocomplete import preload_autocomplete_index  # noqa: E402
+
+preload_autocomplete_index()
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,6 +45,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # Compression gzip des réponses calculées (les réponses en cache sont précompressées)
+    "django.middleware.gzip.GZipMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -51,6 +54,9 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "predictions.middleware.QueryBudgetMiddleware",
+    "predictions.middleware.ProfilingMiddleware",
+    "predictions.middleware.DataVersionMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -80,11 +86,69 @@ WSGI_APPLICATION = "config.wsgi.application"
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        # DATABASE_PATH : base séparée (benchmarks/bench_suite.py)
+        "NAME": os.environ.get("DATABASE_PATH", BASE_DIR / "db.sqlite3"),
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+#
+# Le cache "api" conserve les réponses de l'API (voir predictions/response_cache.py).
+# API_CACHE_BACKEND choisit son backend :
+# - "locmem" (défaut) : mémoire locale du processus, LRU borné en entrées et en octets
+# - "file" : fichiers partagés entre workers (API_CACHE_LOCATION)
+# - "redis" : serveur Redis partagé (API_CACHE_LOCATION, nécessite le paquet redis)
+
+API_CACHE_BACKEND = os.environ.get("API_CACHE_BACKEND", "locmem")
+
+API_CACHES = {
+    "locmem": {
+        "BACKEND": "predictions.cache_backends.BoundedLocMemCache",
+        "LOCATION": "api-responses",
+        "TIMEOUT": None,
+        "OPTIONS": {"MAX_ENTRIES": 5000, "MAX_BYTES": 64 * 1024 * 1024},
+    },
+    "file": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("API_CACHE_LOCATION", str(BASE_DIR / "cache" / "api")),
+        "TIMEOUT": None,
+        "OPTIONS": {"MAX_ENTRIES": 20000},
+    },
+    "redis": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ.get("API_CACHE_LOCATION", "redis://127.0.0.1:6379/1"),
+        "TIMEOUT": None,
+    },
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "api": API_CACHES[API_CACHE_BACKEND],
+}
+
+# Alias du cache utilisé pour les réponses de l'API
+API_RESPONSE_CACHE = "api"
+
+# Pré-remplissage du cache après import (backends partagés uniquement)
+API_CACHE_WARM_AFTER_IMPORT = True
+API_CACHE_WARM_HOSTS = ["localhost:8000"]
+
+# Threads du pool utilisé par les vues async pour exécuter leurs requêtes
+# en parallèle (voir predictions/concurrency.py)
+ASYNC_QUERY_WORKERS = 8
+
+# Index d'autocomplétion prébâti (voir predictions/autocomplete.py)
+AUTOCOMPLETE_INDEX_PATH = BASE_DIR / "cache" / "autocomplete.pickle"
+
+# Versions des données conservées dans le journal des changements
+# (/api/changes/ ; au-delà, le client doit tout recharger)
+CHANGELOG_RETENTION_VERSIONS = 50
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -127,13 +191,46 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # REST Framework settings
+# Pour encoder le JSON avec orjson (pip install orjson), remplacer
+# 'rest_framework.renderers.JSONRenderer' par 'predictions.renderers.ORJSONRenderer'.
+# ColumnarRenderer sert `?format=columnar` (listes encodées par colonnes).
 REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 100,
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
+        'predictions.renderers.ColumnarRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
-    ]
+    ],
+    # Throttling au coût (voir predictions/throttling.py et API_THROTTLE)
+    'DEFAULT_THROTTLE_CLASSES': [
+        'predictions.throttling.CostThrottle',
+    ],
+}
+
+# Requêtes SQL par requête HTTP (predictions.middleware.QueryBudgetMiddleware) :
+# budget par défaut des vues (attribut `query_budget` pour le modifier), en-tête
+# Server-Timing, et mode strict levant une exception (activé par les tests)
+QUERY_BUDGET = 10
+QUERY_BUDGET_STRICT = False
+SERVER_TIMING = DEBUG
+
+# Profilage cProfile (predictions.middleware.ProfilingMiddleware) : fraction des
+# requêtes tirées au sort, ou en-tête `X-Profile: 1` depuis INTERNAL_IPS.
+# Profils écrits dans profiles/ (python manage.py profile_report pour les agréger)
+INTERNAL_IPS = ["127.0.0.1"]
+PROFILING = {
+    "SAMPLE_RATE": float(os.environ.get("PROFILING_SAMPLE_RATE", "0")),
+    "DIRECTORY": "profiles",
+}
+
+# Contrôle d'admission : jetons par client, plafond des requêtes lourdes
+API_THROTTLE = {
+    "RATE": 50,
+    "BURST": 200,
+    "HEAVY_COST": 20,
+    "MAX_HEAVY": 4,
+    "QUEUE_TIMEOUT": 0.5,
 }
 
 # CORS settings for React frontend
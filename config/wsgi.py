@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_wsgi_application()
+
+# Index d'autocomplétion construit au démarrage du worker
+from predictions.autocomplete import preload_autocomplete_index  # noqa: E402
+
+preload_autocomplete_index()
@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react';
-import { athletesService } from '../services/api';
+import { athletesService, autocompleteService } from '../services/api';
 import LoadingSpinner from '../components/LoadingSpinner';
 import ErrorMessage from '../components/ErrorMessage';
 
@@ -8,16 +8,22 @@ const AthletesList = () => {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [page, setPage] = useState(1);
-  const [hasNext, setHasNext] = useState(false);
+  const [cursor, setCursor] = useState(null);
+  const [nextUrl, setNextUrl] = useState(null);
+  const [previousUrl, setPreviousUrl] = useState(null);
+  const [query, setQuery] = useState('');
+  const [suggestions, setSuggestions] = useState([]);
 
-  const fetchAthletes = async (pageNum = 1) => {
+  const fetchAthletes = async (cursorUrl = null, pageNum = 1) => {
     setLoading(true);
     setError(null);
     
     try {
-      const response = await athletesService.getAll(pageNum);
+      const response = await athletesService.getAll(cursorUrl);
       setAthletes(response.data.results || []);
-      setHasNext(!!response.data.next);
+      setNextUrl(response.data.next);
+      setPreviousUrl(response.data.previous);
+      setCursor(cursorUrl);
       setPage(pageNum);
     } catch (err) {
       setError(err.message || 'Erreur lors du chargement des athlètes');
@@ -26,12 +32,45 @@ const AthletesList = () => {
     }
   };
 
+  const selectAthlete = async (id) => {
+    setQuery('');
+    setSuggestions([]);
+    setLoading(true);
+    try {
+      const response = await athletesService.getById(id);
+      setAthletes([response.data]);
+      setNextUrl(null);
+      setPreviousUrl(null);
+    } catch (err) {
+      setError(err.message || "Erreur lors du chargement de l'athlète");
+    } finally {
+      setLoading(false);
+    }
+  };
+
   useEffect(() => {
     fetchAthletes();
   }, []);
 
+  // Suggestions à la frappe (index en mémoire côté serveur)
+  useEffect(() => {
+    if (!query.trim()) {
+      setSuggestions([]);
+      return undefined;
+    }
+    let cancelled = false;
+    autocompleteService.suggest(query, 'athlete')
+      .then((response) => {
+        if (!cancelled) setSuggestions(response.data.results || []);
+      })
+      .catch(() => {});
+    return () => {
+      cancelled = true;
+    };
+  }, [query]);
+
   if (loading) return <LoadingSpinner message="Chargement des athlètes..." />;
-  if (error) return <ErrorMessage message={error} onRetry={() => fetchAthletes(page)} />;
+  if (error) return <ErrorMessage message={error} onRetry={() => fetchAthletes(cursor, page)} />;
 
   return (
     <>
@@ -42,6 +81,30 @@ const AthletesList = () => {
         <span className="badge bg-primary fs-6">{athletes.length} athlètes</span>
       </div>
 
+      <div className="position-relative mb-3">
+        <input
+          type="search"
+          className="form-control"
+          placeholder="Rechercher un athlète..."
+          value={query}
+          onChange={(e) => setQuery(e.target.value)}
+        />
+        {suggestions.length > 0 && (
+          <div className="list-group position-absolute w-100 shadow-sm" style={{ zIndex: 10 }}>
+            {suggestions.map((suggestion) => (
+              <button
+                key={suggestion.id}
+                type="button"
+                className="list-group-item list-group-item-action"
+                onClick={() => selectAthlete(suggestion.id)}
+              >
+                {suggestion.name}
+              </button>
+            ))}
+          </div>
+        )}
+      </div>
+
       <div className="card">
         <div className="card-body">
           <div className="table-responsive">
@@ -49,6 +112,7 @@ const AthletesList = () => {
               <thead>
                 <tr>
                   <th>Nom</th>
+                  <th className="text-center">Médailles</th>
                   <th className="text-center">Année de Naissance</th>
                   <th className="text-center">Participations</th>
                   <th>Premier Jeu</th>
@@ -60,6 +124,9 @@ const AthletesList = () => {
                     <td>
                       <strong>{athlete.athlete_full_name}</strong>
                     </td>
+                    <td className="text-center">
+                      <strong className="text-primary">{athlete.total_medals}</strong>
+                    </td>
                     <td className="text-center">
                       {athlete.athlete_year_birth || 'N/A'}
                     </td>
@@ -81,16 +148,16 @@ const AthletesList = () => {
           <div className="d-flex justify-content-between align-items-center mt-3">
             <button
               className="btn btn-outline-primary"
-              onClick={() => fetchAthletes(page - 1)}
-              disabled={page === 1}
+              onClick={() => fetchAthletes(previousUrl, page - 1)}
+              disabled={!previousUrl}
             >
               <i className="bi bi-chevron-left"></i> Précédent
             </button>
             <span className="text-muted">Page {page}</span>
             <button
               className="btn btn-outline-primary"
-              onClick={() => fetchAthletes(page + 1)}
-              disabled={!hasNext}
+              onClick={() => fetchAthletes(nextUrl, page + 1)}
+              disabled={!nextUrl}
             >
               Suivant <i className="bi bi-chevron-right"></i>
             </button>
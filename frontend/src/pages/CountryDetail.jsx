@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react';
 import { useParams, Link } from 'react-router-dom';
-import { countriesService } from '../services/api';
+import { pagesService } from '../services/api';
 import LoadingSpinner from '../components/LoadingSpinner';
 import ErrorMessage from '../components/ErrorMessage';
 
@@ -15,8 +15,8 @@ const CountryDetail = () => {
     setError(null);
     
     try {
-      const response = await countriesService.getById(id);
-      setCountry(response.data);
+      const response = await pagesService.getCountry(id);
+      setCountry(response.data.country);
     } catch (err) {
       setError(err.message || 'Erreur lors du chargement du pays');
     } finally {
@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react';
 import { useParams, Link } from 'react-router-dom';
-import { gamesService } from '../services/api';
+import { pagesService } from '../services/api';
 import LoadingSpinner from '../components/LoadingSpinner';
 import ErrorMessage from '../components/ErrorMessage';
 
@@ -16,13 +16,10 @@ const GameDetail = () => {
     setError(null);
     
     try {
-      const [gameRes, topCountriesRes] = await Promise.all([
-        gamesService.getById(id),
-        gamesService.getTopCountries(id),
-      ]);
+      const response = await pagesService.getGame(id);
       
-      setGame(gameRes.data);
-      setTopCountries(topCountriesRes.data);
+      setGame(response.data.game);
+      setTopCountries(response.data.top_countries);
     } catch (err) {
       setError(err.message || 'Erreur lors du chargement du jeu olympique');
     } finally {
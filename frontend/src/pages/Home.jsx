@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
-import { statsService, countriesService, gamesService } from '../services/api';
+import { pagesService } from '../services/api';
 import LoadingSpinner from '../components/LoadingSpinner';
 import ErrorMessage from '../components/ErrorMessage';
 
@@ -16,15 +16,11 @@ const Home = () => {
     setError(null);
     
     try {
-      const [statsRes, countriesRes, gamesRes] = await Promise.all([
-        statsService.getOverview(),
-        countriesService.getTop(),
-        gamesService.getAll(1),
-      ]);
+      const response = await pagesService.getHome();
 
-      setStats(statsRes.data);
-      setTopCountries(countriesRes.data);
-      setRecentGames(gamesRes.data.results?.slice(0, 5) || []);
+      setStats(response.data.stats);
+      setTopCountries(response.data.top_countries);
+      setRecentGames(response.data.recent_games);
     } catch (err) {
       setError(err.message || 'Erreur lors du chargement des données');
     } finally {
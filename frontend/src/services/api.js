@@ -39,18 +39,53 @@ export const countriesService = {
   getTop: () => api.get('/countries/top/'),
 };
 
+// Athlètes et médailles utilisent une pagination par curseur :
+// passer l'URL `next` ou `previous` de la réponse précédente pour changer de page.
+
 export const athletesService = {
-  getAll: (page = 1) => api.get(`/athletes/?page=${page}`),
+  getAll: (cursorUrl = null) => api.get(cursorUrl || '/athletes/'),
   getById: (id) => api.get(`/athletes/${id}/`),
+  getLeaderboard: (limit = 20) => api.get('/athletes/leaderboard/', { params: { limit } }),
 };
 
 export const medalsService = {
-  getAll: (params = {}) => {
+  getAll: (params = {}, cursorUrl = null) => {
+    if (cursorUrl) return api.get(cursorUrl);
     const queryParams = new URLSearchParams(params).toString();
     return api.get(`/medals/?${queryParams}`);
   },
 };
 
+export const autocompleteService = {
+  suggest: (query, type = null, limit = 10) => api.get('/autocomplete/', {
+    params: { q: query, limit, ...(type ? { type } : {}) },
+  }),
+};
+
+// Lecture groupée : { countries: [ids], games: [ids], athletes: [ids] } en une requête
+export const batchService = {
+  get: (idsByResource) => {
+    const params = Object.fromEntries(
+      Object.entries(idsByResource).map(([resource, ids]) => [resource, ids.join(',')])
+    );
+    return api.get('/batch/', { params });
+  },
+};
+
+// Requête imbriquée : include = "games:3.medals.athlete,predictions"
+export const queryService = {
+  get: (resource, ids, include = '') => api.get('/query/', {
+    params: { resource, ids: ids.join(','), ...(include ? { include } : {}) },
+  }),
+};
+
+// Contenu complet d'une page en une seule requête
+export const pagesService = {
+  getHome: () => api.get('/pages/home/'),
+  getCountry: (id) => api.get(`/pages/countries/${id}/`),
+  getGame: (id) => api.get(`/pages/games/${id}/`),
+};
+
 export const predictionsService = {
   getAll: (page = 1) => api.get(`/predictions/?page=${page}`),
 };
@@ -24,6 +24,8 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 django.setup()
 
 from predictions.models import OlympicGame, Country, Medal, CountryPrediction
+from predictions.changes import track_changes
+from predictions.versioning import bump_data_version
 from django.db.models import Count, Q
 import statistics
 
@@ -128,13 +130,10 @@ def predict_medal_distribution(stats):
     return predicted_gold, predicted_silver, predicted_bronze
 
 
-def generate_predictions(target_game="Paris 2024 (Futur)", min_medals=1):
+def replace_predictions(target_game, min_medals):
     """
-    Génère les prédictions pour tous les pays ayant un historique.
-    
-    Args:
-        target_game: Nom du jeu olympique futur à prédire
-        min_medals: Nombre minimum de médailles historiques pour faire une prédiction
+    Remplace les prédictions par celles calculées pour `target_game`.
+    Retourne le nombre de prédictions créées.
     """
     print("\n" + "="*60)
     print("GÉNÉRATION DES PRÉDICTIONS")
@@ -195,6 +194,23 @@ def generate_predictions(target_game="Paris 2024 (Futur)", min_medals=1):
     return predictions_created
 
 
+def generate_predictions(target_game="Paris 2024 (Futur)", min_medals=1):
+    """
+    Génère les prédictions pour tous les pays ayant un historique.
+    Les suppressions et créations sont journalisées sous la nouvelle version
+    des données (voir `predictions/changes.py`).
+
+    Args:
+        target_game: Nom du jeu olympique futur à prédire
+        min_medals: Nombre minimum de médailles historiques pour faire une prédiction
+    """
+    with track_changes() as changes:
+        predictions_created = replace_predictions(target_game, min_medals)
+        # Invalider les caches construits sur l'ancienne version des données
+        bump_data_version(changes=changes)
+    return predictions_created
+
+
 def display_predictions_summary():
     """
     Affiche un résumé des prédictions générées.
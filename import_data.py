@@ -28,6 +28,13 @@ import django
 django.setup()
 
 from predictions.models import OlympicGame, Athlete, Country, Medal
+from predictions.changes import track_changes
+from predictions.autocomplete import AutocompleteIndex, save_autocomplete_index
+from predictions.search import rebuild_search_index
+from predictions.stats import rebuild_athlete_medal_counts, rebuild_country_game_stats
+from predictions.response_cache import is_shared_cache, warm_response_cache
+from predictions.versioning import bump_data_version
+from django.conf import settings
 
 
 def parse_olympic_hosts(file_path, limit=None):
@@ -127,7 +134,11 @@ def parse_olympic_medals(file_path, limit=None):
     """
     print(f"\n=== Parsing Olympic Medals XLSX ===")
     
-    df = pd.read_excel(file_path)
+    # Les gros fichiers sont répartis sur plusieurs feuilles (1 048 576 lignes au plus par feuille)
+    sheets = pd.read_excel(file_path, sheet_name=None)
+    df = pd.concat(sheets.values(), ignore_index=True) if len(sheets) > 1 else next(iter(sheets.values()))
+    if len(sheets) > 1:
+        print(f"{len(sheets)} feuilles lues ({len(df)} lignes)")
     
     # Afficher les premières lignes pour validation
     print("\nPremières lignes du fichier:")
@@ -185,6 +196,7 @@ def calculate_country_statistics():
     """
     Calcule les statistiques de médailles par pays.
     Met à jour les compteurs total_gold_medals, total_silver_medals, etc.
+    Seuls les pays dont les compteurs changent sont enregistrés (et journalisés).
     """
     print(f"\n=== Calcul des statistiques par pays ===")
     
@@ -194,11 +206,12 @@ def calculate_country_statistics():
         silver_count = Medal.objects.filter(country=country, medal_type='SILVER').count()
         bronze_count = Medal.objects.filter(country=country, medal_type='BRONZE').count()
         
-        country.total_gold_medals = gold_count
-        country.total_silver_medals = silver_count
-        country.total_bronze_medals = bronze_count
-        country.total_medals = gold_count + silver_count + bronze_count
-        country.save()
+        counters = (gold_count, silver_count, bronze_count, gold_count + silver_count + bronze_count)
+        if counters != (country.total_gold_medals, country.total_silver_medals,
+                        country.total_bronze_medals, country.total_medals):
+            (country.total_gold_medals, country.total_silver_medals,
+             country.total_bronze_medals, country.total_medals) = counters
+            country.save()
         
         if country.total_medals > 0:
             print(f"✓ {country.country_name}: {country.total_medals} médailles "
@@ -207,18 +220,25 @@ def calculate_country_statistics():
     print(f"\nStatistiques calculées pour {countries.count()} pays")
 
 
-def main():
+# Échantillon importé par défaut (jeux, athlètes, médailles)
+DEFAULT_LIMITS = (20, 500, 1000)
+
+
+def main(data_dir=None, limits=DEFAULT_LIMITS):
     """
     Fonction principale d'import des données.
-    Importe un échantillon limité de données pour test et démonstration.
+    Importe par défaut un échantillon limité de données pour test et démonstration.
+    Args:
+        data_dir: Répertoire des fichiers (None = data/ du projet)
+        limits: Limites (jeux, athlètes, médailles) ; None = tout importer
     """
     print("="*60)
     print("IMPORT DES DONNÉES OLYMPIQUES")
     print("="*60)
     
     # Chemins des fichiers - utilise le répertoire data/ du projet
-    current_dir = Path(__file__).resolve().parent
-    data_dir = current_dir / 'data'
+    data_dir = Path(data_dir) if data_dir else Path(__file__).resolve().parent / 'data'
+    hosts_limit, athletes_limit, medals_limit = limits or (None, None, None)
     hosts_file = data_dir / 'olympic_hosts.xml'
     athletes_file = data_dir / 'olympic_athletes.json'
     medals_file = data_dir / 'olympic_medals.xlsx'
@@ -230,13 +250,36 @@ def main():
             return
     
     try:
-        # Import avec limite pour test (enlever limit=X pour importer tout)
-        parse_olympic_hosts(hosts_file, limit=20)  # Tous les jeux olympiques récents
-        parse_olympic_athletes(athletes_file, limit=500)  # 500 athlètes pour test
-        parse_olympic_medals(medals_file, limit=1000)  # 1000 médailles pour test
+        # Les objets créés / modifiés sont journalisés sous la nouvelle version
+        with track_changes() as changes:
+            # Import limité à DEFAULT_LIMITS pour test (--all pour importer tout)
+            parse_olympic_hosts(hosts_file, limit=hosts_limit)
+            parse_olympic_athletes(athletes_file, limit=athletes_limit)
+            parse_olympic_medals(medals_file, limit=medals_limit)
+            
+            # Calculer les statistiques
+            calculate_country_statistics()
+            print(f"✓ Matrice pays × jeu: {rebuild_country_game_stats()} lignes")
+            athlete_ids = rebuild_athlete_medal_counts()
+            for athlete_id in athlete_ids:  # mise à jour en masse, hors signaux
+                changes.add('athletes', athlete_id, 'updated')
+            print(f"✓ Palmarès recalculé pour {len(athlete_ids)} athlètes")
+            
+            # Reconstruire l'index de recherche plein texte
+            print(f"\n✓ Index de recherche: {rebuild_search_index()} entrées")
+            
+            # Invalider les caches construits sur l'ancienne version des données
+            version = bump_data_version(changes=changes)
+        print(f"\n✓ Version des données: {version} ({len(changes)} changements)")
         
-        # Calculer les statistiques
-        calculate_country_statistics()
+        # Index d'autocomplétion prébâti, chargé par les workers au démarrage
+        index = AutocompleteIndex.from_database()
+        save_autocomplete_index(index)
+        print(f"✓ Index d'autocomplétion: {len(index)} noms")
+        
+        # Pré-remplir le cache partagé des réponses de l'API
+        if settings.API_CACHE_WARM_AFTER_IMPORT and is_shared_cache():
+            print(f"✓ {warm_response_cache()} réponses de l'API mises en cache")
         
         print("\n" + "="*60)
         print("✓ IMPORT TERMINÉ AVEC SUCCÈS")
@@ -260,4 +303,10 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Import des données olympiques")
+    parser.add_argument('--data-dir', help="Répertoire des fichiers (défaut : data/ ; voir benchmarks/generate_dataset.py)")
+    parser.add_argument('--all', action='store_true', help="Importe tous les fichiers au lieu de l'échantillon")
+    args = parser.parse_args()
+    main(args.data_dir, limits=None if args.all else DEFAULT_LIMITS)
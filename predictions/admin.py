@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import OlympicGame, Athlete, Country, Medal, CountryPrediction
+from .models import OlympicGame, Athlete, Country, Medal, CountryGameStats, CountryPrediction
 
 
 @admin.register(OlympicGame)
@@ -12,7 +12,7 @@ class OlympicGameAdmin(admin.ModelAdmin):
 
 @admin.register(Athlete)
 class AthleteAdmin(admin.ModelAdmin):
-    list_display = ('athlete_full_name', 'athlete_year_birth', 'games_participations', 'first_game')
+    list_display = ('athlete_full_name', 'athlete_year_birth', 'games_participations', 'first_game', 'total_medals')
     list_filter = ('games_participations',)
     search_fields = ('athlete_full_name',)
     ordering = ('athlete_full_name',)
@@ -26,6 +26,14 @@ class CountryAdmin(admin.ModelAdmin):
     ordering = ('-total_medals',)
 
 
+@admin.register(CountryGameStats)
+class CountryGameStatsAdmin(admin.ModelAdmin):
+    list_display = ('country', 'game', 'gold', 'silver', 'bronze', 'total')
+    list_filter = ('game__game_season',)
+    search_fields = ('country__country_name', 'game__game_name')
+    list_select_related = ('country', 'game')
+
+
 @admin.register(Medal)
 class MedalAdmin(admin.ModelAdmin):
     list_display = ('discipline_title', 'medal_type', 'country', 'game', 'event_gender')
@@ -0,0 +1,168 @@
+"""
+Matrice pays × discipline des médailles, découpable par saison et par années.
+
+La matrice est construite une fois par version des données à partir d'un
+seul GROUP BY (jeu, pays, discipline). Pour chaque saison, elle est stockée
+sous forme de sommes cumulées jeu par jeu (tableau numpy jeux+1 × pays ×
+discipline × type) : les médailles d'une plage d'années s'obtiennent par une
+soustraction de deux tranches, sans relire les médailles.
+
+`DisciplineMatrix.encode` renvoie un encodage creux (coordonnées des cases
+non nulles) restreint aux pays et disciplines présents dans la plage.
+"""
+
+import bisect
+import threading
+
+import numpy as np
+from django.db.models import Count, Q
+
+from .models import OlympicGame, Country, Medal
+from .timeseries import SEASONS, SERIES
+from .versioning import get_data_version_info
+
+
+class SeasonSlices:
+    """Sommes cumulées d'une saison : `cumulative[k]` = médailles des k premiers jeux."""
+
+    def __init__(self, years, country_index, discipline_index, cumulative):
+        self.years = years
+        self.country_index = country_index
+        self.discipline_index = discipline_index
+        self.cumulative = cumulative
+
+    def bounds(self, year_from=None, year_to=None):
+        """Positions [lo, hi[ des jeux de la plage d'années (bornes incluses)."""
+        lo = 0 if year_from is None else bisect.bisect_left(self.years, year_from)
+        hi = len(self.years) if year_to is None else bisect.bisect_right(self.years, year_to)
+        return lo, max(lo, hi)
+
+
+class DisciplineMatrix:
+    """Médailles par pays et discipline, par saison, en sommes cumulées par jeu."""
+
+    def __init__(self, countries, disciplines, seasons, version=(0, None)):
+        self.countries = countries  # [(id, nom)]
+        self.disciplines = disciplines
+        self.seasons = seasons  # {'summer': SeasonSlices, ...}
+        self.version = version
+
+    @classmethod
+    def from_database(cls):
+        """Construit la matrice de la version courante (un seul parcours des médailles)."""
+        version = get_data_version_info()
+        games = list(OlympicGame.objects.order_by('game_year', 'game_start_date').values_list(
+            'id', 'game_year', 'game_season'
+        ))
+        rows = list(Medal.objects.filter(game__isnull=False).order_by().values_list(
+            'game_id', 'country_id', 'discipline_title'
+        ).annotate(
+            gold=Count('id', filter=Q(medal_type='GOLD')),
+            silver=Count('id', filter=Q(medal_type='SILVER')),
+            bronze=Count('id', filter=Q(medal_type='BRONZE')),
+            total=Count('id'),
+        ))
+
+        names = dict(Country.objects.filter(id__in={row[1] for row in rows}).values_list('id', 'country_name'))
+        countries = sorted(names.items())
+        disciplines = sorted({row[2] for row in rows})
+        country_positions = {country_id: index for index, (country_id, _) in enumerate(countries)}
+        discipline_positions = {discipline: index for index, discipline in enumerate(disciplines)}
+
+        seasons = {}
+        for season, game_season in SEASONS.items():
+            season_games = [(game_id, year) for game_id, year, name in games if name == game_season]
+            game_positions = {game_id: index for index, (game_id, _) in enumerate(season_games)}
+            season_rows = [row for row in rows if row[0] in game_positions]
+            country_ids = sorted({row[1] for row in season_rows})
+            season_disciplines = sorted({row[2] for row in season_rows})
+            local_countries = {country_id: index for index, country_id in enumerate(country_ids)}
+            local_disciplines = {discipline: index for index, discipline in enumerate(season_disciplines)}
+
+            counts = np.zeros(
+                (len(season_games) + 1, len(country_ids), len(season_disciplines), len(SERIES)), dtype=np.int32
+            )
+            for game_id, country_id, discipline, *values in season_rows:
+                counts[game_positions[game_id] + 1, local_countries[country_id], local_disciplines[discipline]] = values
+            seasons[season] = SeasonSlices(
+                years=[year for _, year in season_games],
+                country_index=np.array([country_positions[country_id] for country_id in country_ids], dtype=np.intp),
+                discipline_index=np.array(
+                    [discipline_positions[discipline] for discipline in season_disciplines], dtype=np.intp
+                ),
+                cumulative=np.cumsum(counts, axis=0, dtype=np.int32),
+            )
+        return cls(countries, disciplines, seasons, version)
+
+    def range_counts(self, season=None, year_from=None, year_to=None):
+        """
+        Médailles (pays × discipline × type) et nombre de jeux de la plage :
+        différence de deux tranches cumulées par saison.
+        """
+        counts = np.zeros((len(self.countries), len(self.disciplines), len(SERIES)), dtype=np.int32)
+        games = 0
+        for name, slices in self.seasons.items():
+            if season is not None and name != season:
+                continue
+            lo, hi = slices.bounds(year_from, year_to)
+            if hi == lo:
+                continue
+            counts[np.ix_(slices.country_index, slices.discipline_index)] += (
+                slices.cumulative[hi] - slices.cumulative[lo]
+            )
+            games += hi - lo
+        return counts, games
+
+    def encode(self, season=None, year_from=None, year_to=None, metric='total'):
+        """
+        Encodage creux de la plage : `cells` liste les cases non nulles en
+        trois tableaux parallèles (indice du pays, indice de la discipline,
+        médailles) ; `share` donne la part de la discipline remportée par le pays.
+        """
+        counts, games = self.range_counts(season, year_from, year_to)
+        values = counts[:, :, SERIES.index(metric)]
+        country_rows = np.flatnonzero(values.any(axis=1))
+        discipline_columns = np.flatnonzero(values.any(axis=0))
+        # Pays par total décroissant, disciplines par ordre alphabétique
+        country_rows = country_rows[np.argsort(-values[country_rows].sum(axis=1), kind='stable')]
+        block = values[np.ix_(country_rows, discipline_columns)]
+        discipline_totals = block.sum(axis=0)
+
+        rows, columns = np.nonzero(block)
+        medals = block[rows, columns]
+        return {
+            'season': season,
+            'year_from': year_from,
+            'year_to': year_to,
+            'metric': metric,
+            'games': games,
+            'countries': [
+                {'id': self.countries[index][0], 'country_name': self.countries[index][1]}
+                for index in country_rows.tolist()
+            ],
+            'disciplines': [self.disciplines[index] for index in discipline_columns.tolist()],
+            'discipline_totals': discipline_totals.tolist(),
+            'cells': {
+                'country': rows.tolist(),
+                'discipline': columns.tolist(),
+                'medals': medals.tolist(),
+                'share': np.round(medals / discipline_totals[columns], 4).tolist(),
+            },
+        }
+
+
+_matrix = None
+_matrix_lock = threading.Lock()
+
+
+def get_discipline_matrix():
+    """Matrice de la version courante des données (reconstruite après chaque import)."""
+    global _matrix
+    version = get_data_version_info()
+    matrix = _matrix
+    if matrix is not None and matrix.version == version:
+        return matrix
+    with _matrix_lock:
+        if _matrix is None or _matrix.version != version:
+            _matrix = DisciplineMatrix.from_database()
+        return _matrix
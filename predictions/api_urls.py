@@ -4,9 +4,12 @@ URL configuration pour l'API REST.
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from . import async_views
 from .api_views import (
     OlympicGameViewSet, AthleteViewSet, CountryViewSet,
-    MedalViewSet, CountryPredictionViewSet, StatsViewSet
+    MedalViewSet, CountryPredictionViewSet, StatsViewSet, SearchViewSet,
+    AutocompleteViewSet, BatchViewSet, PageViewSet, CompareViewSet,
+    ChangesViewSet, NestedQueryViewSet, AnalyticsViewSet
 )
 
 # Créer un router et enregistrer les viewsets
@@ -17,9 +20,21 @@ router.register(r'countries', CountryViewSet, basename='country')
 router.register(r'medals', MedalViewSet, basename='medal')
 router.register(r'predictions', CountryPredictionViewSet, basename='prediction')
 router.register(r'stats', StatsViewSet, basename='stats')
+router.register(r'search', SearchViewSet, basename='search')
+router.register(r'autocomplete', AutocompleteViewSet, basename='autocomplete')
+router.register(r'batch', BatchViewSet, basename='batch')
+router.register(r'pages', PageViewSet, basename='page')
+router.register(r'compare', CompareViewSet, basename='compare')
+router.register(r'changes', ChangesViewSet, basename='changes')
+router.register(r'query', NestedQueryViewSet, basename='query')
+router.register(r'analytics', AnalyticsViewSet, basename='analytics')
 
 app_name = 'api'
 
 urlpatterns = [
     path('', include(router.urls)),
+    # Variantes async (ASGI) des endpoints d'agrégation
+    path('async/stats/overview/', async_views.stats_overview, name='async-stats-overview'),
+    path('async/countries/<int:pk>/', async_views.country_detail, name='async-country-detail'),
+    path('async/games/<int:pk>/', async_views.game_detail, name='async-game-detail'),
 ]
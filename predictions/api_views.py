@@ -4,27 +4,125 @@ Fournit les endpoints CRUD pour tous les modèles.
 """
 
 from rest_framework import viewsets, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db.models import Count, Q
+from django.shortcuts import get_object_or_404
+from django.utils.decorators import method_decorator
 from .models import OlympicGame, Athlete, Country, Medal, CountryPrediction
 from .serializers import (
     OlympicGameSerializer, AthleteSerializer, CountrySerializer,
     MedalSerializer, CountryPredictionSerializer,
-    CountryDetailSerializer, GameDetailSerializer
+    CountryDetailSerializer, GameDetailSerializer,
+    OlympicGameValuesSerializer, AthleteValuesSerializer, CountryValuesSerializer,
+    MedalValuesSerializer, CountryPredictionValuesSerializer
 )
+from .analytics import get_discipline_matrix
+from .autocomplete import AUTOCOMPLETE_KINDS, get_autocomplete_index
+from .changes import changes_since, is_resync_required
+from .comparison import compare_countries
+from .conditional import conditional_on_data_version
+from .export import MEDAL_EXPORT_FIELDS, PREDICTION_EXPORT_FIELDS, stream_export
+from .mixins import AdmissionControlMixin, FastListMixin
+from .nested import NESTED_RESOURCES, NestedQueryError, parse_include, resolve
+from .pagination import AthleteCursorPagination, MedalCursorPagination
+from .renderers import CSVRenderer, NDJSONRenderer
+from .rankings import country_rank_history, game_medal_table
+from .response_cache import CachedResponseMixin
+from .search import SEARCH_KINDS, filter_medals_by_discipline, search
+from .stats import get_overview
+from .timeseries import SEASONS, SERIES, medal_timeseries
+from .versioning import get_data_version
 
+# Ressources du batch : modèle et serializer rapide
+BATCH_SOURCES = {
+    'countries': (Country, CountryValuesSerializer),
+    'games': (OlympicGame, OlympicGameValuesSerializer),
+    'athletes': (Athlete, AthleteValuesSerializer),
+}
 
-class OlympicGameViewSet(viewsets.ReadOnlyModelViewSet):
+# Serializer rapide et modèle de chaque type de résultat de recherche
+SEARCH_HIT_SOURCES = {
+    'medal': (Medal, MedalValuesSerializer),
+    'athlete': (Athlete, AthleteValuesSerializer),
+    'country': (Country, CountryValuesSerializer),
+    'game': (OlympicGame, OlympicGameValuesSerializer),
+}
+
+
+def parse_id_list(request, param, max_ids):
+    """Identifiants `?param=1,2,3` dans l'ordre et sans doublons (ValidationError sinon)."""
+    value = request.query_params.get(param, '')
+    try:
+        ids = list(dict.fromkeys(int(item) for item in value.split(',') if item.strip()))
+    except ValueError:
+        raise ValidationError({param: "Liste d'identifiants entiers attendue."})
+    if len(ids) > max_ids:
+        raise ValidationError({param: f"Au plus {max_ids} identifiants."})
+    return ids
+
+
+def parse_season(request):
+    """Saison `?season=summer|winter` (None si absente)."""
+    season = request.query_params.get('season')
+    if season is None:
+        return None
+    if season.lower() not in SEASONS:
+        raise ValidationError({'season': f"Valeurs possibles : {', '.join(SEASONS)}"})
+    return season.lower()
+
+
+def parse_year(request, param):
+    """Année `?param=2000` (None si absente)."""
+    value = request.query_params.get(param)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({param: "Année entière attendue."})
+
+
+def game_top_countries(game):
+    """Top 10 des pays d'un jeu par nombre de médailles."""
+    return Medal.objects.filter(game=game).values(
+        'country__country_name', 'country__id'
+    ).annotate(
+        medal_count=Count('id')
+    ).order_by('-medal_count')[:10]
+
+
+def country_medals_by_discipline(country):
+    """Top 10 des disciplines d'un pays par nombre de médailles."""
+    return Medal.objects.filter(country=country).values(
+        'discipline_title'
+    ).annotate(
+        count=Count('id')
+    ).order_by('-count')[:10]
+
+
+def country_detail(country, request):
+    """Fiche d'un pays : page de médailles et top 10 des disciplines."""
+    data = CountryDetailSerializer(country, context={'request': request}).data
+    data['medals_by_discipline'] = country_medals_by_discipline(country)
+    return data
+
+
+@method_decorator(conditional_on_data_version, name='dispatch')
+class OlympicGameViewSet(CachedResponseMixin, AdmissionControlMixin, FastListMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint pour les Jeux Olympiques.
     Liste tous les jeux olympiques et permet de récupérer les détails d'un jeu.
     """
     queryset = OlympicGame.objects.all()
     serializer_class = OlympicGameSerializer
+    fast_serializer_class = OlympicGameValuesSerializer
+    cached_actions = ('list', 'retrieve', 'top_countries', 'medal_table')
+    throttle_costs = {'retrieve': 20, 'top_countries': 5, 'medal_table': 5}
     
     def retrieve(self, request, pk=None):
-        """Récupère les détails d'un jeu avec ses médailles."""
+        """Récupère les détails d'un jeu avec une page de ses médailles (?cursor=)."""
         game = self.get_object()
         serializer = GameDetailSerializer(game, context={'request': request})
         return Response(serializer.data)
@@ -33,54 +131,92 @@ class OlympicGameViewSet(viewsets.ReadOnlyModelViewSet):
     def top_countries(self, request, pk=None):
         """Retourne le top 10 des pays pour ce jeu olympique."""
         game = self.get_object()
-        top_countries = Medal.objects.filter(game=game).values(
-            'country__country_name', 'country__id'
-        ).annotate(
-            medal_count=Count('id')
-        ).order_by('-medal_count')[:10]
-        
-        return Response(top_countries)
+        return Response(game_top_countries(game))
+    
+    @action(detail=True, methods=['get'])
+    def medal_table(self, request, pk=None):
+        """Tableau des médailles du jeu : tous les pays, classement officiel (or, argent, bronze)."""
+        game = self.get_object()
+        return Response(game_medal_table(game))
 
 
-class AthleteViewSet(viewsets.ReadOnlyModelViewSet):
+@method_decorator(conditional_on_data_version, name='dispatch')
+class AthleteViewSet(CachedResponseMixin, AdmissionControlMixin, FastListMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint pour les Athlètes.
-    Liste tous les athlètes olympiques.
+    Liste tous les athlètes olympiques (pagination par curseur).
     """
-    queryset = Athlete.objects.all()
+    queryset = Athlete.objects.select_related('medal_country')
     serializer_class = AthleteSerializer
+    fast_serializer_class = AthleteValuesSerializer
+    cached_actions = ('list', 'leaderboard')
+    throttle_costs = {'leaderboard': 2}
+    pagination_class = AthleteCursorPagination
+    max_leaderboard_size = 100
+    
+    @action(detail=False, methods=['get'])
+    def leaderboard(self, request):
+        """
+        Athlètes les plus médaillés (`?limit=20`, filtres `?country=<id>` et
+        `?discipline=<titre>`) : lecture des premières lignes de l'index du palmarès.
+        """
+        try:
+            limit = int(request.query_params.get('limit', 20))
+        except ValueError:
+            raise ValidationError({'limit': "Entier attendu."})
+        if not 1 <= limit <= self.max_leaderboard_size:
+            raise ValidationError({'limit': f"Entre 1 et {self.max_leaderboard_size}."})
+        
+        athletes = Athlete.objects.filter(total_medals__gt=0)
+        country = request.query_params.get('country')
+        if country:
+            if not country.isdigit():
+                raise ValidationError({'country': "Identifiant entier attendu."})
+            athletes = athletes.filter(medal_country_id=int(country))
+        discipline = request.query_params.get('discipline')
+        if discipline:
+            athletes = athletes.filter(medal_discipline=discipline)
+        athletes = athletes.order_by('-total_medals', 'id')[:limit]
+        return Response(AthleteValuesSerializer.serialize(AthleteValuesSerializer.values(athletes)))
 
 
-class CountryViewSet(viewsets.ReadOnlyModelViewSet):
+@method_decorator(conditional_on_data_version, name='dispatch')
+class CountryViewSet(CachedResponseMixin, AdmissionControlMixin, FastListMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint pour les Pays.
     Liste tous les pays avec leurs statistiques de médailles.
     """
     queryset = Country.objects.all()
     serializer_class = CountrySerializer
+    fast_serializer_class = CountryValuesSerializer
+    cached_actions = ('list', 'retrieve', 'top', 'rank_history', 'timeseries', 'timeseries_many')
+    throttle_costs = {'retrieve': 10, 'rank_history': 5, 'timeseries_many': 10}
+    max_timeseries_countries = 20
     
     def retrieve(self, request, pk=None):
-        """Récupère les détails d'un pays avec ses médailles (limitées)."""
+        """Récupère les détails d'un pays avec une page de ses médailles (?cursor=)."""
         country = self.get_object()
-        serializer = CountrySerializer(country, context={'request': request})
-        
-        # Récupérer les 50 premières médailles
-        medals = Medal.objects.filter(country=country).select_related(
-            'game', 'athlete'
-        )[:50]
-        
-        # Statistiques par discipline
-        medals_by_discipline = Medal.objects.filter(country=country).values(
-            'discipline_title'
-        ).annotate(
-            count=Count('id')
-        ).order_by('-count')[:10]
-        
-        data = serializer.data
-        data['medals'] = MedalSerializer(medals, many=True).data
-        data['medals_by_discipline'] = medals_by_discipline
-        
-        return Response(data)
+        return Response(country_detail(country, request))
+    
+    @action(detail=True, methods=['get'])
+    def timeseries(self, request, pk=None):
+        """Médailles du pays par jeu (séries alignées sur le calendrier, ?season=summer|winter)."""
+        country = self.get_object()
+        return Response(medal_timeseries([country.id], parse_season(request)))
+    
+    @action(detail=False, methods=['get'], url_path='timeseries')
+    def timeseries_many(self, request):
+        """Séries de plusieurs pays : `?countries=1,2,3` (20 au plus)."""
+        country_ids = parse_id_list(request, 'countries', self.max_timeseries_countries)
+        if not country_ids:
+            raise ValidationError({'countries': "Au moins un identifiant attendu."})
+        return Response(medal_timeseries(country_ids, parse_season(request)))
+    
+    @action(detail=True, methods=['get'])
+    def rank_history(self, request, pk=None):
+        """Rang du pays au tableau des médailles de chaque jeu (ordre chronologique)."""
+        country = self.get_object()
+        return Response(country_rank_history(country))
     
     @action(detail=False, methods=['get'])
     def top(self, request):
@@ -90,13 +226,25 @@ class CountryViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
 
 
-class MedalViewSet(viewsets.ReadOnlyModelViewSet):
+@method_decorator(conditional_on_data_version, name='dispatch')
+class MedalViewSet(CachedResponseMixin, AdmissionControlMixin, FastListMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint pour les Médailles.
-    Liste toutes les médailles olympiques.
+    Liste toutes les médailles olympiques (pagination par curseur).
     """
     queryset = Medal.objects.all().select_related('country', 'athlete', 'game')
     serializer_class = MedalSerializer
+    fast_serializer_class = MedalValuesSerializer
+    cached_actions = ('list',)
+    throttle_costs = {'list': 2, 'export': 50}
+    pagination_class = MedalCursorPagination
+    
+    def get_parameter_cost(self, request):
+        """Filtre par discipline sans pays ni jeu : parcours d'une grande partie des médailles."""
+        params = request.query_params
+        if 'discipline' in params and 'country' not in params and 'game' not in params:
+            return 30
+        return 0
     
     def get_queryset(self):
         """Permet de filtrer les médailles par pays, jeu ou discipline."""
@@ -113,22 +261,43 @@ class MedalViewSet(viewsets.ReadOnlyModelViewSet):
         if game_id is not None:
             queryset = queryset.filter(game_id=game_id)
         if discipline is not None:
-            queryset = queryset.filter(discipline_title__icontains=discipline)
+            queryset = filter_medals_by_discipline(queryset, discipline)
         if medal_type is not None:
             queryset = queryset.filter(medal_type=medal_type.upper())
         
         return queryset
+    
+    @action(detail=False, methods=['get'], renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request):
+        """Exporte toutes les médailles filtrées en streaming (?format=ndjson|csv)."""
+        return stream_export(
+            self.get_queryset(), MEDAL_EXPORT_FIELDS,
+            request.accepted_renderer.format, 'medals'
+        )
 
 
-class CountryPredictionViewSet(viewsets.ReadOnlyModelViewSet):
+@method_decorator(conditional_on_data_version, name='dispatch')
+class CountryPredictionViewSet(CachedResponseMixin, AdmissionControlMixin, FastListMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint pour les Prédictions.
     Liste toutes les prédictions de médailles par pays.
     """
     queryset = CountryPrediction.objects.all().select_related('country')
     serializer_class = CountryPredictionSerializer
+    fast_serializer_class = CountryPredictionValuesSerializer
+    cached_actions = ('list',)
+    throttle_costs = {'export': 20}
+    
+    @action(detail=False, methods=['get'], renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request):
+        """Exporte toutes les prédictions en streaming (?format=ndjson|csv)."""
+        return stream_export(
+            self.get_queryset(), PREDICTION_EXPORT_FIELDS,
+            request.accepted_renderer.format, 'predictions'
+        )
 
 
+@method_decorator(conditional_on_data_version, name='dispatch')
 class StatsViewSet(viewsets.ViewSet):
     """
     API endpoint pour les statistiques globales.
@@ -136,18 +305,247 @@ class StatsViewSet(viewsets.ViewSet):
     
     @action(detail=False, methods=['get'])
     def overview(self, request):
-        """Retourne les statistiques globales de l'application."""
-        stats = {
-            'total_games': OlympicGame.objects.count(),
-            'total_athletes': Athlete.objects.count(),
-            'total_countries': Country.objects.count(),
-            'total_medals': Medal.objects.count(),
-            'gold_medals': Medal.objects.filter(medal_type='GOLD').count(),
-            'silver_medals': Medal.objects.filter(medal_type='SILVER').count(),
-            'bronze_medals': Medal.objects.filter(medal_type='BRONZE').count(),
-        }
+        """Retourne les statistiques globales (mises en cache par version des données)."""
+        stats = get_overview()
         return Response(stats)
     
     def list(self, request):
         """Alias pour overview."""
         return self.overview(request)
+
+
+@method_decorator(conditional_on_data_version, name='dispatch')
+class SearchViewSet(CachedResponseMixin, AdmissionControlMixin, viewsets.ViewSet):
+    """
+    API endpoint de recherche plein texte.
+    `/api/search/?q=phelps&type=athlete&limit=20` : résultats classés par pertinence.
+    """
+    cached_actions = ('list',)
+    throttle_costs = {'list': 5}
+    max_limit = 100
+    
+    def list(self, request):
+        """Retourne les résultats typés (medal, athlete, country, game) pour `q`."""
+        text = request.query_params.get('q', '')
+        kind = request.query_params.get('type')
+        if kind is not None and kind not in SEARCH_KINDS:
+            raise ValidationError({'type': f"Valeurs possibles : {', '.join(SEARCH_KINDS)}"})
+        try:
+            limit = min(int(request.query_params.get('limit', 20)), self.max_limit)
+        except ValueError:
+            raise ValidationError({'limit': "Entier attendu."})
+        if limit < 1:
+            raise ValidationError({'limit': "Entier positif attendu."})
+        
+        hits = search(text, kind=kind, limit=limit)
+        
+        # Une requête par type de résultat pour charger les objets
+        objects = {}
+        for hit_kind in {hit_kind for hit_kind, _, _ in hits}:
+            model, values_serializer = SEARCH_HIT_SOURCES[hit_kind]
+            ids = [object_id for other_kind, object_id, _ in hits if other_kind == hit_kind]
+            rows = values_serializer.values(model.objects.filter(id__in=ids))
+            for item in values_serializer.serialize(rows):
+                objects[hit_kind, item['id']] = item
+        
+        results = [
+            {'type': hit_kind, 'id': object_id, 'score': round(score, 4),
+             'object': objects[hit_kind, object_id]}
+            for hit_kind, object_id, score in hits
+            if (hit_kind, object_id) in objects
+        ]
+        return Response({'query': text, 'results': results})
+
+
+@method_decorator(conditional_on_data_version, name='dispatch')
+class AutocompleteViewSet(viewsets.ViewSet):
+    """
+    API endpoint d'autocomplétion des noms d'athlètes et de pays.
+    `/api/autocomplete/?q=phel&type=athlete&limit=10`, servi par un index en mémoire.
+    """
+    max_limit = 50
+    
+    def list(self, request):
+        """Retourne les noms qui commencent par `q` puis ceux qui le contiennent."""
+        text = request.query_params.get('q', '')
+        kind = request.query_params.get('type')
+        if kind is not None and kind not in AUTOCOMPLETE_KINDS:
+            raise ValidationError({'type': f"Valeurs possibles : {', '.join(AUTOCOMPLETE_KINDS)}"})
+        try:
+            limit = min(int(request.query_params.get('limit', 10)), self.max_limit)
+        except ValueError:
+            raise ValidationError({'limit': "Entier attendu."})
+        
+        results = get_autocomplete_index().lookup(text, kind=kind, limit=limit)
+        return Response({'query': text, 'results': results})
+
+
+@method_decorator(conditional_on_data_version, name='dispatch')
+class BatchViewSet(CachedResponseMixin, AdmissionControlMixin, viewsets.ViewSet):
+    """
+    API endpoint de lecture groupée.
+    `/api/batch/?countries=1,2&games=3&athletes=4,5` : une requête `id__in`
+    par type de ressource, quel que soit le nombre d'identifiants.
+    """
+    cached_actions = ('list',)
+    throttle_costs = {'list': 5}
+    max_ids = 100
+    
+    def list(self, request):
+        """Retourne les objets demandés par type, dans l'ordre des identifiants."""
+        data = {}
+        missing = {}
+        for resource, (model, values_serializer) in BATCH_SOURCES.items():
+            ids = parse_id_list(request, resource, self.max_ids)
+            if not ids:
+                continue
+            rows = values_serializer.values(model.objects.filter(id__in=ids).order_by())
+            objects = {item['id']: item for item in values_serializer.serialize(list(rows))}
+            data[resource] = [objects[pk] for pk in ids if pk in objects]
+            absent = [pk for pk in ids if pk not in objects]
+            if absent:
+                missing[resource] = absent
+        data['missing'] = missing
+        return Response(data)
+
+
+@method_decorator(conditional_on_data_version, name='dispatch')
+class CompareViewSet(CachedResponseMixin, AdmissionControlMixin, viewsets.ViewSet):
+    """
+    API endpoint de comparaison de pays.
+    `/api/compare/?countries=1,2,3&season=summer` : matrices par jeu et par
+    discipline, en un nombre de requêtes indépendant du nombre de pays.
+    """
+    cached_actions = ('list',)
+    throttle_costs = {'list': 10}
+    max_countries = 20
+    
+    def list(self, request):
+        """Retourne les matrices de médailles alignées des pays demandés."""
+        country_ids = parse_id_list(request, 'countries', self.max_countries)
+        if not country_ids:
+            raise ValidationError({'countries': "Au moins un identifiant attendu."})
+        return Response(compare_countries(country_ids, parse_season(request)))
+
+
+@method_decorator(conditional_on_data_version, name='dispatch')
+class AnalyticsViewSet(CachedResponseMixin, AdmissionControlMixin, viewsets.ViewSet):
+    """
+    API endpoint des analyses transverses, servies depuis des matrices
+    précalculées en mémoire (voir `predictions/analytics.py`).
+    """
+    cached_actions = ('discipline_matrix',)
+    throttle_costs = {'discipline_matrix': 10}
+    
+    @action(detail=False, methods=['get'], url_path='discipline-matrix')
+    def discipline_matrix(self, request):
+        """
+        Médailles et part de chaque pays par discipline, encodage creux
+        (`?season=summer|winter&year_from=1990&year_to=2020&metric=gold`).
+        """
+        season = parse_season(request)
+        year_from, year_to = parse_year(request, 'year_from'), parse_year(request, 'year_to')
+        if year_from is not None and year_to is not None and year_from > year_to:
+            raise ValidationError({'year_to': "Doit être supérieure ou égale à year_from."})
+        metric = request.query_params.get('metric', 'total')
+        if metric not in SERIES:
+            raise ValidationError({'metric': f"Valeurs possibles : {', '.join(SERIES)}"})
+        return Response(get_discipline_matrix().encode(season, year_from, year_to, metric))
+
+
+@method_decorator(conditional_on_data_version, name='dispatch')
+class NestedQueryViewSet(CachedResponseMixin, AdmissionControlMixin, viewsets.ViewSet):
+    """
+    API endpoint de requêtes imbriquées.
+    `/api/query/?resource=countries&ids=1,2&include=games:3.medals.athlete` :
+    les objets demandés et leurs relations, une requête par relation incluse.
+    """
+    cached_actions = ('list',)
+    throttle_costs = {'list': 20}
+    query_budget = 30  # une requête par relation incluse
+    max_ids = 100
+    max_depth = 3
+    max_rows = 2000
+    
+    def list(self, request):
+        """Retourne les objets racines avec leurs relations imbriquées."""
+        resource = request.query_params.get('resource')
+        if resource not in NESTED_RESOURCES:
+            raise ValidationError({'resource': f"Valeurs possibles : {', '.join(NESTED_RESOURCES)}."})
+        ids = parse_id_list(request, 'ids', self.max_ids)
+        if not ids:
+            raise ValidationError({'ids': "Au moins un identifiant attendu."})
+        try:
+            tree = parse_include(resource, request.query_params.get('include', ''), self.max_depth)
+            results = resolve(resource, ids, tree, self.max_rows)
+        except NestedQueryError as error:
+            raise ValidationError({'include': str(error)})
+        return Response({'resource': resource, 'results': results})
+
+
+@method_decorator(conditional_on_data_version, name='dispatch')
+class ChangesViewSet(CachedResponseMixin, AdmissionControlMixin, viewsets.ViewSet):
+    """
+    API endpoint de synchronisation incrémentale.
+    `/api/changes/?since=<version>` : objets créés, modifiés et supprimés
+    depuis une version des données, par ressource. `full_resync` vaut true
+    quand le journal ne couvre pas la version demandée : le client doit
+    alors tout recharger.
+    """
+    cached_actions = ('list',)
+    throttle_costs = {'list': 5}
+    
+    def list(self, request):
+        """Retourne les changements nets publiés depuis `since`."""
+        try:
+            since = int(request.query_params.get('since', ''))
+        except ValueError:
+            raise ValidationError({'since': "Numéro de version entier attendu."})
+        if since < 0:
+            raise ValidationError({'since': "Numéro de version positif attendu."})
+        
+        version = get_data_version()
+        full_resync = is_resync_required(since, version)
+        return Response({
+            'version': version,
+            'since': since,
+            'full_resync': full_resync,
+            'changes': {} if full_resync else changes_since(since),
+        })
+
+
+@method_decorator(conditional_on_data_version, name='dispatch')
+class PageViewSet(CachedResponseMixin, AdmissionControlMixin, viewsets.ViewSet):
+    """
+    API endpoint des pages du frontend : tout le contenu d'une page en une réponse.
+    """
+    cached_actions = ('home', 'country', 'game')
+    throttle_costs = {'country': 10, 'game': 10}
+    
+    @action(detail=False, methods=['get'])
+    def home(self, request):
+        """Tableau de bord : statistiques globales, top 10 des pays, 5 derniers jeux."""
+        return Response({
+            'stats': get_overview(),
+            'top_countries': CountryValuesSerializer.serialize(
+                CountryValuesSerializer.values(Country.objects.all()[:10])
+            ),
+            'recent_games': OlympicGameValuesSerializer.serialize(
+                OlympicGameValuesSerializer.values(OlympicGame.objects.all()[:5])
+            ),
+        })
+    
+    @action(detail=False, methods=['get'], url_path=r'countries/(?P<pk>\d+)')
+    def country(self, request, pk=None):
+        """Fiche pays (identique à `/api/countries/{id}/`)."""
+        country = get_object_or_404(Country, pk=pk)
+        return Response({'country': country_detail(country, request)})
+    
+    @action(detail=False, methods=['get'], url_path=r'games/(?P<pk>\d+)')
+    def game(self, request, pk=None):
+        """Fiche jeu avec son top 10 des pays."""
+        game = get_object_or_404(OlympicGame, pk=pk)
+        return Response({
+            'game': GameDetailSerializer(game, context={'request': request}).data,
+            'top_countries': game_top_countries(game),
+        })
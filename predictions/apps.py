@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class PredictionsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "predictions"
+
+    def ready(self):
+        # Comptage des requêtes SQL par requête HTTP (voir instrumentation.py)
+        from .instrumentation import install_query_recorder
+        connection_created.connect(install_query_recorder, dispatch_uid='predictions.query_recorder')
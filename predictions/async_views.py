@@ -0,0 +1,74 @@
+"""
+Variantes async des endpoints d'agrégation, à servir sous ASGI (`config/asgi.py`).
+
+Chaque vue lance ses requêtes indépendantes en même temps dans le pool borné
+de `concurrency.run_query` puis les attend ensemble : la latence d'une
+requête HTTP est celle de la requête SQL la plus lente et non leur somme, et
+la boucle d'événements reste libre pendant l'attente.
+
+Les réponses sont identiques à celles des endpoints synchrones :
+- `/api/async/stats/overview/` ↔ `/api/stats/overview/`
+- `/api/async/countries/{id}/` ↔ `/api/countries/{id}/`
+- `/api/async/games/{id}/` ↔ `/api/pages/games/{id}/`
+"""
+
+import asyncio
+
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from rest_framework.exceptions import NotFound
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from .api_views import country_medals_by_discipline, game_top_countries
+from .concurrency import run_query
+from .conditional import conditional_on_data_version
+from .models import OlympicGame, Country, Medal
+from .serializers import CountrySerializer, OlympicGameSerializer, medal_page
+from .stats import aget_overview
+
+
+def json_response(data, status=200):
+    return HttpResponse(JSONRenderer().render(data), content_type='application/json', status=status)
+
+
+def not_found():
+    return json_response({'detail': str(NotFound.default_detail)}, status=404)
+
+
+def serialize_object(model, serializer_class, pk):
+    return serializer_class(get_object_or_404(model, pk=pk)).data
+
+
+@conditional_on_data_version
+async def stats_overview(request):
+    """Statistiques globales (trois agrégats en parallèle si le cache est vide)."""
+    return json_response(await aget_overview())
+
+
+@conditional_on_data_version
+async def country_detail(request, pk):
+    """Fiche pays : pays, page de médailles et disciplines en parallèle."""
+    try:
+        country, medals, disciplines = await asyncio.gather(
+            run_query(serialize_object, Country, CountrySerializer, pk),
+            run_query(medal_page, Medal.objects.filter(country_id=pk), Request(request)),
+            run_query(lambda: list(country_medals_by_discipline(pk))),
+        )
+    except Http404:
+        return not_found()
+    return json_response({**country, **medals, 'medals_by_discipline': disciplines})
+
+
+@conditional_on_data_version
+async def game_detail(request, pk):
+    """Fiche jeu : jeu, page de médailles et top 10 des pays en parallèle."""
+    try:
+        game, medals, top_countries = await asyncio.gather(
+            run_query(serialize_object, OlympicGame, OlympicGameSerializer, pk),
+            run_query(medal_page, Medal.objects.filter(game_id=pk), Request(request)),
+            run_query(lambda: list(game_top_countries(pk))),
+        )
+    except Http404:
+        return not_found()
+    return json_response({'game': {**game, **medals}, 'top_countries': top_countries})
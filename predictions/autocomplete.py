@@ -0,0 +1,227 @@
+"""
+Index d'autocomplétion en mémoire sur les noms d'athlètes et de pays.
+
+Deux structures complémentaires par type d'objet, construites une fois par
+version des données :
+- des listes triées des noms et des suffixes de mots (« michael phelps »,
+  « phelps ») : un préfixe saisi est trouvé par recherche dichotomique
+  (`bisect`), quel que soit le mot du nom par lequel il commence ;
+- un index de trigrammes (« phe » → noms) pour les saisies au milieu d'un
+  mot : la plus courte liste des trigrammes de la saisie est parcourue et la
+  sous-chaîne vérifiée, jusqu'à obtenir assez de résultats.
+
+Les noms sont normalisés (minuscules, accents retirés) à l'indexation comme à
+la recherche. L'index est construit au démarrage du worker (`config/wsgi.py`,
+`config/asgi.py`) ou chargé depuis le fichier `AUTOCOMPLETE_INDEX_PATH` écrit
+par `import_data.py` / `python manage.py build_autocomplete_index`, puis
+reconstruit automatiquement lorsque la version des données change.
+"""
+
+import bisect
+import logging
+import pickle
+import threading
+import unicodedata
+
+from django.conf import settings
+from django.db import DatabaseError
+
+from .models import Athlete, Country
+from .versioning import get_data_version_info
+
+
+logger = logging.getLogger(__name__)
+
+AUTOCOMPLETE_KINDS = ('athlete', 'country')
+
+# Rangs des correspondances : début du nom, début d'un mot, milieu d'un mot
+MATCH_NAME_PREFIX, MATCH_WORD_PREFIX, MATCH_SUBSTRING = 0, 1, 2
+
+
+def normalize(text):
+    """Minuscules sans accents ni espaces superflus."""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(stripped.lower().split())
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class NameIndex:
+    """
+    Index des noms d'un type d'objet. `full_keys` contient les noms complets
+    triés, `word_keys` les suffixes commençant à un mot autre que le premier,
+    `trigram_postings` les positions des noms contenant chaque trigramme.
+    """
+
+    def __init__(self, entries):
+        self.ids = [pk for pk, _ in entries]
+        self.names = [name for _, name in entries]
+        self.normalized = [normalize(name) for name in self.names]
+
+        full_keys, word_keys = [], []
+        postings = {}
+        for position, text in enumerate(self.normalized):
+            full_keys.append((text, position))
+            start = text.find(' ') + 1
+            while start > 0:
+                word_keys.append((text[start:], position))
+                start = text.find(' ', start) + 1
+            for trigram in trigrams(text):
+                postings.setdefault(trigram, []).append(position)
+        full_keys.sort()
+        word_keys.sort()
+        self.full_keys = [key for key, _ in full_keys]
+        self.full_positions = [position for _, position in full_keys]
+        self.word_keys = [key for key, _ in word_keys]
+        self.word_positions = [position for _, position in word_keys]
+        self.trigram_postings = postings
+
+    def __len__(self):
+        return len(self.ids)
+
+    @staticmethod
+    def _prefix_range(keys, positions, text, seen, limit):
+        """Au plus `limit` positions (non vues) dont la clé commence par `text`, dans l'ordre."""
+        found = []
+        index = bisect.bisect_left(keys, text)
+        while index < len(keys) and len(found) < limit and keys[index].startswith(text):
+            position = positions[index]
+            if position not in seen:
+                seen.add(position)
+                found.append(position)
+            index += 1
+        return found
+
+    def _substrings(self, text, seen, limit):
+        """Au plus `limit` positions (non vues) contenant `text` (au moins 3 caractères)."""
+        postings = [self.trigram_postings.get(trigram) for trigram in trigrams(text)]
+        if not postings or not all(postings):
+            return []
+        found = []
+        for position in min(postings, key=len):
+            if position not in seen and text in self.normalized[position]:
+                seen.add(position)
+                found.append(position)
+                if len(found) >= limit:
+                    break
+        return found
+
+    def lookup(self, text, limit):
+        """
+        Retourne au plus `limit` triplets (rang, nom normalisé, position) :
+        débuts de nom, puis débuts de mot, puis sous-chaînes.
+        """
+        seen = set()
+        ranked = []
+        for rank, finder in (
+            (MATCH_NAME_PREFIX, lambda: self._prefix_range(self.full_keys, self.full_positions, text, seen, limit)),
+            (MATCH_WORD_PREFIX, lambda: self._prefix_range(self.word_keys, self.word_positions, text, seen, limit)),
+            (MATCH_SUBSTRING, lambda: self._substrings(text, seen, limit) if len(text) >= 3 else []),
+        ):
+            if len(ranked) >= limit:
+                break
+            found = sorted(finder(), key=lambda position: self.normalized[position])
+            ranked.extend((rank, self.normalized[position], position) for position in found)
+        return ranked[:limit]
+
+
+class AutocompleteIndex:
+    """
+    Index immuable, un `NameIndex` par type d'objet. `version` est le couple
+    (version, date de mise à jour) des données indexées.
+    """
+
+    def __init__(self, entries, version=(0, None)):
+        self.version = version
+        by_kind = {kind: [] for kind in AUTOCOMPLETE_KINDS}
+        for kind, pk, name in entries:
+            by_kind[kind].append((pk, name))
+        self.indexes = {kind: NameIndex(kind_entries) for kind, kind_entries in by_kind.items()}
+
+    @classmethod
+    def from_database(cls):
+        version = get_data_version_info()
+        entries = [
+            ('athlete', pk, name)
+            for pk, name in Athlete.objects.order_by().values_list('id', 'athlete_full_name')
+        ]
+        entries += [
+            ('country', pk, name)
+            for pk, name in Country.objects.order_by().values_list('id', 'country_name')
+        ]
+        return cls(entries, version=version)
+
+    def __len__(self):
+        return sum(len(index) for index in self.indexes.values())
+
+    def lookup(self, query, kind=None, limit=10):
+        """
+        Retourne au plus `limit` dictionnaires {type, id, name}, les noms qui
+        commencent par la saisie d'abord, puis les mots, puis les sous-chaînes.
+        """
+        text = normalize(query)
+        if not text or limit <= 0:
+            return []
+
+        kinds = [kind] if kind is not None else AUTOCOMPLETE_KINDS
+        candidates = []
+        for entry_kind in kinds:
+            index = self.indexes[entry_kind]
+            for rank, name, position in index.lookup(text, limit):
+                candidates.append((rank, name, entry_kind, position))
+        candidates.sort()
+
+        return [
+            {
+                'type': entry_kind,
+                'id': self.indexes[entry_kind].ids[position],
+                'name': self.indexes[entry_kind].names[position],
+            }
+            for _, _, entry_kind, position in candidates[:limit]
+        ]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def save_autocomplete_index(index, path=None):
+    path = path or settings.AUTOCOMPLETE_INDEX_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as index_file:
+        pickle.dump(index, index_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _load_from_file(version):
+    path = settings.AUTOCOMPLETE_INDEX_PATH
+    try:
+        with open(path, 'rb') as index_file:
+            index = pickle.load(index_file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+    return index if getattr(index, 'version', None) == version else None
+
+
+def get_autocomplete_index():
+    """Index de la version courante des données (fichier prébâti ou construit depuis la base)."""
+    global _index
+    version = get_data_version_info()
+    index = _index
+    if index is not None and index.version == version:
+        return index
+    with _index_lock:
+        if _index is None or _index.version != version:
+            index = _load_from_file(version)
+            _index = index if index is not None else AutocompleteIndex.from_database()
+        return _index
+
+
+def preload_autocomplete_index():
+    """Construit l'index au démarrage d'un worker ; ignoré si la base n'est pas prête."""
+    try:
+        get_autocomplete_index()
+    except DatabaseError:
+        logger.warning("Index d'autocomplétion non construit : base de données indisponible.")
@@ -0,0 +1,74 @@
+"""
+Backends de cache supplémentaires.
+
+`BoundedLocMemCache` est un cache mémoire local (par processus) qui, en plus
+du nombre maximal d'entrées (`MAX_ENTRIES`), borne la mémoire occupée par les
+valeurs (`MAX_BYTES`). L'éviction se fait strictement dans l'ordre LRU, une
+entrée à la fois, au lieu de la purge d'un tiers du cache de `LocMemCache`.
+"""
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.locmem import LocMemCache
+
+
+# Taille (en octets) de chaque valeur stockée et total, par nom de cache
+_usage = {}
+
+
+class BoundedLocMemCache(LocMemCache):
+    """Cache mémoire local LRU borné en nombre d'entrées et en octets."""
+
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        options = params.get('OPTIONS', {})
+        self._max_bytes = int(options.get('MAX_BYTES', 64 * 1024 * 1024))
+        self._usage = _usage.setdefault(name, {'sizes': {}, 'bytes': 0})
+
+    @property
+    def size_in_bytes(self):
+        """Mémoire occupée par les valeurs (sérialisées) du cache."""
+        return self._usage['bytes']
+
+    def _forget_size(self, key):
+        self._usage['bytes'] -= self._usage['sizes'].pop(key, 0)
+
+    def _evict_lru(self):
+        key, _ = self._cache.popitem()
+        self._expire_info.pop(key, None)
+        self._forget_size(key)
+
+    def _set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        self._delete(key)
+        size = len(value)
+        if size > self._max_bytes:
+            return
+        while self._cache and self._usage['bytes'] + size > self._max_bytes:
+            self._evict_lru()
+        super()._set(key, value, timeout)
+        self._usage['sizes'][key] = size
+        self._usage['bytes'] += size
+
+    def _cull(self):
+        while self._cache and len(self._cache) >= self._max_entries:
+            self._evict_lru()
+
+    def _delete(self, key):
+        self._forget_size(key)
+        return super()._delete(key)
+
+    def incr(self, key, delta=1, version=None):
+        value = super().incr(key, delta, version)
+        validated_key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            self._forget_size(validated_key)
+            size = len(self._cache[validated_key])
+            self._usage['sizes'][validated_key] = size
+            self._usage['bytes'] += size
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._expire_info.clear()
+            self._usage['sizes'].clear()
+            self._usage['bytes'] = 0
@@ -0,0 +1,143 @@
+"""
+Journal des modifications publiées à chaque version des données.
+
+`import_data.py` et `generate_predictions.py` s'exécutent dans
+`track_changes()` : les signaux `post_save` / `post_delete` des modèles
+suivis y sont collectés, puis `bump_data_version(changes=...)` les enregistre
+(`ChangeLogEntry`) sous la nouvelle version, dans la même transaction.
+
+`changes_since(version)` renvoie, par ressource, l'état net des objets
+touchés depuis une version : créés, modifiés (contenu actuel) ou supprimés
+(identifiants). Les écritures en masse (`QuerySet.update`, `bulk_create`)
+n'émettent pas de signaux et ne sont donc pas journalisées.
+"""
+
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+
+from .models import OlympicGame, Athlete, Country, CountryPrediction, ChangeLogEntry
+from .serializers import (
+    OlympicGameValuesSerializer, AthleteValuesSerializer, CountryValuesSerializer,
+    CountryPredictionValuesSerializer
+)
+
+
+# Ressources suivies : modèle et serializer rapide
+TRACKED_RESOURCES = {
+    'countries': (Country, CountryValuesSerializer),
+    'games': (OlympicGame, OlympicGameValuesSerializer),
+    'athletes': (Athlete, AthleteValuesSerializer),
+    'predictions': (CountryPrediction, CountryPredictionValuesSerializer),
+}
+
+
+def merge_action(previous, action):
+    """
+    Action nette de deux changements successifs d'un même objet ; None si
+    l'objet a été créé puis supprimé (rien à transmettre).
+    """
+    if previous is None:
+        return action
+    if previous == 'created':
+        return None if action == 'deleted' else 'created'
+    if previous == 'deleted' and action == 'created':
+        return 'updated'
+    return action
+
+
+class ChangeTracker:
+    """Changements nets collectés : {(ressource, identifiant): action}."""
+
+    def __init__(self):
+        self.actions = {}
+
+    def add(self, resource, object_id, action):
+        key = (resource, object_id)
+        merged = merge_action(self.actions.get(key), action)
+        if merged is None:
+            self.actions.pop(key, None)
+        else:
+            self.actions[key] = merged
+
+    def __len__(self):
+        return len(self.actions)
+
+    def save(self, version):
+        """Enregistre les changements sous `version` et purge les versions trop anciennes."""
+        ChangeLogEntry.objects.bulk_create([
+            ChangeLogEntry(version=version, resource=resource, object_id=object_id, action=action)
+            for (resource, object_id), action in self.actions.items()
+        ], batch_size=1000)
+        ChangeLogEntry.objects.filter(version__lte=version - changelog_retention()).delete()
+        self.actions = {}
+
+
+def changelog_retention():
+    """Nombre de versions conservées dans le journal."""
+    return getattr(settings, 'CHANGELOG_RETENTION_VERSIONS', 50)
+
+
+@contextmanager
+def track_changes():
+    """Collecte les créations, modifications et suppressions des ressources suivies."""
+    tracker = ChangeTracker()
+    receivers = []
+    for resource, (model, _) in TRACKED_RESOURCES.items():
+        def on_save(sender, instance, created, resource=resource, **kwargs):
+            tracker.add(resource, instance.pk, 'created' if created else 'updated')
+
+        def on_delete(sender, instance, resource=resource, **kwargs):
+            tracker.add(resource, instance.pk, 'deleted')
+
+        post_save.connect(on_save, sender=model, weak=False)
+        post_delete.connect(on_delete, sender=model, weak=False)
+        receivers.append((model, on_save, on_delete))
+    try:
+        yield tracker
+    finally:
+        for model, on_save, on_delete in receivers:
+            post_save.disconnect(on_save, sender=model)
+            post_delete.disconnect(on_delete, sender=model)
+
+
+def is_resync_required(since, current):
+    """Vrai si le journal ne couvre pas l'intervalle ]since, current]."""
+    return since > current or since < current - changelog_retention()
+
+
+def changes_since(since):
+    """
+    Changements nets depuis la version `since`, par ressource :
+    {"created": [objets], "updated": [objets], "deleted": [identifiants]}.
+    Une requête pour le journal, puis une par ressource à charger.
+    """
+    net = {}
+    entries = ChangeLogEntry.objects.filter(version__gt=since).order_by('version', 'id').values_list(
+        'resource', 'object_id', 'action'
+    )
+    for resource, object_id, action in entries:
+        key = (resource, object_id)
+        merged = merge_action(net.get(key), action)
+        if merged is None:
+            net.pop(key, None)
+        else:
+            net[key] = merged
+
+    result = {}
+    for resource, (model, values_serializer) in TRACKED_RESOURCES.items():
+        actions = {object_id: action for (name, object_id), action in net.items() if name == resource}
+        if not actions:
+            continue
+        live_ids = [object_id for object_id, action in actions.items() if action != 'deleted']
+        objects = {}
+        if live_ids:
+            rows = values_serializer.values(model.objects.filter(id__in=live_ids).order_by('id'))
+            objects = {item['id']: item for item in values_serializer.serialize(list(rows))}
+        result[resource] = {
+            'created': [objects[pk] for pk, action in actions.items() if action == 'created' and pk in objects],
+            'updated': [objects[pk] for pk, action in actions.items() if action == 'updated' and pk in objects],
+            'deleted': sorted(pk for pk, action in actions.items() if action == 'deleted'),
+        }
+    return result
@@ -0,0 +1,61 @@
+"""
+Comparaison de plusieurs pays (jusqu'à 20) en un nombre fixe de requêtes.
+
+- par jeu : séries de `timeseries.medal_timeseries` (matrice `CountryGameStats`)
+- par discipline : un seul GROUP BY (pays, discipline) sur `country_id__in`
+
+Les matrices sont indexées [pays][colonne] : la ligne i correspond au i-ème
+pays de `countries`, la colonne j au j-ème jeu de `games` ou à la j-ème
+discipline de `disciplines` (disciplines triées par total décroissant sur
+l'ensemble des pays comparés).
+"""
+
+from django.db.models import Count, Q
+
+from .models import Medal
+from .timeseries import SEASONS, SERIES, medal_timeseries
+
+
+def discipline_matrix(country_ids, season=None):
+    """Disciplines et matrices or / argent / bronze / total des pays (dans l'ordre donné)."""
+    medals = Medal.objects.filter(country_id__in=country_ids)
+    if season is not None:
+        medals = medals.filter(game__game_season=SEASONS[season])
+    rows = list(medals.order_by().values('country_id', 'discipline_title').annotate(
+        gold=Count('id', filter=Q(medal_type='GOLD')),
+        silver=Count('id', filter=Q(medal_type='SILVER')),
+        bronze=Count('id', filter=Q(medal_type='BRONZE')),
+        total=Count('id'),
+    ))
+
+    totals = {}
+    for row in rows:
+        totals[row['discipline_title']] = totals.get(row['discipline_title'], 0) + row['total']
+    disciplines = sorted(totals, key=lambda discipline: (-totals[discipline], discipline))
+    columns = {discipline: index for index, discipline in enumerate(disciplines)}
+    lines = {country_id: index for index, country_id in enumerate(country_ids)}
+
+    matrices = {name: [[0] * len(disciplines) for _ in country_ids] for name in SERIES}
+    for row in rows:
+        line, column = lines[row['country_id']], columns[row['discipline_title']]
+        for name in SERIES:
+            matrices[name][line][column] = row[name]
+    return {'disciplines': disciplines, **matrices}
+
+
+def compare_countries(country_ids, season=None):
+    """Matrices par jeu et par discipline des pays connus parmi `country_ids`."""
+    by_game = medal_timeseries(country_ids, season)
+    countries = [
+        {'id': country['id'], 'country_name': country['country_name']}
+        for country in by_game['countries']
+    ]
+    known_ids = [country['id'] for country in countries]
+    return {
+        'countries': countries,
+        'by_game': {
+            'games': by_game['games'],
+            **{name: [country[name] for country in by_game['countries']] for name in SERIES},
+        },
+        'by_discipline': discipline_matrix(known_ids, season),
+    }
@@ -0,0 +1,73 @@
+"""
+Compression des réponses de l'API négociée sur `Accept-Encoding`.
+
+Les réponses calculées sont compressées en gzip à la volée par
+`GZipMiddleware`. Les réponses mises en cache par `CachedResponseMixin` sont
+compressées une seule fois, à leur mise en cache : l'entrée contient les
+octets gzip (et brotli si le paquet facultatif `brotli` est installé), servis
+tels quels aux clients qui les acceptent.
+"""
+
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    brotli = None
+
+
+# En dessous, la compression ne réduit pas la taille (même seuil que GZipMiddleware)
+MIN_COMPRESS_LENGTH = 200
+BROTLI_QUALITY = 9
+
+
+def available_encodings():
+    """Encodages produits, par ordre de préférence."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    return compress_string(content)
+
+
+def precompress(content):
+    """{encodage: octets} des encodages qui réduisent la taille de `content`."""
+    if len(content) < MIN_COMPRESS_LENGTH:
+        return {}
+    encoded = {}
+    for encoding in available_encodings():
+        data = compress(content, encoding)
+        if len(data) < len(content):
+            encoded[encoding] = data
+    return encoded
+
+
+def negotiate_encoding(accept_encoding, encodings):
+    """
+    Encodage de `encodings` préféré par le client d'après `Accept-Encoding`
+    (valeurs q, `*` accepté), None pour la réponse non compressée.
+    À q égal, l'ordre de `encodings` départage.
+    """
+    weights = {}
+    for item in (accept_encoding or '').split(','):
+        name, _, params = item.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in encodings:
+        weight = weights.get(encoding, weights.get('*', 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
@@ -0,0 +1,58 @@
+"""
+Pool de threads borné pour exécuter des requêtes ORM depuis des vues async.
+
+L'ORM de Django est synchrone : ses variantes `a...` passent toutes par un
+même thread (`sync_to_async(thread_sensitive=True)`) et ne s'exécutent donc
+jamais en parallèle. `run_query` envoie au contraire chaque appel dans un
+pool de `ASYNC_QUERY_WORKERS` threads, chacun avec sa propre connexion à la
+base : plusieurs requêtes indépendantes d'une même vue peuvent être attendues
+ensemble avec `asyncio.gather`.
+
+Le contexte (`contextvars`) de l'appelant est recopié dans le thread, ce qui
+conserve notamment la version des données mémorisée pour la requête.
+
+Les connexions des threads du pool ne sont pas concernées par
+`request_started` / `request_finished` : chaque appel les vérifie donc avant
+et après (`close_old_connections`, qui applique `CONN_MAX_AGE` et
+`CONN_HEALTH_CHECKS` et ferme une connexion en erreur), comme Django le fait
+autour de chaque requête.
+"""
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+
+_executor = None
+
+
+def get_query_executor():
+    """Pool partagé par le processus, créé au premier appel."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'ASYNC_QUERY_WORKERS', 8),
+            thread_name_prefix='query',
+        )
+    return _executor
+
+
+def _call_with_connection_checks(func, *args, **kwargs):
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_query(func, *args, **kwargs):
+    """Exécute `func(*args, **kwargs)` dans le pool et retourne son résultat."""
+    loop = asyncio.get_running_loop()
+    call = functools.partial(
+        contextvars.copy_context().run, _call_with_connection_checks, func, *args, **kwargs
+    )
+    return await loop.run_in_executor(get_query_executor(), call)
@@ -0,0 +1,84 @@
+"""
+Requêtes conditionnelles (ETag / Last-Modified) basées sur la version des données.
+
+L'ETag d'une réponse est dérivé de la version globale des données, du chemin,
+des paramètres de la requête (normalisés) et du type de contenu demandé ;
+Last-Modified correspond à la date du dernier import ou de la dernière
+génération de prédictions. Une requête `If-None-Match` / `If-Modified-Since`
+à jour reçoit une réponse 304 avant l'exécution de toute requête de la vue.
+
+Les vues async sont acceptées : la version des données est alors lue dans le
+pool de requêtes (voir `concurrency.run_query`) avant la vérification.
+"""
+
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from .concurrency import run_query
+from .versioning import begin_request_scope, end_request_scope, get_data_version_info
+
+
+def normalized_query_string(request):
+    """Paramètres de la requête triés, pour qu'un même jeu de paramètres donne la même clé."""
+    return '&'.join(
+        f'{key}={value}'
+        for key, values in sorted(request.GET.lists())
+        for value in sorted(values)
+    )
+
+
+def data_version_etag(request, *args, **kwargs):
+    version, _ = get_data_version_info()
+    key = '|'.join([
+        str(version),
+        request.path,
+        normalized_query_string(request),
+        request.META.get('HTTP_ACCEPT', ''),
+    ])
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def data_version_last_modified(request, *args, **kwargs):
+    _, updated_at = get_data_version_info()
+    return updated_at
+
+
+def conditional_on_data_version(view):
+    """
+    Décorateur de vue : ETag / Last-Modified liés à la version des données.
+    `Cache-Control: no-cache` oblige les clients à revalider (requête
+    conditionnelle) plutôt qu'à réutiliser une réponse d'une version antérieure.
+    """
+    conditional_view = condition(
+        etag_func=data_version_etag,
+        last_modified_func=data_version_last_modified,
+    )(view)
+    
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_inner(request, *args, **kwargs):
+            # Version lue hors de la boucle d'événements puis mémorisée pour la vue
+            token = begin_request_scope()
+            try:
+                await run_query(get_data_version_info)
+                response = await conditional_view(request, *args, **kwargs)
+            finally:
+                end_request_scope(token)
+            if request.method in ('GET', 'HEAD'):
+                patch_cache_control(response, no_cache=True)
+            return response
+        
+        return async_inner
+    
+    @wraps(view)
+    def inner(request, *args, **kwargs):
+        response = conditional_view(request, *args, **kwargs)
+        if request.method in ('GET', 'HEAD'):
+            patch_cache_control(response, no_cache=True)
+        return response
+    
+    return inner
@@ -0,0 +1,67 @@
+"""
+Export en streaming des médailles et des prédictions (NDJSON ou CSV).
+
+Les lignes sont lues avec `.values_list(...).iterator(chunk_size=...)` et
+écrites au fil de l'eau dans une `StreamingHttpResponse` : la mémoire utilisée
+reste constante quelle que soit la taille de l'export.
+"""
+
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+from .serializers import MedalValuesSerializer, CountryPredictionValuesSerializer
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Colonnes exportées : (nom dans l'export, lookup ORM), identiques à l'API
+MEDAL_EXPORT_FIELDS = MedalValuesSerializer.fields
+
+PREDICTION_EXPORT_FIELDS = CountryPredictionValuesSerializer.fields
+
+
+class _Echo:
+    """Pseudo-fichier dont `write` renvoie la valeur écrite (pour csv.writer)."""
+
+    def write(self, value):
+        return value
+
+
+def _ndjson_lines(names, rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(names, row))) + '\n'
+
+
+def _csv_lines(names, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(names)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def stream_export(queryset, fields, export_format, filename):
+    """
+    Construit une réponse en streaming pour un QuerySet.
+    Args:
+        queryset: QuerySet filtré à exporter
+        fields: liste de couples (nom de colonne, lookup ORM)
+        export_format: 'csv' ou 'ndjson'
+        filename: nom du fichier proposé au téléchargement (sans extension)
+    """
+    names = [name for name, _ in fields]
+    rows = queryset.values_list(
+        *[lookup for _, lookup in fields]
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+    if export_format == 'csv':
+        content, content_type = _csv_lines(names, rows), 'text/csv; charset=utf-8'
+    else:
+        export_format = 'ndjson'
+        content, content_type = _ndjson_lines(names, rows), 'application/x-ndjson; charset=utf-8'
+
+    response = StreamingHttpResponse(content, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    return response
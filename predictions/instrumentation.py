@@ -0,0 +1,139 @@
+"""
+Mesures par requête HTTP : requêtes SQL, temps base de données, temps de
+rendu (sérialisation de la réponse) et temps total.
+
+Un `RequestTiming` est ouvert par `middleware.QueryBudgetMiddleware` et placé
+dans une ContextVar. Chaque connexion à la base reçoit un `execute_wrapper`
+(`record_queries`, installé à la création de la connexion, voir `apps.py`)
+qui enregistre les requêtes dans la mesure courante. La ContextVar étant
+recopiée dans les threads de `concurrency.run_query`, les requêtes des vues
+async exécutées en parallèle sont aussi comptées.
+"""
+
+import threading
+from collections import Counter
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.db import connections
+
+
+_current_timing = ContextVar('request_timing', default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    """Levée en mode strict lorsqu'une vue dépasse son budget de requêtes SQL."""
+
+
+class RequestTiming:
+    """Requêtes SQL et durées d'une requête HTTP."""
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.queries = []  # [(sql, durée en secondes)]
+        self.db_time = 0.0
+        self.render_time = 0.0
+        self.view_name = None
+        self.query_budget = None
+        self._lock = threading.Lock()
+
+    def record_query(self, sql, duration):
+        with self._lock:
+            self.queries.append((sql, duration))
+            self.db_time += duration
+
+    def add_render_time(self, duration):
+        self.render_time += duration
+
+    @property
+    def query_count(self):
+        return len(self.queries)
+
+    def elapsed(self):
+        return perf_counter() - self.started
+
+    def repeated_queries(self, limit=3):
+        """Requêtes exécutées plusieurs fois (signe d'un N+1), les plus fréquentes d'abord."""
+        counts = Counter(sql for sql, _ in self.queries)
+        return [(sql, count) for sql, count in counts.most_common(limit) if count > 1]
+
+    def server_timing(self, total):
+        """Valeur de l'en-tête `Server-Timing` (durées en millisecondes)."""
+        app = max(0.0, total - self.db_time - self.render_time)
+        return ', '.join([
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.query_count} queries"',
+            f'ser;dur={self.render_time * 1000:.1f}',
+            f'app;dur={app * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ])
+
+
+def begin_timing():
+    """Ouvre la mesure de la requête courante ; retourne (mesure, jeton de reset)."""
+    timing = RequestTiming()
+    return timing, _current_timing.set(timing)
+
+
+def timed_stream(content, timing):
+    """
+    Itère le corps d'une réponse en streaming en rendant `timing` courante le
+    temps de produire chaque morceau : les requêtes SQL de l'export, exécutées
+    après la sortie du middleware, sont comptées dans la mesure de la requête.
+    """
+    iterator = iter(content)
+    while True:
+        token = _current_timing.set(timing)
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _current_timing.reset(token)
+        yield chunk
+
+
+async def atimed_stream(content, timing):
+    """Variante asynchrone de `timed_stream`."""
+    iterator = aiter(content)
+    while True:
+        token = _current_timing.set(timing)
+        try:
+            chunk = await anext(iterator)
+        except StopAsyncIteration:
+            return
+        finally:
+            _current_timing.reset(token)
+        yield chunk
+
+
+def end_timing(token):
+    _current_timing.reset(token)
+
+
+def current_timing():
+    """Mesure de la requête en cours (None hors requête)."""
+    return _current_timing.get()
+
+
+def record_queries(execute, sql, params, many, context):
+    """`execute_wrapper` enregistrant chaque requête dans la mesure courante."""
+    timing = _current_timing.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    started = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.record_query(sql, perf_counter() - started)
+
+
+def install_query_recorder(connection, **kwargs):
+    """Installe `record_queries` sur une connexion (récepteur de `connection_created`)."""
+    if record_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_queries)
+
+
+def install_on_open_connections():
+    """Installe l'enregistreur sur les connexions déjà ouvertes du thread courant."""
+    for connection in connections.all(initialized_only=True):
+        install_query_recorder(connection)
@@ -0,0 +1,22 @@
+"""
+Commande de construction de l'index d'autocomplétion prébâti.
+
+Usage :
+    python manage.py build_autocomplete_index
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from predictions.autocomplete import AutocompleteIndex, save_autocomplete_index
+
+
+class Command(BaseCommand):
+    help = "Construit l'index d'autocomplétion et l'écrit dans AUTOCOMPLETE_INDEX_PATH."
+
+    def handle(self, *args, **options):
+        index = AutocompleteIndex.from_database()
+        save_autocomplete_index(index)
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {len(index)} noms indexés dans {settings.AUTOCOMPLETE_INDEX_PATH}"
+        ))
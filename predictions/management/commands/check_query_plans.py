@@ -0,0 +1,64 @@
+"""
+Commande de vérification des plans d'exécution des requêtes chaudes.
+
+Usage :
+    python manage.py check_query_plans
+    python manage.py check_query_plans --verbose
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from predictions.query_plans import HOT_QUERIES, explain_query_plan, find_full_scans
+
+
+class Command(BaseCommand):
+    help = "Exécute EXPLAIN QUERY PLAN sur les requêtes chaudes et échoue en cas de parcours complet de table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verbose', action='store_true',
+            help="Affiche le plan complet de chaque requête."
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError(
+                f"EXPLAIN QUERY PLAN n'est supporté que pour SQLite (base actuelle : {connection.vendor})"
+            )
+
+        failures = []
+        for hot_query in HOT_QUERIES:
+            plan = explain_query_plan(hot_query['queryset']())
+            scans = find_full_scans(
+                plan,
+                pk_ordered=hot_query.get('pk_ordered', ()),
+                index_ordered=hot_query.get('index_ordered'),
+            )
+            tolerated = hot_query.get('tolerated')
+
+            if scans and tolerated:
+                self.stdout.write(self.style.WARNING(
+                    f"⚠ {hot_query['name']}: parcours complet de {', '.join(scans)} toléré ({tolerated})"
+                ))
+            elif scans:
+                failures.append(hot_query['name'])
+                self.stdout.write(self.style.ERROR(
+                    f"✗ {hot_query['name']}: parcours complet de {', '.join(scans)} "
+                    f"[{hot_query['source']}]"
+                ))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"✓ {hot_query['name']}"))
+
+            if options['verbose'] or (scans and not tolerated):
+                for detail in plan:
+                    self.stdout.write(f"    {detail}")
+
+        if failures:
+            raise CommandError(
+                f"{len(failures)} requête(s) chaude(s) sans index : {', '.join(failures)}"
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"\n{len(HOT_QUERIES)} requêtes chaudes vérifiées, aucun parcours complet non toléré."
+        ))
@@ -0,0 +1,105 @@
+"""
+Commande d'agrégation des profils écrits par ProfilingMiddleware.
+
+Usage :
+    python manage.py profile_report
+    python manage.py profile_report --endpoint CountryViewSet.retrieve --limit 30 --sort tottime
+"""
+
+import json
+import pstats
+from collections import defaultdict
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from predictions.profiling import profile_directory
+
+
+SORT_KEYS = {'cumulative': 3, 'tottime': 2}
+
+
+def load_profiles(directory, endpoint=None):
+    """{endpoint: [(métadonnées, chemin du .prof)]} des profils du répertoire."""
+    profiles = defaultdict(list)
+    for metadata_path in sorted(Path(directory).glob('*.json')):
+        prof_path = metadata_path.with_suffix('.prof')
+        if not prof_path.exists():
+            continue
+        metadata = json.loads(metadata_path.read_text(encoding='utf-8'))
+        if endpoint and endpoint not in metadata['endpoint']:
+            continue
+        profiles[metadata['endpoint']].append((metadata, prof_path))
+    return profiles
+
+
+def top_functions(prof_paths, limit, sort='cumulative'):
+    """Fonctions les plus coûteuses de l'ensemble des profils : [(appels, propre, cumulé, fonction)]."""
+    stats = pstats.Stats(*[str(path) for path in prof_paths])
+    index = SORT_KEYS[sort]
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][index], reverse=True)
+    return [
+        (calls, tottime, cumtime, pstats.func_std_string(function))
+        for function, (_, calls, tottime, cumtime, _) in rows[:limit]
+    ]
+
+
+def top_queries(metadata_list, limit):
+    """Requêtes SQL au temps cumulé le plus élevé : [(temps ms, exécutions, sql)]."""
+    totals = defaultdict(lambda: [0.0, 0])
+    for metadata in metadata_list:
+        for query in metadata['queries']:
+            totals[query['sql']][0] += query['ms']
+            totals[query['sql']][1] += 1
+    rows = sorted(totals.items(), key=lambda item: item[1][0], reverse=True)
+    return [(ms, count, sql) for sql, (ms, count) in rows[:limit]]
+
+
+class Command(BaseCommand):
+    help = "Agrège les profils de requêtes (profiles/) en un classement des fonctions par endpoint."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--directory', help="Répertoire des profils (défaut : PROFILING['DIRECTORY']).")
+        parser.add_argument('--endpoint', help="Ne garde que les endpoints contenant ce texte.")
+        parser.add_argument('--limit', type=int, default=20, help="Fonctions affichées par endpoint.")
+        parser.add_argument('--sort', choices=sorted(SORT_KEYS), default='cumulative',
+                            help="Temps cumulé (fonctions appelées comprises) ou propre.")
+        parser.add_argument('--queries', type=int, default=5, help="Requêtes SQL affichées par endpoint.")
+
+    def handle(self, *args, **options):
+        directory = Path(options['directory']) if options['directory'] else profile_directory()
+        if not directory.is_dir():
+            raise CommandError(f"Aucun profil : le répertoire {directory} n'existe pas")
+
+        profiles = load_profiles(directory, options['endpoint'])
+        if not profiles:
+            raise CommandError(f"Aucun profil dans {directory}")
+
+        # Endpoints par temps total décroissant
+        ordered = sorted(
+            profiles.items(), key=lambda item: sum(metadata['total_ms'] for metadata, _ in item[1]), reverse=True
+        )
+        for endpoint, entries in ordered:
+            metadata_list = [metadata for metadata, _ in entries]
+            count = len(entries)
+            total_ms, db_ms, query_count = (
+                sum(metadata[key] or 0 for metadata in metadata_list) / count
+                for key in ('total_ms', 'db_ms', 'query_count')
+            )
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n{endpoint}"))
+            self.stdout.write(
+                f"  {count} profil(s) : {total_ms:.1f} ms en moyenne, "
+                f"dont {db_ms:.1f} ms en base ({query_count:.1f} requêtes SQL)"
+            )
+
+            self.stdout.write(f"  {'appels':>9} {'propre (ms)':>12} {'cumulé (ms)':>12}  fonction")
+            for calls, tottime, cumtime, function in top_functions(
+                [path for _, path in entries], options['limit'], options['sort']
+            ):
+                self.stdout.write(f"  {calls:>9} {tottime * 1000:>12.1f} {cumtime * 1000:>12.1f}  {function}")
+
+            queries = top_queries(metadata_list, options['queries'])
+            if queries:
+                self.stdout.write("  Requêtes SQL les plus coûteuses :")
+                for ms, executions, sql in queries:
+                    self.stdout.write(f"  {ms:>9.1f} ms {executions:>5}×  {sql[:160]}")
@@ -0,0 +1,27 @@
+"""
+Commande de pré-remplissage du cache des réponses de l'API.
+
+Usage :
+    python manage.py warm_api_cache
+    python manage.py warm_api_cache --top 20 --host api.example.com
+"""
+
+from django.core.management.base import BaseCommand
+
+from predictions.response_cache import is_shared_cache, warm_response_cache
+
+
+class Command(BaseCommand):
+    help = "Pré-remplit le cache des réponses pour les pays et jeux principaux."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=10, help="Nombre de pays et de jeux à pré-calculer.")
+        parser.add_argument('--host', action='append', dest='hosts', help="Hôte servi par l'API (répétable).")
+
+    def handle(self, *args, **options):
+        if not is_shared_cache():
+            self.stdout.write(self.style.WARNING(
+                "⚠ Cache mémoire local : seules les réponses de ce processus seront pré-calculées."
+            ))
+        warmed = warm_response_cache(top=options['top'], hosts=options['hosts'])
+        self.stdout.write(self.style.SUCCESS(f"✓ {warmed} réponses mises en cache"))
@@ -0,0 +1,187 @@
+"""
+Middlewares de l'application predictions.
+"""
+
+import logging
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .instrumentation import (
+    QueryBudgetExceeded, atimed_stream, begin_timing, current_timing, end_timing,
+    install_on_open_connections, timed_stream,
+)
+from .profiling import endpoint_name, start_profile, stop_profile
+from .streaming import on_stream_end
+from .versioning import begin_request_scope, end_request_scope
+
+
+query_logger = logging.getLogger('predictions.queries')
+
+
+class DataVersionMiddleware:
+    """
+    Mémorise la version des données le temps d'une requête (une seule lecture en base).
+    Compatible WSGI et ASGI : sous ASGI, la chaîne reste asynchrone.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = begin_request_scope()
+        try:
+            return self.get_response(request)
+        finally:
+            end_request_scope(token)
+
+    async def __acall__(self, request):
+        token = begin_request_scope()
+        try:
+            return await self.get_response(request)
+        finally:
+            end_request_scope(token)
+
+
+class QueryBudgetMiddleware:
+    """
+    Compte les requêtes SQL de chaque requête HTTP et mesure les temps base de
+    données, rendu de la réponse et total, exposés dans l'en-tête
+    `Server-Timing` (si `SERVER_TIMING`).
+
+    Au-delà du budget de la vue (attribut `query_budget` de la vue ou du
+    ViewSet, `QUERY_BUDGET` par défaut), la requête est journalisée avec ses
+    requêtes répétées ; en mode strict (`QUERY_BUDGET_STRICT`, activé par les
+    tests) une `QueryBudgetExceeded` est levée.
+
+    Le corps d'une réponse en streaming (exports) est produit après le
+    middleware : ses requêtes sont comptées pendant l'envoi et le budget est
+    vérifié à la fin du corps. Ces réponses n'ont pas d'en-tête
+    `Server-Timing`, envoyé avant que les mesures ne soient connues ; la mesure
+    finale est disponible dans `response.request_timing`.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        install_on_open_connections()
+        timing, token = begin_timing()
+        try:
+            response = self.get_response(request)
+        finally:
+            end_timing(token)
+        return self.finish(response, timing)
+
+    async def __acall__(self, request):
+        timing, token = begin_timing()
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_timing(token)
+        return self.finish(response, timing)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timing = current_timing()
+        if timing is not None:
+            view = getattr(view_func, 'cls', view_func)
+            timing.view_name = f'{view.__module__}.{view.__qualname__}'
+            timing.query_budget = getattr(view, 'query_budget', None)
+
+    def process_template_response(self, request, response):
+        timing = current_timing()
+        if timing is not None:
+            started = perf_counter()
+            response.add_post_render_callback(lambda rendered: timing.add_render_time(perf_counter() - started))
+        return response
+
+    def finish(self, response, timing):
+        if getattr(response, 'streaming', False):
+            stream = atimed_stream if response.is_async else timed_stream
+            response.streaming_content = stream(response.streaming_content, timing)
+            response.request_timing = timing
+            return on_stream_end(response, lambda: self.check_budget(timing))
+
+        if getattr(settings, 'SERVER_TIMING', True):
+            response['Server-Timing'] = timing.server_timing(timing.elapsed())
+        self.check_budget(timing)
+        return response
+
+    def check_budget(self, timing):
+        budget = timing.query_budget or getattr(settings, 'QUERY_BUDGET', 20)
+        if timing.query_count > budget:
+            message = (
+                f"{timing.view_name} : {timing.query_count} requêtes SQL (budget {budget}), "
+                f"{timing.db_time * 1000:.1f} ms en base"
+            )
+            repeated = timing.repeated_queries()
+            if repeated:
+                message += ' ; répétées : ' + ' | '.join(f'{count}× {sql[:200]}' for sql, count in repeated)
+            if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+                raise QueryBudgetExceeded(message)
+            query_logger.warning(message)
+
+
+class ProfilingMiddleware:
+    """
+    Exécute sous cProfile les requêtes tirées au sort ou demandées par
+    l'en-tête de débogage (voir `profiling.py`) et écrit leur profil. Placé
+    après `QueryBudgetMiddleware` pour disposer de ses mesures SQL.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        profile = request.request_profile = start_profile(request)
+        if profile is None:
+            return self.get_response(request)
+        response = None
+        try:
+            profile.profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profile.profiler.disable()
+        finally:
+            stop_profile(profile, response)
+        return response
+
+    async def __acall__(self, request):
+        profile = request.request_profile = start_profile(request)
+        if profile is None:
+            return await self.get_response(request)
+        response = None
+        try:
+            profile.profiler.enable()
+            try:
+                response = await self.get_response(request)
+            finally:
+                profile.profiler.disable()
+        finally:
+            stop_profile(profile, response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        profile = getattr(request, 'request_profile', None)
+        if profile is not None:
+            profile.endpoint = endpoint_name(view_func, request.method)
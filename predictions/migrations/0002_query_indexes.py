@@ -0,0 +1,45 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='athlete',
+            index=models.Index(fields=['athlete_full_name', 'id'], name='athlete_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='country',
+            index=models.Index(fields=['-total_medals'], name='country_total_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='countryprediction',
+            index=models.Index(fields=['-predicted_total'], name='prediction_total_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='medal',
+            index=models.Index(fields=['country', 'medal_type'], name='medal_country_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='medal',
+            index=models.Index(fields=['game', 'country', 'medal_type'], name='medal_game_country_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='medal',
+            index=models.Index(fields=['country', 'discipline_title'], name='medal_country_disc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='medal',
+            index=models.Index(fields=['slug_game'], name='medal_slug_game_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='olympicgame',
+            index=models.Index(fields=['-game_year'], name='game_year_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Index de recherche plein texte (SQLite FTS5), alimenté par predictions.search
+
+from django.db import migrations
+
+
+def create_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS predictions_search USING fts5("
+        "kind UNINDEXED, object_id UNINDEXED, "
+        "name, discipline, event, participant, athlete, "
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    )
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS predictions_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0003_data_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0004_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CountryGameStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('gold', models.IntegerField(default=0)),
+                ('silver', models.IntegerField(default=0)),
+                ('bronze', models.IntegerField(default=0)),
+                ('total', models.IntegerField(default=0)),
+                ('country', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='game_stats', to='predictions.country')),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='country_stats', to='predictions.olympicgame')),
+            ],
+            options={
+                'verbose_name_plural': 'Country game stats',
+                'constraints': [models.UniqueConstraint(fields=('country', 'game'), name='country_game_unique')],
+            },
+        ),
+    ]
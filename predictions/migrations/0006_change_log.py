@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0005_country_game_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField()),
+                ('resource', models.CharField(max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('action', models.CharField(choices=[('created', 'Créé'), ('updated', 'Modifié'), ('deleted', 'Supprimé')], max_length=10)),
+            ],
+            options={
+                'verbose_name_plural': 'Change log entries',
+                'ordering': ['version', 'id'],
+                'indexes': [models.Index(fields=['version'], name='changelog_version_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0006_change_log'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='athlete',
+            name='medal_country',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='medalist_athletes', to='predictions.country'),
+        ),
+        migrations.AddField(
+            model_name='athlete',
+            name='medal_discipline',
+            field=models.CharField(blank=True, default='', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='athlete',
+            name='total_bronze_medals',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='athlete',
+            name='total_gold_medals',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='athlete',
+            name='total_medals',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='athlete',
+            name='total_silver_medals',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='athlete',
+            index=models.Index(fields=['-total_medals', 'id'], name='athlete_total_idx'),
+        ),
+    ]
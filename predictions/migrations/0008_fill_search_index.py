@@ -0,0 +1,45 @@
+# Remplit l'index plein texte créé vide par 0004_search_index : sans cela,
+# /api/search/ et /api/medals/?discipline= ne renvoient rien sur une base
+# existante tant que import_data.py n'a pas été relancé.
+#
+# Le SQL est figé ici (tables de ce schéma) plutôt que d'appeler
+# predictions.search.rebuild_search_index, qui suit les modèles actuels.
+
+from django.db import migrations
+
+
+COLUMNS = 'kind, object_id, name, discipline, event, participant, athlete'
+
+FILL_SEARCH_INDEX = [
+    "DELETE FROM predictions_search",
+    f"INSERT INTO predictions_search ({COLUMNS}) "
+    "SELECT 'medal', m.id, '', m.discipline_title, m.event_title, "
+    "COALESCE(m.participant_title, ''), COALESCE(a.athlete_full_name, '') "
+    "FROM predictions_medal m LEFT JOIN predictions_athlete a ON a.id = m.athlete_id",
+    f"INSERT INTO predictions_search ({COLUMNS}) "
+    "SELECT 'athlete', id, athlete_full_name, '', '', '', '' FROM predictions_athlete",
+    f"INSERT INTO predictions_search ({COLUMNS}) "
+    "SELECT 'country', id, country_name || ' ' || country_3_letter_code, '', '', '', '' FROM predictions_country",
+    f"INSERT INTO predictions_search ({COLUMNS}) "
+    "SELECT 'game', id, game_name || ' ' || game_location || ' ' || game_season, '', '', '', '' "
+    "FROM predictions_olympicgame",
+]
+
+
+def fill_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for sql in FILL_SEARCH_INDEX:
+            cursor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0007_athlete_medal_counts'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,104 @@
+"""
+Mixins partagés par les ViewSets de l'API.
+"""
+
+import time
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .streaming import on_stream_end
+from .throttling import CostThrottle, heavy_requests, latencies, latency_cost
+
+
+class FastListMixin:
+    """
+    Remplace `list()` par un chemin rapide : les lignes sont lues avec
+    `.values()` et converties par `fast_serializer_class` (voir
+    `serializers.ValuesSerializer`), sans instancier de modèles ni de
+    serializers DRF. La réponse est identique à celle de `serializer_class`.
+
+    `?fields=id,medal_type,country_name` restreint la réponse à ces champs ;
+    le SELECT et les jointures sont réduits d'autant.
+    """
+    fast_serializer_class = None
+    fields_query_param = 'fields'
+
+    def get_fast_fields(self):
+        """Champs demandés par `?fields=` (tous par défaut)."""
+        param = self.request.query_params.get(self.fields_query_param)
+        if not param:
+            return self.fast_serializer_class.fields
+        names = [name.strip() for name in param.split(',') if name.strip()]
+        try:
+            return self.fast_serializer_class.select(names)
+        except ValueError as exc:
+            raise ValidationError({self.fields_query_param: f"Champs inconnus : {exc}"})
+
+    def get_ordering_lookups(self, queryset):
+        """Colonnes de tri de la pagination par curseur, nécessaires à la position."""
+        if self.paginator is None or not hasattr(self.paginator, 'get_ordering'):
+            return ()
+        ordering = self.paginator.get_ordering(self.request, queryset, self)
+        if not ordering:
+            return ()
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        return tuple(field.lstrip('-') for field in ordering)
+
+    def list(self, request, *args, **kwargs):
+        fields = self.get_fast_fields()
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = self.fast_serializer_class.values(queryset, fields, extra=self.get_ordering_lookups(queryset))
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(self.fast_serializer_class.serialize(page, fields))
+
+        return Response(self.fast_serializer_class.serialize(rows, fields))
+
+
+class AdmissionControlMixin:
+    """
+    Coût des requêtes pour `throttling.CostThrottle` et libération de la
+    place des requêtes lourdes.
+
+    Le coût d'une action est le plus grand de `throttle_costs[action]` (1 par
+    défaut), de `get_parameter_cost()` et de la latence moyenne observée sur
+    l'endpoint convertie en jetons.
+
+    Pour une réponse en streaming (export), la place est libérée et la latence
+    mesurée à la fin de l'envoi du corps, où se fait l'essentiel du travail.
+    """
+    throttle_classes = [CostThrottle]
+    throttle_costs = {}
+
+    def get_cost_key(self):
+        return f'{type(self).__name__}.{self.action}'
+
+    def get_parameter_cost(self, request):
+        """Coût dépendant des paramètres de la requête (0 par défaut)."""
+        return 0
+
+    def get_request_cost(self, request):
+        request.admission_started = time.monotonic()
+        return max(
+            self.throttle_costs.get(self.action, 1),
+            self.get_parameter_cost(request),
+            latency_cost(self.get_cost_key()),
+        )
+
+    def end_admission(self, request, response):
+        if getattr(request, 'admission_slot', False):
+            request.admission_slot = False
+            heavy_requests.release()
+        started = getattr(request, 'admission_started', None)
+        if started is not None and response.status_code < 400:
+            latencies.record(self.get_cost_key(), time.monotonic() - started)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if getattr(response, 'streaming', False):
+            on_stream_end(response, lambda: self.end_admission(request, response))
+        else:
+            self.end_admission(request, response)
+        return super().finalize_response(request, response, *args, **kwargs)
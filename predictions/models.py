@@ -33,6 +33,9 @@ class OlympicGame(models.Model):
     
     class Meta:
         ordering = ['-game_year']
+        indexes = [
+            models.Index(fields=['-game_year'], name='game_year_idx'),
+        ]
     
     def __str__(self):
         return f"{self.game_name} ({self.game_year})"
@@ -50,8 +53,22 @@ class Athlete(models.Model):
     games_participations = models.IntegerField(default=1)  # Nombre de participations - indicateur d'expérience
     first_game = models.CharField(max_length=100, null=True, blank=True)
     
+    # Palmarès, recalculé à chaque import (stats.rebuild_athlete_medal_counts)
+    total_gold_medals = models.IntegerField(default=0)
+    total_silver_medals = models.IntegerField(default=0)
+    total_bronze_medals = models.IntegerField(default=0)
+    total_medals = models.IntegerField(default=0)
+    medal_country = models.ForeignKey(
+        'Country', on_delete=models.SET_NULL, null=True, blank=True, related_name='medalist_athletes'
+    )  # Pays de la majorité de ses médailles
+    medal_discipline = models.CharField(max_length=200, blank=True, default='')  # Discipline principale
+    
     class Meta:
         ordering = ['athlete_full_name']
+        indexes = [
+            models.Index(fields=['athlete_full_name', 'id'], name='athlete_name_idx'),
+            models.Index(fields=['-total_medals', 'id'], name='athlete_total_idx'),
+        ]
     
     def __str__(self):
         return self.athlete_full_name
@@ -75,6 +92,9 @@ class Country(models.Model):
     class Meta:
         ordering = ['-total_medals']
         verbose_name_plural = "Countries"
+        indexes = [
+            models.Index(fields=['-total_medals'], name='country_total_idx'),
+        ]
     
     def __str__(self):
         return self.country_name
@@ -107,11 +127,43 @@ class Medal(models.Model):
     
     class Meta:
         ordering = ['-id']
+        indexes = [
+            # Filtres par pays et type de médaille (statistiques pays)
+            models.Index(fields=['country', 'medal_type'], name='medal_country_type_idx'),
+            # Regroupement par jeu puis pays (classements d'un jeu), couvrant le type
+            models.Index(fields=['game', 'country', 'medal_type'], name='medal_game_country_idx'),
+            # Regroupement par pays puis discipline (fiche pays)
+            models.Index(fields=['country', 'discipline_title'], name='medal_country_disc_idx'),
+            models.Index(fields=['slug_game'], name='medal_slug_game_idx'),
+        ]
     
     def __str__(self):
         return f"{self.medal_type} - {self.discipline_title} - {self.country.country_name}"
 
 
+class CountryGameStats(models.Model):
+    """
+    Médailles d'un pays à un jeu (matrice pays × jeu précalculée).
+    Reconstruite à chaque import par `stats.rebuild_country_game_stats()` ;
+    sert les tableaux des médailles et les séries temporelles par pays.
+    """
+    country = models.ForeignKey(Country, on_delete=models.CASCADE, related_name='game_stats')
+    game = models.ForeignKey(OlympicGame, on_delete=models.CASCADE, related_name='country_stats')
+    gold = models.IntegerField(default=0)
+    silver = models.IntegerField(default=0)
+    bronze = models.IntegerField(default=0)
+    total = models.IntegerField(default=0)
+    
+    class Meta:
+        verbose_name_plural = "Country game stats"
+        constraints = [
+            models.UniqueConstraint(fields=['country', 'game'], name='country_game_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.country.country_name} - {self.game.game_name}: {self.total}"
+
+
 class CountryPrediction(models.Model):
     """
     Modèle pour stocker les prédictions de médailles par pays.
@@ -128,6 +180,50 @@ class CountryPrediction(models.Model):
     
     class Meta:
         ordering = ['-predicted_total']
+        indexes = [
+            models.Index(fields=['-predicted_total'], name='prediction_total_idx'),
+        ]
     
     def __str__(self):
         return f"Prédiction pour {self.country.country_name} - {self.predicted_game}"
+
+
+class DataVersion(models.Model):
+    """
+    Version globale des données (enregistrement unique).
+    Incrémentée par import_data.py et generate_predictions.py ; sert de clé
+    d'invalidation pour les caches.
+    """
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Données v{self.version}"
+
+
+class ChangeLogEntry(models.Model):
+    """
+    Objet créé, modifié ou supprimé par un import ou une génération de
+    prédictions, enregistré sous la version des données qui l'a publié.
+    Sert `/api/changes/?since=<version>` (voir `predictions/changes.py`).
+    """
+    ACTION_CHOICES = [
+        ('created', 'Créé'),
+        ('updated', 'Modifié'),
+        ('deleted', 'Supprimé'),
+    ]
+    
+    version = models.PositiveBigIntegerField()
+    resource = models.CharField(max_length=20)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    
+    class Meta:
+        ordering = ['version', 'id']
+        verbose_name_plural = "Change log entries"
+        indexes = [
+            models.Index(fields=['version'], name='changelog_version_idx'),
+        ]
+    
+    def __str__(self):
+        return f"v{self.version} {self.action} {self.resource}#{self.object_id}"
@@ -0,0 +1,209 @@
+"""
+Requêtes imbriquées : un objet racine et ses relations en une réponse.
+
+La spécification `include` liste des chemins séparés par des virgules, chaque
+niveau séparé par un point et éventuellement limité par `:N` (N premiers
+enfants par parent) :
+
+    countries?ids=1&include=games:3.medals.athlete,predictions
+
+Chaque relation de l'arbre est résolue pour tous ses parents à la fois, en une
+requête `__in` (la limite par parent est appliquée en SQL par `ROW_NUMBER()
+OVER (PARTITION BY parent)`) : le nombre de requêtes ne dépend que de la
+spécification, pas du nombre d'objets. La profondeur et le nombre total de
+lignes lues sont bornés.
+"""
+
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from .models import OlympicGame, Athlete, Country, Medal, CountryPrediction
+from .serializers import (
+    OlympicGameValuesSerializer, AthleteValuesSerializer, CountryValuesSerializer,
+    MedalValuesSerializer, CountryPredictionValuesSerializer
+)
+
+
+# Ressources interrogeables : modèle et serializer rapide
+NESTED_RESOURCES = {
+    'countries': (Country, CountryValuesSerializer),
+    'games': (OlympicGame, OlympicGameValuesSerializer),
+    'athletes': (Athlete, AthleteValuesSerializer),
+    'medals': (Medal, MedalValuesSerializer),
+    'predictions': (CountryPrediction, CountryPredictionValuesSerializer),
+}
+
+
+class NestedQueryError(ValueError):
+    """Spécification invalide ou budget de lignes dépassé."""
+
+
+class RowBudget:
+    """Nombre de lignes restant à lire pour la requête."""
+
+    def __init__(self, max_rows):
+        self.max_rows = max_rows
+        self.remaining = max_rows
+
+    def fetch(self, queryset):
+        """Lit au plus `remaining` lignes ; NestedQueryError au-delà."""
+        rows = list(queryset[:self.remaining + 1])
+        if len(rows) > self.remaining:
+            raise NestedQueryError(f"Plus de {self.max_rows} lignes à lire : réduire `ids` ou `include`.")
+        self.remaining -= len(rows)
+        return rows
+
+
+def ordering_expressions(model, order_by=None):
+    """Expressions de tri (tri par défaut du modèle si None), départagées par id."""
+    expressions = []
+    for field in order_by or model._meta.ordering:
+        if isinstance(field, str):
+            field = F(field[1:]).desc() if field.startswith('-') else F(field).asc()
+        expressions.append(field)
+    return expressions + [F('id').asc()]
+
+
+class ToMany:
+    """
+    Relation vers plusieurs objets : `lookup` mène de la cible à l'identifiant
+    du parent (clé étrangère inverse ou passage par `CountryGameStats`).
+    """
+    many = True
+
+    def __init__(self, target, lookup, order_by=None):
+        self.target = target
+        self.lookup = lookup
+        self.order_by = order_by
+
+    def attach(self, name, items, limit, budget):
+        parents = {}
+        for item in items:
+            item[name] = []
+            parents.setdefault(item['id'], []).append(item)
+        if not parents:
+            return []
+
+        model, values_serializer = NESTED_RESOURCES[self.target]
+        ordering = ordering_expressions(model, self.order_by)
+        queryset, parent_lookup = self.filter_parents(model, list(parents))
+        if limit is not None:
+            queryset = queryset.annotate(
+                nested_rank=Window(RowNumber(), partition_by=F(parent_lookup), order_by=ordering)
+            ).filter(nested_rank__lte=limit)
+        rows = budget.fetch(values_serializer.values(queryset.order_by(*ordering), extra=(parent_lookup,)))
+
+        children = values_serializer.serialize(rows)
+        for row, child in zip(rows, children):
+            for parent in parents[row[parent_lookup]]:
+                parent[name].append(child)
+        return children
+
+    def filter_parents(self, model, parent_ids):
+        """
+        Cibles des parents `parent_ids` et lookup de l'identifiant du parent.
+        Une clé étrangère directe est lue par sa colonne (déjà sélectionnée
+        par le serializer : une annotation en double casserait le filtrage
+        sur la fenêtre), une relation à travers une jointure par annotation.
+        """
+        field = model._meta.get_field(self.lookup.split('__')[0])
+        if '__' not in self.lookup and field.many_to_one:
+            return model.objects.filter(**{f'{field.attname}__in': parent_ids}), field.attname
+        queryset = model.objects.annotate(nested_parent=F(self.lookup)).filter(nested_parent__in=parent_ids)
+        return queryset, 'nested_parent'
+
+
+class ToOne:
+    """Relation vers un objet : l'identifiant `name` du parent est remplacé par l'objet."""
+    many = False
+
+    def __init__(self, target):
+        self.target = target
+
+    def attach(self, name, items, limit, budget):
+        ids = {item[name] for item in items if item[name] is not None}
+        if not ids:
+            return []
+        model, values_serializer = NESTED_RESOURCES[self.target]
+        rows = budget.fetch(values_serializer.values(model.objects.filter(id__in=ids).order_by('id')))
+        objects = {child['id']: child for child in values_serializer.serialize(rows)}
+        for item in items:
+            item[name] = objects.get(item[name])
+        return list(objects.values())
+
+
+# Relations navigables depuis chaque ressource
+RELATIONS = {
+    'countries': {
+        'games': ToMany('games', 'country_stats__country', order_by=['-game_year']),
+        'medals': ToMany('medals', 'country'),
+        'predictions': ToMany('predictions', 'country'),
+    },
+    'games': {
+        'countries': ToMany('countries', 'game_stats__game', order_by=['-game_stats__total']),
+        'medals': ToMany('medals', 'game'),
+    },
+    'athletes': {
+        'medals': ToMany('medals', 'athlete'),
+    },
+    'medals': {
+        'country': ToOne('countries'),
+        'athlete': ToOne('athletes'),
+        'game': ToOne('games'),
+    },
+    'predictions': {
+        'country': ToOne('countries'),
+    },
+}
+
+
+def parse_include(resource, spec, max_depth):
+    """
+    Arbre {relation: (limite, sous-arbre)} de la spécification `include`.
+    Lève NestedQueryError pour une relation inconnue, une limite invalide ou
+    une profondeur supérieure à `max_depth`.
+    """
+    tree = {}
+    for path in filter(None, (path.strip() for path in spec.split(','))):
+        segments = path.split('.')
+        if len(segments) > max_depth:
+            raise NestedQueryError(f"Profondeur maximale : {max_depth} niveaux ({path}).")
+        node, current = tree, resource
+        for segment in segments:
+            name, _, limit = segment.partition(':')
+            relation = RELATIONS[current].get(name)
+            if relation is None:
+                raise NestedQueryError(f"Relation inconnue : {current}.{name}.")
+            if limit:
+                if not relation.many or not limit.isdigit() or int(limit) < 1:
+                    raise NestedQueryError(f"Limite invalide : {segment}.")
+                limit = int(limit)
+            previous = node.get(name)
+            if previous is not None and limit and previous[0] not in (None, limit):
+                raise NestedQueryError(f"Limites différentes pour {current}.{name}.")
+            node[name] = (limit or (previous[0] if previous else None), previous[1] if previous else {})
+            node, current = node[name][1], relation.target
+    return tree
+
+
+def resolve(resource, ids, tree, max_rows):
+    """
+    Objets `ids` de `resource` (dans l'ordre demandé) avec les relations de
+    `tree` : une requête pour les racines puis une par relation de l'arbre.
+    """
+    budget = RowBudget(max_rows)
+    model, values_serializer = NESTED_RESOURCES[resource]
+    rows = budget.fetch(values_serializer.values(model.objects.filter(id__in=ids)))
+    objects = {item['id']: item for item in values_serializer.serialize(rows)}
+    items = [objects[pk] for pk in ids if pk in objects]
+    _attach(resource, items, tree, budget)
+    return items
+
+
+def _attach(resource, items, tree, budget):
+    """Résout les relations de `tree` niveau par niveau."""
+    for name, (limit, subtree) in tree.items():
+        relation = RELATIONS[resource][name]
+        children = relation.attach(name, items, limit, budget)
+        if subtree:
+            _attach(relation.target, children, subtree, budget)
@@ -0,0 +1,217 @@
+"""
+Pagination par curseur (keyset) pour les grandes listes de l'API.
+
+Contrairement à `PageNumberPagination`, une page est obtenue par une requête
+`WHERE (<tri>, id) > (<position>) LIMIT n` sur un tri indexé : le curseur
+contient les valeurs de toutes les colonnes de tri de la dernière ligne
+(identifiant compris), si bien que les ex æquo sur la première colonne sont
+départagés sans décalage. Le coût est constant quelle que soit la profondeur
+de la page et aucun `COUNT(*)` n'est exécuté. Le nombre total de résultats
+reste disponible avec `?count=1` ; il est alors mis en cache par version des
+données.
+
+Le curseur de `rest_framework.pagination.CursorPagination` ne retient que la
+première colonne de tri et un décalage (borné à `offset_cutoff`) : sur une
+colonne très répétée (athlètes sans médaille, homonymes), il boucle.
+"""
+
+import base64
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .versioning import get_data_version
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Curseur composite : position = valeurs de toutes les colonnes de tri, la
+    dernière étant l'identifiant (ajouté au tri s'il n'y figure pas).
+    """
+
+    def get_keyset_ordering(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        ordering = (ordering,) if isinstance(ordering, str) else tuple(ordering)
+        if ordering[-1].lstrip('-') not in ('id', 'pk'):
+            ordering += ('id',)
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_keyset_ordering(request, queryset, view)
+        position, self.reverse = self.decode_cursor(request)
+        if position is not None:
+            position = self.clean_position(queryset, position)
+
+        ordering = self.ordering
+        if self.reverse:
+            ordering = tuple(field[1:] if field.startswith('-') else f'-{field}' for field in ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.after_position(ordering, position))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        if self.reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        return self.page
+
+    @staticmethod
+    def after_position(ordering, position):
+        """
+        Lignes strictement après `position` dans l'ordre `ordering` :
+        `a >= p AND (a > p OR (a = p AND b > q) ...)` (la première condition
+        permet la recherche par index).
+        """
+        fields = [(field.lstrip('-'), field.startswith('-')) for field in ordering]
+        after = Q()
+        for index, (field, descending) in enumerate(fields):
+            condition = Q(**{f'{field}__{"lt" if descending else "gt"}': position[index]})
+            for previous in range(index):
+                condition &= Q(**{fields[previous][0]: position[previous]})
+            after |= condition
+        first, descending = fields[0]
+        return Q(**{f'{first}__{"lte" if descending else "gte"}': position[0]}) & after
+
+    def get_position(self, row):
+        fields = [field.lstrip('-') for field in self.ordering]
+        if isinstance(row, dict):
+            return [row[field] for field in fields]
+        return [getattr(row, field) for field in fields]
+
+    def encode_cursor(self, position, reverse):
+        payload = json.dumps({'p': position, 'r': int(reverse)}, separators=(',', ':'))
+        encoded = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        """(position, sens inverse) du curseur de la requête, (None, False) sans curseur."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            position, reverse = payload['p'], bool(payload['r'])
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def clean_position(self, queryset, position):
+        """
+        Valeurs du curseur converties au type de leur colonne de tri ; un
+        curseur forgé (valeur nulle, objet, texte pour un entier) est invalide.
+        """
+        cleaned = []
+        for field, value in zip(self.ordering, position):
+            if value is None or isinstance(value, (dict, list, bool)):
+                raise NotFound(self.invalid_cursor_message)
+            try:
+                value = queryset.model._meta.get_field(field.lstrip('-')).to_python(value)
+            except FieldDoesNotExist:
+                pass
+            except DjangoValidationError:
+                raise NotFound(self.invalid_cursor_message)
+            cleaned.append(value)
+        return cleaned
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.get_position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.get_position(self.page[0]), reverse=True)
+
+
+class CountedCursorPagination(KeysetCursorPagination):
+    """Pagination par curseur avec comptage optionnel et mis en cache."""
+    page_size = 100
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = None
+        if request.query_params.get(self.count_query_param) in ('1', 'true'):
+            self.count = self.get_count(queryset)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count(self, queryset):
+        """Nombre total de résultats, mis en cache par requête SQL et version des données."""
+        sql, params = queryset.order_by().query.sql_with_params()
+        digest = hashlib.sha1(f'{sql}|{params}'.encode('utf-8')).hexdigest()
+        key = f'pagination:count:v{get_data_version()}:{digest}'
+        return cache.get_or_set(key, queryset.count, timeout=None)
+
+    def get_paginated_response(self, data):
+        payload = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.count is not None:
+            payload = {'count': self.count, **payload}
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count'] = {
+            'type': 'integer',
+            'example': 123,
+        }
+        return response_schema
+
+
+class MedalCursorPagination(CountedCursorPagination):
+    """Médailles : des plus récentes aux plus anciennes (clé primaire)."""
+    ordering = '-id'
+
+
+class AthleteCursorPagination(CountedCursorPagination):
+    """
+    Athlètes : ordre alphabétique, départagé par l'identifiant (index
+    athlete_name_idx), ou `?ordering=-total_medals` pour le palmarès (index
+    athlete_total_idx). Le curseur retient le nom (ou le total) et
+    l'identifiant : homonymes et athlètes sans médaille ne font pas boucler.
+    """
+    ordering = ('athlete_full_name', 'id')
+    ordering_param = 'ordering'
+    orderings = {
+        'athlete_full_name': ('athlete_full_name', 'id'),
+        '-total_medals': ('-total_medals', 'id'),
+    }
+
+    def get_ordering(self, request, queryset, view):
+        value = request.query_params.get(self.ordering_param)
+        if value is None:
+            return self.ordering
+        if value not in self.orderings:
+            raise ValidationError({self.ordering_param: f"Valeurs possibles : {', '.join(self.orderings)}."})
+        return self.orderings[value]
+
+
+class DetailMedalPagination(MedalCursorPagination):
+    """Page de médailles intégrée aux fiches pays et jeu (taille bornée)."""
+    page_size = 50
@@ -0,0 +1,136 @@
+"""
+Profilage à la demande des requêtes HTTP.
+
+`middleware.ProfilingMiddleware` exécute sous cProfile une fraction tirée au
+sort des requêtes (`SAMPLE_RATE`), ou toute requête portant l'en-tête de
+débogage (`X-Profile: 1`) venant d'une adresse autorisée. Chaque requête
+profilée produit, dans `DIRECTORY` :
+
+- `<horodatage>-<endpoint>-<id>.prof` : statistiques cProfile (lisibles par
+  `pstats`, `snakeviz` ou un outil de flame graph) ;
+- `<horodatage>-<endpoint>-<id>.json` : endpoint, requêtes SQL et durées
+  (mesurées par `QueryBudgetMiddleware`).
+
+`python manage.py profile_report` agrège ces fichiers par endpoint.
+
+Un seul profil à la fois par processus : une requête tirée au sort pendant
+qu'une autre est profilée est servie normalement. Sous ASGI, seul le thread
+de la boucle d'événements est profilé.
+
+Réglages (`settings.PROFILING`) : voir `DEFAULTS`.
+"""
+
+import cProfile
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+
+from .instrumentation import current_timing
+
+
+DEFAULTS = {
+    'SAMPLE_RATE': 0.0,       # fraction des requêtes profilées (0 : désactivé)
+    'HEADER': 'X-Profile',    # en-tête de débogage
+    'ALLOWED_IPS': None,      # adresses autorisées à l'utiliser (None : INTERNAL_IPS)
+    'DIRECTORY': 'profiles',  # relatif à BASE_DIR
+    'MAX_QUERIES': 500,       # requêtes SQL conservées par profil
+}
+
+_profiling = threading.Lock()
+
+
+def profiling_setting(name):
+    return getattr(settings, 'PROFILING', {}).get(name, DEFAULTS[name])
+
+
+def profile_directory():
+    return Path(settings.BASE_DIR) / profiling_setting('DIRECTORY')
+
+
+def profiling_reason(request):
+    """'header', 'sample' ou None selon que la requête doit être profilée."""
+    header = 'HTTP_' + profiling_setting('HEADER').upper().replace('-', '_')
+    if request.META.get(header):
+        allowed = profiling_setting('ALLOWED_IPS')
+        if allowed is None:
+            allowed = getattr(settings, 'INTERNAL_IPS', [])
+        if request.META.get('REMOTE_ADDR') in allowed:
+            return 'header'
+    rate = profiling_setting('SAMPLE_RATE')
+    if rate and random.random() < rate:
+        return 'sample'
+    return None
+
+
+def endpoint_name(view_func, method):
+    """`module.Vue.action` pour un ViewSet, `module.vue` sinon."""
+    view = getattr(view_func, 'cls', view_func)
+    name = f'{view.__module__}.{view.__qualname__}'
+    action = (getattr(view_func, 'actions', None) or {}).get(method.lower())
+    return f'{name}.{action}' if action else name
+
+
+class RequestProfile:
+    """Profil cProfile d'une requête ; `save` écrit le `.prof` et le `.json`."""
+
+    def __init__(self, request, reason):
+        self.request = request
+        self.reason = reason
+        self.endpoint = None
+        self.profiler = cProfile.Profile()
+        self.started = time.time()
+
+    def save(self, response):
+        timing = current_timing()
+        max_queries = profiling_setting('MAX_QUERIES')
+        queries = timing.queries if timing is not None else []
+        total = time.time() - self.started
+        metadata = {
+            'endpoint': self.endpoint or 'unresolved',
+            'method': self.request.method,
+            'path': self.request.get_full_path(),
+            'status': response.status_code,
+            'reason': self.reason,
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+            'total_ms': round(total * 1000, 2),
+            'db_ms': round(timing.db_time * 1000, 2) if timing is not None else None,
+            'render_ms': round(timing.render_time * 1000, 2) if timing is not None else None,
+            'query_count': len(queries),
+            'queries': [
+                {'sql': sql, 'ms': round(duration * 1000, 3)} for sql, duration in queries[:max_queries]
+            ],
+        }
+
+        directory = profile_directory()
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = '{}-{}-{}'.format(
+            time.strftime('%Y%m%dT%H%M%S', time.localtime(self.started)),
+            re.sub(r'[^\w.]+', '_', metadata['endpoint']),
+            uuid.uuid4().hex[:8],
+        )
+        self.profiler.dump_stats(directory / f'{stem}.prof')
+        (directory / f'{stem}.json').write_text(json.dumps(metadata, indent=2), encoding='utf-8')
+        return directory / stem
+
+
+def start_profile(request):
+    """Profil de la requête, ou None si elle n'est pas profilée (ou si un profil est en cours)."""
+    reason = profiling_reason(request)
+    if reason is None or not _profiling.acquire(blocking=False):
+        return None
+    return RequestProfile(request, reason)
+
+
+def stop_profile(profile, response):
+    """Écrit le profil (sauf si la vue a levé une exception : `response` None) et libère la place."""
+    try:
+        if response is not None:
+            profile.save(response)
+    finally:
+        _profiling.release()
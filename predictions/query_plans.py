@@ -0,0 +1,246 @@
+"""
+Requêtes "chaudes" de l'application et analyse de leur plan d'exécution.
+
+Chaque entrée reproduit une requête exécutée par `api_views.py` ou `views.py`.
+`explain_query_plan` renvoie le plan SQLite (EXPLAIN QUERY PLAN) et
+`find_full_scans` y repère les parcours complets de table, c'est-à-dire les
+lignes `SCAN <table>` : sans index, ou en parcourant un index entier
+(`SCAN <table> USING INDEX`), ce qui reste proportionnel à la taille de la
+table. Seule une recherche (`SEARCH`) est bornée.
+
+Utilisé par la commande `python manage.py check_query_plans`.
+"""
+
+import re
+
+from django.db import connection
+from django.db.models import Count
+
+from .models import OlympicGame, Athlete, Country, Medal, CountryGameStats, CountryPrediction
+from .pagination import KeysetCursorPagination
+from .rankings import country_rank_history_sql, game_medal_table
+from .search import filter_medals_by_discipline
+
+
+# Valeurs d'exemple : le plan ne dépend pas des données, seulement des index
+SAMPLE_ID = 1
+PAGE_SIZE = 100
+
+SCAN_PATTERN = re.compile(r'^SCAN (?P<table>\w+)(?P<rest>.*)$')
+
+
+def _medal_list():
+    return Medal.objects.all().select_related('country', 'athlete', 'game')
+
+
+def _top_countries_for_game():
+    return Medal.objects.filter(game_id=SAMPLE_ID).values(
+        'country__country_name', 'country__id'
+    ).annotate(
+        medal_count=Count('id')
+    ).order_by('-medal_count')[:10]
+
+
+def _medals_by_discipline():
+    return Medal.objects.filter(country_id=SAMPLE_ID).values(
+        'discipline_title'
+    ).annotate(
+        count=Count('id')
+    ).order_by('-count')[:10]
+
+
+# Liste des requêtes chaudes.
+# - name : identifiant affiché
+# - source : vue(s) qui exécutent la requête
+# - queryset : fonction construisant le QuerySet (`.order_by().values('id')`
+#   reproduit un `.count()`, qui ignore le tri) ou le couple (sql, params)
+#   d'une requête SQL brute
+# - pk_ordered : tables parcourues dans l'ordre de leur clé primaire, borné
+#   par LIMIT (SQLite l'affiche comme un SCAN sans index mais il s'arrête
+#   après une page) ; les autres tables du plan restent vérifiées
+# - index_ordered : {table: index} des tables parcourues dans l'ordre d'un
+#   index de tri, bornées par LIMIT (`SCAN <table> USING INDEX <index>`)
+# - tolerated : raison pour laquelle un parcours complet est accepté
+HOT_QUERIES = [
+    {
+        'name': 'games_list',
+        'source': 'OlympicGameViewSet.list, views.games_list',
+        'queryset': lambda: OlympicGame.objects.all()[:PAGE_SIZE],
+        'index_ordered': {'predictions_olympicgame': 'game_year_idx'},
+    },
+    {
+        'name': 'game_by_slug',
+        'source': 'import_data.parse_olympic_medals',
+        'queryset': lambda: OlympicGame.objects.filter(game_slug='tokyo-2020'),
+    },
+    {
+        'name': 'game_top_countries',
+        'source': 'OlympicGameViewSet.top_countries, views.game_detail',
+        'queryset': _top_countries_for_game,
+    },
+    {
+        'name': 'game_medals',
+        'source': 'views.game_detail, GameDetailSerializer',
+        'queryset': lambda: Medal.objects.filter(
+            game_id=SAMPLE_ID
+        ).select_related('country', 'athlete')[:50],
+    },
+    {
+        'name': 'game_medal_table',
+        'source': 'OlympicGameViewSet.medal_table',
+        'queryset': lambda: game_medal_table(SAMPLE_ID),
+    },
+    {
+        'name': 'country_rank_history',
+        'source': 'CountryViewSet.rank_history',
+        'queryset': lambda: country_rank_history_sql(SAMPLE_ID),
+    },
+    {
+        'name': 'country_timeseries',
+        'source': 'CountryViewSet.timeseries, CountryViewSet.timeseries_many',
+        'queryset': lambda: CountryGameStats.objects.filter(
+            country_id__in=[SAMPLE_ID, SAMPLE_ID + 1]
+        ).values_list('country_id', 'game_id', 'gold', 'silver', 'bronze', 'total'),
+    },
+    {
+        'name': 'compare_disciplines',
+        'source': 'CompareViewSet.list',
+        'queryset': lambda: Medal.objects.filter(
+            country_id__in=[SAMPLE_ID, SAMPLE_ID + 1]
+        ).order_by().values('country_id', 'discipline_title').annotate(total=Count('id')),
+    },
+    {
+        'name': 'athletes_list',
+        'source': 'AthleteViewSet.list',
+        'queryset': lambda: Athlete.objects.all()[:PAGE_SIZE],
+        'index_ordered': {'predictions_athlete': 'athlete_name_idx'},
+    },
+    {
+        'name': 'athletes_list_next_page',
+        'source': 'AthleteViewSet.list (?cursor=)',
+        'queryset': lambda: Athlete.objects.filter(
+            KeysetCursorPagination.after_position(('athlete_full_name', 'id'), ['MARTIN', SAMPLE_ID])
+        ).order_by('athlete_full_name', 'id')[:PAGE_SIZE],
+    },
+    {
+        'name': 'athletes_leaderboard',
+        'source': 'AthleteViewSet.leaderboard, AthleteViewSet.list (?ordering=-total_medals), views.athletes_leaderboard',
+        'queryset': lambda: Athlete.objects.filter(total_medals__gt=0).order_by('-total_medals', 'id')[:PAGE_SIZE],
+    },
+    {
+        'name': 'athletes_by_medals_next_page',
+        'source': 'AthleteViewSet.list (?ordering=-total_medals&cursor=)',
+        'queryset': lambda: Athlete.objects.filter(
+            KeysetCursorPagination.after_position(('-total_medals', 'id'), [0, SAMPLE_ID])
+        ).order_by('-total_medals', 'id')[:PAGE_SIZE],
+    },
+    {
+        'name': 'countries_list',
+        'source': 'CountryViewSet.list, CountryViewSet.top, views.countries_list, views.home',
+        'queryset': lambda: Country.objects.all()[:PAGE_SIZE],
+        'index_ordered': {'predictions_country': 'country_total_idx'},
+    },
+    {
+        'name': 'country_medals',
+        'source': 'CountryDetailSerializer, views.country_detail',
+        'queryset': lambda: Medal.objects.filter(
+            country_id=SAMPLE_ID
+        ).select_related('game', 'athlete')[:50],
+    },
+    {
+        'name': 'country_medals_by_discipline',
+        'source': 'CountryViewSet.retrieve, views.country_detail',
+        'queryset': _medals_by_discipline,
+    },
+    {
+        'name': 'country_medals_by_type',
+        'source': 'import_data.calculate_country_statistics',
+        'queryset': lambda: Medal.objects.filter(
+            country_id=SAMPLE_ID, medal_type='GOLD'
+        ).order_by().values('id'),
+    },
+    {
+        'name': 'medals_list',
+        'source': 'MedalViewSet.list',
+        'queryset': lambda: _medal_list()[:PAGE_SIZE],
+        'pk_ordered': {'predictions_medal'},
+    },
+    {
+        'name': 'medals_by_country',
+        'source': 'MedalViewSet.list (?country=)',
+        'queryset': lambda: _medal_list().filter(country_id=SAMPLE_ID)[:PAGE_SIZE],
+    },
+    {
+        'name': 'medals_by_game',
+        'source': 'MedalViewSet.list (?game=)',
+        'queryset': lambda: _medal_list().filter(game_id=SAMPLE_ID)[:PAGE_SIZE],
+    },
+    {
+        'name': 'medals_by_country_and_type',
+        'source': 'MedalViewSet.list (?country=&type=)',
+        'queryset': lambda: _medal_list().filter(
+            country_id=SAMPLE_ID, medal_type='GOLD'
+        )[:PAGE_SIZE],
+    },
+    {
+        'name': 'medals_by_discipline',
+        'source': 'MedalViewSet.list (?discipline=)',
+        'queryset': lambda: filter_medals_by_discipline(_medal_list(), 'swimming')[:PAGE_SIZE],
+    },
+    {
+        'name': 'stats_overview',
+        'source': 'stats.compute_overview (StatsViewSet.overview, views.home)',
+        'queryset': lambda: Country.objects.order_by().values('total_medals'),
+        'tolerated': "agrégat de la table Country calculé une fois par version des données puis mis en cache",
+    },
+    {
+        'name': 'predictions_list',
+        'source': 'CountryPredictionViewSet.list, views.predictions_list',
+        'queryset': lambda: CountryPrediction.objects.all().select_related(
+            'country'
+        )[:PAGE_SIZE],
+        'index_ordered': {'predictions_countryprediction': 'prediction_total_idx'},
+    },
+]
+
+
+def explain_query_plan(queryset):
+    """Retourne les lignes du plan d'exécution SQLite d'un QuerySet ou d'un couple (sql, params)."""
+    if isinstance(queryset, tuple):
+        sql, params = queryset
+    else:
+        sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def find_full_scans(plan, pk_ordered=(), index_ordered=None):
+    """
+    Retourne les tables parcourues entièrement dans un plan.
+    Tout `SCAN <table>` est un parcours complet, y compris à travers un index
+    (`USING INDEX`, `USING COVERING INDEX`), sauf sur une table virtuelle ou
+    par clé primaire (`USING INTEGER PRIMARY KEY`), et sauf pour les tables
+    de `pk_ordered` (parcours en ordre de clé primaire borné par LIMIT) et de
+    `index_ordered` parcourues avec l'index indiqué (tri borné par LIMIT).
+    Le parcours d'une sous-requête ou d'une CTE déjà calculée n'est pas
+    retenu (seuls les noms de tables de la base le sont : les requêtes SQL
+    brutes ne doivent donc pas donner d'alias aux tables).
+    """
+    tables = set(connection.introspection.table_names())
+    scans = []
+    for detail in plan:
+        match = SCAN_PATTERN.match(detail.strip())
+        if not match or match.group('table') not in tables:
+            continue
+        rest = match.group('rest')
+        if 'USING INTEGER PRIMARY KEY' in rest or 'VIRTUAL TABLE' in rest:
+            continue
+        table = match.group('table')
+        if table in pk_ordered and not rest.strip():
+            continue
+        ordered_index = (index_ordered or {}).get(table)
+        if ordered_index and re.match(rf' USING (COVERING )?INDEX {ordered_index}$', rest):
+            continue
+        scans.append(table)
+    return scans
@@ -0,0 +1,72 @@
+"""
+Tableaux des médailles et classements officiels.
+
+Le classement suit la convention olympique : nombre de médailles d'or, puis
+d'argent, puis de bronze. Les rangs sont calculés en SQL par `RANK() OVER` :
+deux pays à égalité parfaite partagent le même rang et le suivant est décalé
+(1, 2, 2, 4).
+
+Les deux requêtes lisent la matrice précalculée `CountryGameStats` (une
+ligne par pays et par jeu) au lieu d'agréger les médailles.
+"""
+
+from django.db import connection
+from django.db.models import F, Window
+from django.db.models.functions import Rank
+
+from .models import OlympicGame, Country, CountryGameStats
+
+
+OFFICIAL_ORDER = (F('gold').desc(), F('silver').desc(), F('bronze').desc())
+
+
+def game_medal_table(game):
+    """Tableau des médailles d'un jeu : tous les pays médaillés, classés."""
+    return CountryGameStats.objects.filter(game=game).values(
+        'country_id',
+        'gold', 'silver', 'bronze', 'total',
+        country_name=F('country__country_name'),
+        country_code=F('country__country_3_letter_code'),
+    ).annotate(
+        rank=Window(Rank(), order_by=OFFICIAL_ORDER),
+    ).order_by('rank', 'country_name')
+
+
+def country_rank_history_sql(country):
+    """
+    Requête (sql, params) du rang d'un pays à chaque jeu où il a été médaillé :
+    le classement des seuls jeux du pays est calculé pour tous les pays
+    (partition par jeu, lignes lues par index) puis filtré sur le pays, en une
+    seule requête.
+    """
+    country_id = country.pk if isinstance(country, Country) else country
+    stats = CountryGameStats._meta.db_table
+    game = OlympicGame._meta.db_table
+    sql = f"""
+        WITH ranked AS (
+            SELECT
+                game_id, country_id, gold, silver, bronze, total,
+                RANK() OVER (PARTITION BY game_id ORDER BY gold DESC, silver DESC, bronze DESC) AS rank,
+                COUNT(*) OVER (PARTITION BY game_id) AS ranked_countries
+            FROM {stats}
+            WHERE game_id IN (SELECT game_id FROM {stats} WHERE country_id = %s)
+        )
+        SELECT
+            ranked.game_id, {game}.game_name, {game}.game_year, {game}.game_season,
+            ranked.rank, ranked.ranked_countries,
+            ranked.gold, ranked.silver, ranked.bronze, ranked.total
+        FROM ranked
+        JOIN {game} ON {game}.id = ranked.game_id
+        WHERE ranked.country_id = %s
+        ORDER BY {game}.game_year, {game}.game_season
+    """
+    return sql, [country_id, country_id]
+
+
+def country_rank_history(country):
+    """Rang du pays à chaque jeu (ordre chronologique), en une requête."""
+    sql, params = country_rank_history_sql(country)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
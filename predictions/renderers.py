@@ -0,0 +1,122 @@
+"""
+Renderers supplémentaires pour l'API REST.
+
+`NDJSONRenderer` et `CSVRenderer` sont utilisés par les endpoints d'export
+(`/api/medals/export/`, `/api/predictions/export/`). Ces endpoints renvoient
+une réponse en streaming ; le rendu ci-dessous ne sert qu'aux petites
+réponses (erreurs notamment) passant par le cycle normal de DRF.
+
+`ORJSONRenderer` est un remplaçant optionnel de `JSONRenderer` basé sur
+orjson (dépendance facultative, voir `REST_FRAMEWORK` dans settings.py).
+
+`ColumnarRenderer` (`?format=columnar`) renvoie les listes colonne par
+colonne, les chaînes répétées étant encodées par dictionnaire.
+"""
+
+import csv
+import io
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    orjson = None
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Un objet JSON par ligne (newline-delimited JSON)."""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        return ''.join(
+            json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+            for row in rows
+        ).encode(self.charset)
+
+
+class CSVRenderer(BaseRenderer):
+    """Tableau CSV avec une ligne d'en-tête."""
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        buffer = io.StringIO()
+        if rows:
+            writer = csv.DictWriter(buffer, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+        return buffer.getvalue().encode(self.charset)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer encodé avec orjson quand il est installé.
+    La sortie compacte est identique à celle de `JSONRenderer` ; les rendus
+    indentés (API navigable, `; indent=`) et l'absence d'orjson retombent sur
+    l'encodeur standard.
+    """
+    _default = JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Comme JSONRenderer : U+2028 et U+2029 échappés (JSON inclus dans du JavaScript)
+        content = orjson.dumps(data, default=self._default)
+        return content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+def encode_columns(rows):
+    """
+    Convertit une liste de dicts en colonnes. Une colonne de chaînes contenant
+    des répétitions devient {"dictionary": [valeurs distinctes], "codes": [indices]} ;
+    les autres sont des tableaux de valeurs. Un champ absent d'une ligne vaut null.
+    """
+    names = list(dict.fromkeys(name for row in rows for name in row))
+    columns = {}
+    for name in names:
+        values = [row.get(name) for row in rows]
+        if any(isinstance(value, str) for value in values) and all(
+            value is None or isinstance(value, str) for value in values
+        ):
+            dictionary = {}
+            codes = [
+                None if value is None else dictionary.setdefault(value, len(dictionary))
+                for value in values
+            ]
+            if len(dictionary) < len(values):
+                columns[name] = {'dictionary': list(dictionary), 'codes': codes}
+                continue
+        columns[name] = values
+    return {'length': len(rows), 'columns': columns}
+
+
+class ColumnarRenderer(ORJSONRenderer):
+    """
+    JSON en colonnes : la liste `results` d'une page (ou une liste renvoyée
+    directement) est remplacée par le résultat de `encode_columns`. Les autres
+    réponses sont rendues telles quelles.
+    """
+    media_type = 'application/vnd.columnar+json'
+    format = 'columnar'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, list) and all(isinstance(row, dict) for row in data):
+            data = encode_columns(data)
+        elif isinstance(data, dict) and isinstance(data.get('results'), list):
+            data = {**data, 'results': encode_columns(data['results'])}
+        return super().render(data, accepted_media_type, renderer_context)
@@ -0,0 +1,152 @@
+"""
+Cache des réponses de l'API, versionné par la version globale des données.
+
+`CachedResponseMixin` conserve le JSON rendu des actions listées dans
+`cached_actions`. La clé combine la version des données, l'hôte (les liens de
+pagination sont absolus), le chemin, les paramètres normalisés de la requête
+et le format négocié : un import ou une génération de prédictions rend donc
+toutes les entrées précédentes inaccessibles, sans invalidation explicite.
+Les entrées obsolètes sont évincées par le backend (LRU).
+
+Chaque entrée contient aussi le contenu déjà compressé (voir `compression`) :
+une réponse servie depuis le cache ne coûte ni sérialisation ni compression.
+
+Le backend est choisi dans `settings.CACHES[API_RESPONSE_CACHE]` (mémoire
+locale bornée, fichiers ou Redis).
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import Http404, HttpResponse
+from django.test import RequestFactory
+from django.urls import resolve
+from django.utils.cache import patch_vary_headers
+from rest_framework.exceptions import APIException
+
+from .compression import negotiate_encoding, precompress
+from .conditional import normalized_query_string
+from .models import OlympicGame, Country
+from .versioning import get_data_version
+
+
+CACHED_HEADERS = ('Content-Type', 'Vary', 'Allow')
+
+# Formats mis en cache (l'API navigable dépend de l'utilisateur et de la requête)
+CACHED_FORMATS = ('json', 'columnar')
+
+
+def get_response_cache():
+    return caches[getattr(settings, 'API_RESPONSE_CACHE', 'default')]
+
+
+def response_cache_key(request, renderer_format):
+    key = '|'.join([
+        str(get_data_version()),
+        request.get_host(),
+        request.path,
+        normalized_query_string(request),
+        renderer_format,
+    ])
+    return 'api:response:' + hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+class CachedResponseMixin:
+    """
+    Met en cache les réponses JSON des actions `cached_actions` d'un ViewSet.
+    Une réponse servie depuis le cache porte l'en-tête `X-Cache: HIT` et est
+    compressée selon `Accept-Encoding`.
+    """
+    cached_actions = ()
+
+    def get_response_cache_key(self, request, *args, **kwargs):
+        """Clé de cache de la requête, ou None si elle ne doit pas être mise en cache."""
+        action = self.action_map.get(request.method.lower())
+        if request.method != 'GET' or action not in self.cached_actions:
+            return None
+
+        # Négociation du format avant d'exécuter la vue : seuls les formats JSON sont mis en cache
+        self.args, self.kwargs = args, kwargs
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+        try:
+            renderer, _ = self.perform_content_negotiation(self.initialize_request(request, *args, **kwargs))
+        except (APIException, Http404):
+            return None
+        if renderer.format not in CACHED_FORMATS:
+            return None
+        return response_cache_key(request, renderer.format)
+
+    def dispatch(self, request, *args, **kwargs):
+        key = self.get_response_cache_key(request, *args, **kwargs)
+        if key is None:
+            return super().dispatch(request, *args, **kwargs)
+
+        cache = get_response_cache()
+        entry = cache.get(key)
+        if entry is not None:
+            return self.build_cached_response(entry, request)
+
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200 and hasattr(response, 'add_post_render_callback'):
+            response.add_post_render_callback(
+                lambda rendered: cache.set(key, self.build_cache_entry(rendered), timeout=None)
+            )
+        return response
+
+    def build_cache_entry(self, response):
+        return {
+            'content': response.content,
+            'encoded': precompress(response.content),
+            'headers': {
+                name: response[name] for name in CACHED_HEADERS if response.has_header(name)
+            },
+        }
+
+    def build_cached_response(self, entry, request):
+        encoded = entry.get('encoded', {})
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING'), tuple(encoded))
+        response = HttpResponse(encoded[encoding] if encoding else entry['content'])
+        for name, value in entry['headers'].items():
+            response[name] = value
+        if encoding:
+            response['Content-Encoding'] = encoding
+        if encoded:
+            patch_vary_headers(response, ('Accept-Encoding',))
+        response['X-Cache'] = 'HIT'
+        return response
+
+
+def warm_response_cache(top=10, hosts=None):
+    """
+    Pré-remplit le cache pour les pays et jeux les plus consultés.
+    N'a d'effet que sur un backend partagé (fichiers, Redis) : un cache
+    mémoire local n'est visible que du processus qui le remplit.
+    Retourne le nombre de réponses mises en cache.
+    """
+    hosts = hosts or getattr(settings, 'API_CACHE_WARM_HOSTS', ['localhost:8000'])
+    paths = ['/api/countries/', '/api/countries/top/', '/api/games/']
+    for country_id in Country.objects.values_list('id', flat=True)[:top]:
+        paths.append(f'/api/countries/{country_id}/')
+    for game_id in OlympicGame.objects.values_list('id', flat=True)[:top]:
+        paths.append(f'/api/games/{game_id}/')
+        paths.append(f'/api/games/{game_id}/top_countries/')
+
+    factory = RequestFactory()
+    warmed = 0
+    for host in hosts:
+        for path in paths:
+            request = factory.get(path, HTTP_HOST=host, HTTP_ACCEPT='application/json')
+            request.admission_exempt = True  # hors seaux de jetons et places lourdes
+            match = resolve(path)
+            response = match.func(request, *match.args, **match.kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+            warmed += response.status_code == 200
+    return warmed
+
+
+def is_shared_cache():
+    """Vrai si le cache des réponses est partagé entre processus."""
+    return not isinstance(get_response_cache(), LocMemCache)
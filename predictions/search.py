@@ -0,0 +1,126 @@
+"""
+Recherche plein texte (SQLite FTS5) sur les médailles, athlètes, pays et jeux.
+
+La table virtuelle `predictions_search` (créée par la migration
+0004_search_index) contient une ligne par objet indexé :
+- kind / object_id : type et identifiant de l'objet (non indexés)
+- name : nom de l'athlète, du pays ou du jeu
+- discipline, event, participant, athlete : champs texte des médailles
+
+L'index est reconstruit en bloc par `rebuild_search_index()` à la fin de
+`import_data.py`. Sur une base autre que SQLite, le filtre par discipline
+retombe sur `icontains` et la recherche ne renvoie aucun résultat.
+"""
+
+import re
+
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+from .models import OlympicGame, Athlete, Country, Medal
+
+
+SEARCH_TABLE = 'predictions_search'
+SEARCH_KINDS = ('medal', 'athlete', 'country', 'game')
+
+# Poids BM25 des colonnes (kind, object_id, name, discipline, event, participant, athlete)
+BM25_WEIGHTS = (0.0, 0.0, 10.0, 2.0, 1.0, 1.0, 5.0)
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+def fts_available():
+    return connection.vendor == 'sqlite'
+
+
+def build_match_query(text, column=None):
+    """
+    Transforme une saisie libre en requête FTS5 sûre : chaque mot devient un
+    préfixe entre guillemets ("swim"*), tous les mots sont requis.
+    Retourne None si la saisie ne contient aucun mot.
+    """
+    tokens = TOKEN_PATTERN.findall(text or '')
+    if not tokens:
+        return None
+    query = ' '.join(f'"{token}"*' for token in tokens)
+    if column:
+        query = f'{column} : ({query})'
+    return query
+
+
+def rebuild_search_index():
+    """Reconstruit entièrement l'index de recherche ; retourne le nombre de lignes indexées."""
+    if not fts_available():
+        return 0
+
+    medal = Medal._meta.db_table
+    athlete = Athlete._meta.db_table
+    country = Country._meta.db_table
+    game = OlympicGame._meta.db_table
+    columns = 'kind, object_id, name, discipline, event, participant, athlete'
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE} ({columns}) "
+            f"SELECT 'medal', m.id, '', m.discipline_title, m.event_title, "
+            f"COALESCE(m.participant_title, ''), COALESCE(a.athlete_full_name, '') "
+            f"FROM {medal} m LEFT JOIN {athlete} a ON a.id = m.athlete_id"
+        )
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE} ({columns}) "
+            f"SELECT 'athlete', id, athlete_full_name, '', '', '', '' FROM {athlete}"
+        )
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE} ({columns}) "
+            f"SELECT 'country', id, country_name || ' ' || country_3_letter_code, '', '', '', '' FROM {country}"
+        )
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE} ({columns}) "
+            f"SELECT 'game', id, game_name || ' ' || game_location || ' ' || game_season, '', '', '', '' FROM {game}"
+        )
+        cursor.execute(f"SELECT COUNT(*) FROM {SEARCH_TABLE}")
+        return cursor.fetchone()[0]
+
+
+def filter_medals_by_discipline(queryset, discipline):
+    """
+    Filtre des médailles par discipline via l'index plein texte : chaque mot
+    saisi doit commencer un mot de la discipline (`ball` ne trouve pas
+    `Basketball`, contrairement à l'ancien `icontains`).
+    """
+    if not fts_available():
+        return queryset.filter(discipline_title__icontains=discipline)
+    match = build_match_query(discipline, column='discipline')
+    if match is None:
+        return queryset.none()
+    return queryset.filter(id__in=RawSQL(
+        f"SELECT object_id FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s AND kind = 'medal'",
+        [match],
+    ))
+
+
+def search(text, kind=None, limit=20):
+    """
+    Recherche classée par pertinence (BM25).
+    Retourne une liste de triplets (type, identifiant, score), meilleur score en premier.
+    """
+    match = build_match_query(text)
+    if match is None or not fts_available():
+        return []
+
+    weights = ', '.join(str(weight) for weight in BM25_WEIGHTS)
+    sql = (
+        f"SELECT kind, object_id, bm25({SEARCH_TABLE}, {weights}) AS rank "
+        f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s"
+    )
+    params = [match]
+    if kind is not None:
+        sql += " AND kind = %s"
+        params.append(kind)
+    sql += " ORDER BY rank LIMIT %s"
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(hit_kind, int(object_id), -rank) for hit_kind, object_id, rank in cursor.fetchall()]
@@ -5,6 +5,7 @@ Convertit les modèles Django en JSON pour l'API.
 
 from rest_framework import serializers
 from .models import OlympicGame, Athlete, Country, Medal, CountryPrediction
+from .pagination import DetailMedalPagination
 
 
 class OlympicGameSerializer(serializers.ModelSerializer):
@@ -22,11 +23,15 @@ class OlympicGameSerializer(serializers.ModelSerializer):
 class AthleteSerializer(serializers.ModelSerializer):
     """Serializer pour le modèle Athlete."""
     
+    medal_country_name = serializers.CharField(source='medal_country.country_name', read_only=True)
+    
     class Meta:
         model = Athlete
         fields = [
             'id', 'athlete_full_name', 'athlete_url', 
-            'athlete_year_birth', 'games_participations', 'first_game'
+            'athlete_year_birth', 'games_participations', 'first_game',
+            'total_gold_medals', 'total_silver_medals', 'total_bronze_medals',
+            'total_medals', 'medal_country', 'medal_country_name', 'medal_discipline'
         ]
 
 
@@ -73,29 +78,230 @@ class CountryPredictionSerializer(serializers.ModelSerializer):
         ]
 
 
-class CountryDetailSerializer(serializers.ModelSerializer):
-    """Serializer détaillé pour Country avec ses médailles."""
+class PaginatedMedalsMixin:
+    """
+    Ajoute au détail une page bornée de médailles (`medals`) et les liens
+    `medals_next` / `medals_previous` (pagination par curseur sur l'URL du détail).
+    Les médailles sont chargées avec leurs relations en une seule requête.
+    """
+    medals_lookup = None
+    
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data.update(medal_page(
+            Medal.objects.filter(**{self.medals_lookup: instance}), self.context.get('request')
+        ))
+        return data
+
+
+def medal_page(queryset, request=None):
+    """
+    Page de médailles d'un détail : `medals`, `medals_next` et `medals_previous`.
+    Sans requête HTTP, seule la première page est renvoyée (sans liens).
+    """
+    queryset = queryset.select_related('country', 'athlete', 'game')
+    paginator = DetailMedalPagination()
+    if request is not None:
+        page = paginator.paginate_queryset(queryset, request)
+        next_link, previous_link = paginator.get_next_link(), paginator.get_previous_link()
+    else:
+        page = queryset[:paginator.page_size]
+        next_link, previous_link = None, None
+    
+    return {
+        'medals': MedalSerializer(page, many=True).data,
+        'medals_next': next_link,
+        'medals_previous': previous_link,
+    }
+
+
+class CountryDetailSerializer(PaginatedMedalsMixin, serializers.ModelSerializer):
+    """Serializer détaillé pour Country avec une page de ses médailles."""
     
-    medals = MedalSerializer(many=True, read_only=True, source='medal_set')
+    medals_lookup = 'country'
     
     class Meta:
         model = Country
         fields = [
             'id', 'country_name', 'country_code', 'country_3_letter_code',
             'total_gold_medals', 'total_silver_medals', 'total_bronze_medals',
-            'total_medals', 'medals'
+            'total_medals'
         ]
 
 
-class GameDetailSerializer(serializers.ModelSerializer):
-    """Serializer détaillé pour OlympicGame avec ses médailles."""
+class GameDetailSerializer(PaginatedMedalsMixin, serializers.ModelSerializer):
+    """Serializer détaillé pour OlympicGame avec une page de ses médailles."""
     
-    medals = MedalSerializer(many=True, read_only=True, source='medal_set')
+    medals_lookup = 'game'
     
     class Meta:
         model = OlympicGame
         fields = [
             'id', 'game_slug', 'game_name', 'game_year', 
             'game_season', 'game_location', 'game_start_date', 
-            'game_end_date', 'medals'
+            'game_end_date'
         ]
+
+
+# ---------------------------------------------------------------------------
+# Serializers rapides pour les listes en lecture seule
+# ---------------------------------------------------------------------------
+
+class ValuesSerializer:
+    """
+    Serializer en lecture seule construit directement sur `.values()`.
+    
+    Chaque ligne est un dict issu de la base, converti en dict de sortie sans
+    instancier de modèle ni de champ DRF. La sortie est identique à celle du
+    ModelSerializer équivalent.
+    
+    `fields` : liste de couples (nom dans la réponse, lookup ORM).
+    `datetime_fields` : noms des champs à formater comme `DateTimeField`.
+    `omit_if_null` : champs lus à travers une relation facultative, omis de la
+    sortie lorsque la relation est nulle (comportement des champs `source=`
+    en lecture seule de DRF).
+    
+    Toutes les méthodes acceptent une sélection de champs (voir `select`) :
+    seules les colonnes et jointures correspondantes sont alors lues.
+    """
+    fields = []
+    datetime_fields = ()
+    omit_if_null = {}
+    
+    _datetime_field = serializers.DateTimeField()
+    
+    @classmethod
+    def select(cls, names=None):
+        """
+        Sous-ensemble de `fields` correspondant aux noms demandés (tous si None),
+        dans l'ordre de `fields`. Lève ValueError pour un nom inconnu.
+        """
+        if names is None:
+            return cls.fields
+        available = {name for name, _ in cls.fields}
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise ValueError(', '.join(unknown))
+        return [(name, lookup) for name, lookup in cls.fields if name in names]
+    
+    @classmethod
+    def values(cls, queryset, fields=None, extra=()):
+        """
+        Restreint le SELECT aux colonnes nécessaires (et à leurs jointures).
+        `extra` : lookups lus en plus sans être renvoyés (tri de la pagination).
+        """
+        fields = fields or cls.fields
+        lookups = dict(cls.fields)
+        selected = [lookup for _, lookup in fields]
+        selected += [lookups[relation] for name, relation in cls.omit_if_null.items()
+                     if any(name == field for field, _ in fields)]
+        selected += extra
+        return queryset.values(*dict.fromkeys(selected))
+    
+    @classmethod
+    def serialize(cls, rows, fields=None):
+        """Convertit une séquence de lignes `.values()` en liste de dicts de sortie."""
+        fields = fields or cls.fields
+        data = [{name: row[lookup] for name, lookup in fields} for row in rows]
+        names = {name for name, _ in fields}
+        datetime_fields = [name for name in cls.datetime_fields if name in names]
+        if datetime_fields:
+            to_representation = cls._datetime_field.to_representation
+            for item in data:
+                for name in datetime_fields:
+                    item[name] = to_representation(item[name])
+        lookups = dict(cls.fields)
+        omitted = [(name, lookups[relation]) for name, relation in cls.omit_if_null.items() if name in names]
+        if omitted:
+            for row, item in zip(rows, data):
+                for name, lookup in omitted:
+                    if row[lookup] is None:
+                        del item[name]
+        return data
+
+
+class OlympicGameValuesSerializer(ValuesSerializer):
+    """Équivalent rapide de OlympicGameSerializer."""
+    fields = [
+        ('id', 'id'),
+        ('game_slug', 'game_slug'),
+        ('game_name', 'game_name'),
+        ('game_year', 'game_year'),
+        ('game_season', 'game_season'),
+        ('game_location', 'game_location'),
+        ('game_start_date', 'game_start_date'),
+        ('game_end_date', 'game_end_date'),
+    ]
+    datetime_fields = ('game_start_date', 'game_end_date')
+
+
+class AthleteValuesSerializer(ValuesSerializer):
+    """Équivalent rapide de AthleteSerializer."""
+    fields = [
+        ('id', 'id'),
+        ('athlete_full_name', 'athlete_full_name'),
+        ('athlete_url', 'athlete_url'),
+        ('athlete_year_birth', 'athlete_year_birth'),
+        ('games_participations', 'games_participations'),
+        ('first_game', 'first_game'),
+        ('total_gold_medals', 'total_gold_medals'),
+        ('total_silver_medals', 'total_silver_medals'),
+        ('total_bronze_medals', 'total_bronze_medals'),
+        ('total_medals', 'total_medals'),
+        ('medal_country', 'medal_country_id'),
+        ('medal_country_name', 'medal_country__country_name'),
+        ('medal_discipline', 'medal_discipline'),
+    ]
+    omit_if_null = {'medal_country_name': 'medal_country'}
+
+
+class CountryValuesSerializer(ValuesSerializer):
+    """Équivalent rapide de CountrySerializer."""
+    fields = [
+        ('id', 'id'),
+        ('country_name', 'country_name'),
+        ('country_code', 'country_code'),
+        ('country_3_letter_code', 'country_3_letter_code'),
+        ('total_gold_medals', 'total_gold_medals'),
+        ('total_silver_medals', 'total_silver_medals'),
+        ('total_bronze_medals', 'total_bronze_medals'),
+        ('total_medals', 'total_medals'),
+    ]
+
+
+class MedalValuesSerializer(ValuesSerializer):
+    """Équivalent rapide de MedalSerializer."""
+    fields = [
+        ('id', 'id'),
+        ('discipline_title', 'discipline_title'),
+        ('slug_game', 'slug_game'),
+        ('event_title', 'event_title'),
+        ('event_gender', 'event_gender'),
+        ('medal_type', 'medal_type'),
+        ('participant_type', 'participant_type'),
+        ('participant_title', 'participant_title'),
+        ('country', 'country_id'),
+        ('country_name', 'country__country_name'),
+        ('athlete', 'athlete_id'),
+        ('athlete_name', 'athlete__athlete_full_name'),
+        ('game', 'game_id'),
+        ('game_name', 'game__game_name'),
+    ]
+    omit_if_null = {'athlete_name': 'athlete', 'game_name': 'game'}
+
+
+class CountryPredictionValuesSerializer(ValuesSerializer):
+    """Équivalent rapide de CountryPredictionSerializer."""
+    fields = [
+        ('id', 'id'),
+        ('country', 'country_id'),
+        ('country_name', 'country__country_name'),
+        ('predicted_game', 'predicted_game'),
+        ('predicted_gold', 'predicted_gold'),
+        ('predicted_silver', 'predicted_silver'),
+        ('predicted_bronze', 'predicted_bronze'),
+        ('predicted_total', 'predicted_total'),
+        ('confidence_score', 'confidence_score'),
+        ('created_at', 'created_at'),
+    ]
+    datetime_fields = ('created_at',)
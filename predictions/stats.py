@@ -0,0 +1,161 @@
+"""
+Statistiques globales de l'application (tableau de bord).
+
+Les compteurs de médailles sont lus depuis les totaux maintenus sur `Country`
+(une seule requête d'agrégation, sans parcourir `Medal`). Le résultat est mis
+en cache sous une clé dépendant de la version des données : en régime
+permanent, `get_overview()` ne coûte qu'une lecture du cache.
+`aget_overview()` en est la variante async (requêtes exécutées en parallèle).
+
+`rebuild_country_game_stats()` précalcule la matrice pays × jeu
+(`CountryGameStats`) lors de l'import, `rebuild_athlete_medal_counts()` le
+palmarès de chaque athlète.
+"""
+
+import asyncio
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Q, Sum
+from django.db.models.functions import Coalesce
+
+from .concurrency import run_query
+from .models import OlympicGame, Athlete, Country, CountryGameStats, Medal
+from .versioning import get_data_version
+
+
+OVERVIEW_CACHE_KEY = 'stats:overview:v{version}'
+
+ATHLETE_MEDAL_FIELDS = (
+    'total_gold_medals', 'total_silver_medals', 'total_bronze_medals', 'total_medals',
+    'medal_country_id', 'medal_discipline',
+)
+
+
+def medal_totals():
+    """Nombre de pays et totaux de médailles (agrégat des totaux de `Country`)."""
+    return Country.objects.order_by().aggregate(
+        total_countries=Count('id'),
+        total_medals=Coalesce(Sum('total_medals'), 0),
+        gold_medals=Coalesce(Sum('total_gold_medals'), 0),
+        silver_medals=Coalesce(Sum('total_silver_medals'), 0),
+        bronze_medals=Coalesce(Sum('total_bronze_medals'), 0),
+    )
+
+
+def count_games():
+    return OlympicGame.objects.count()
+
+
+def count_athletes():
+    return Athlete.objects.count()
+
+
+def build_overview(medals, total_games, total_athletes):
+    return {
+        'total_games': total_games,
+        'total_athletes': total_athletes,
+        'total_countries': medals['total_countries'],
+        'total_medals': medals['total_medals'],
+        'gold_medals': medals['gold_medals'],
+        'silver_medals': medals['silver_medals'],
+        'bronze_medals': medals['bronze_medals'],
+    }
+
+
+def compute_overview():
+    """Calcule les statistiques globales."""
+    return build_overview(medal_totals(), count_games(), count_athletes())
+
+
+async def acompute_overview():
+    """Calcule les statistiques globales, les trois requêtes en parallèle."""
+    results = await asyncio.gather(
+        run_query(medal_totals), run_query(count_games), run_query(count_athletes)
+    )
+    return build_overview(*results)
+
+
+def get_overview():
+    """Retourne les statistiques globales depuis le cache (calculées si absentes)."""
+    key = OVERVIEW_CACHE_KEY.format(version=get_data_version())
+    return cache.get_or_set(key, compute_overview, timeout=None)
+
+
+async def aget_overview():
+    """Variante async de `get_overview` (la version des données doit être mémorisée)."""
+    key = OVERVIEW_CACHE_KEY.format(version=get_data_version())
+    overview = await cache.aget(key)
+    if overview is None:
+        overview = await acompute_overview()
+        await cache.aset(key, overview, timeout=None)
+    return overview
+
+
+def rebuild_country_game_stats():
+    """
+    Reconstruit la matrice pays × jeu depuis les médailles (un seul GROUP BY).
+    Retourne le nombre de couples (pays, jeu) enregistrés.
+    """
+    rows = Medal.objects.filter(game__isnull=False).order_by().values(
+        'country_id', 'game_id'
+    ).annotate(
+        gold=Count('id', filter=Q(medal_type='GOLD')),
+        silver=Count('id', filter=Q(medal_type='SILVER')),
+        bronze=Count('id', filter=Q(medal_type='BRONZE')),
+        total=Count('id'),
+    )
+    with transaction.atomic():
+        CountryGameStats.objects.all().delete()
+        CountryGameStats.objects.bulk_create(
+            [CountryGameStats(**row) for row in rows], batch_size=1000
+        )
+    return CountryGameStats.objects.count()
+
+
+def rebuild_athlete_medal_counts():
+    """
+    Recalcule le palmarès des athlètes (un seul GROUP BY athlète, pays,
+    discipline) : compteurs par type, pays et discipline les plus fréquents.
+    Seuls les athlètes modifiés sont enregistrés ; retourne leurs identifiants.
+    """
+    rows = Medal.objects.filter(athlete__isnull=False).order_by().values(
+        'athlete_id', 'country_id', 'discipline_title'
+    ).annotate(
+        gold=Count('id', filter=Q(medal_type='GOLD')),
+        silver=Count('id', filter=Q(medal_type='SILVER')),
+        bronze=Count('id', filter=Q(medal_type='BRONZE')),
+        total=Count('id'),
+    )
+    counts, countries, disciplines = {}, {}, {}
+    for row in rows:
+        athlete_id = row['athlete_id']
+        gold, silver, bronze, total = counts.get(athlete_id, (0, 0, 0, 0))
+        counts[athlete_id] = (gold + row['gold'], silver + row['silver'], bronze + row['bronze'], total + row['total'])
+        by_country = countries.setdefault(athlete_id, {})
+        by_country[row['country_id']] = by_country.get(row['country_id'], 0) + row['total']
+        by_discipline = disciplines.setdefault(athlete_id, {})
+        by_discipline[row['discipline_title']] = by_discipline.get(row['discipline_title'], 0) + row['total']
+    
+    def most_frequent(values):
+        return min(values, key=lambda value: (-values[value], value))
+    
+    expected = {
+        athlete_id: (*totals, most_frequent(countries[athlete_id]), most_frequent(disciplines[athlete_id]))
+        for athlete_id, totals in counts.items()
+    }
+    empty = (0, 0, 0, 0, None, '')
+    changed = []
+    current = Athlete.objects.filter(
+        Q(total_medals__gt=0) | Exists(Medal.objects.filter(athlete=OuterRef('pk')))
+    ).order_by().only('id', *ATHLETE_MEDAL_FIELDS)
+    for athlete in current.iterator(chunk_size=2000):
+        values = expected.get(athlete.id, empty)
+        if tuple(getattr(athlete, field) for field in ATHLETE_MEDAL_FIELDS) != values:
+            for field, value in zip(ATHLETE_MEDAL_FIELDS, values):
+                setattr(athlete, field, value)
+            changed.append(athlete)
+    
+    with transaction.atomic():
+        Athlete.objects.bulk_update(changed, ATHLETE_MEDAL_FIELDS, batch_size=1000)
+    return [athlete.id for athlete in changed]
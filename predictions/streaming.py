@@ -0,0 +1,59 @@
+"""
+Actions différées à la fin d'une réponse en streaming.
+
+Le corps d'une `StreamingHttpResponse` est produit après la vue et les
+middlewares, pendant son envoi. `on_stream_end` exécute une fonction une fois
+le corps entièrement lu, interrompu par une erreur ou fermé par le serveur
+(client déconnecté), même si sa lecture n'a jamais commencé.
+"""
+
+
+class _StreamEnd:
+    def __init__(self, content, callback):
+        self.content = content
+        self.callback = callback
+        self.done = False
+
+    def close(self):
+        if self.done:
+            return
+        self.done = True
+        try:
+            close = getattr(self.content, 'close', None)
+            if close is not None:
+                close()
+        finally:
+            self.callback()
+
+
+class _SyncStreamEnd(_StreamEnd):
+    def __iter__(self):
+        self.iterator = iter(self.content)
+        return self
+
+    def __next__(self):
+        try:
+            return next(self.iterator)
+        except BaseException:
+            self.close()
+            raise
+
+
+class _AsyncStreamEnd(_StreamEnd):
+    def __aiter__(self):
+        self.iterator = aiter(self.content)
+        return self
+
+    async def __anext__(self):
+        try:
+            return await anext(self.iterator)
+        except BaseException:
+            self.close()
+            raise
+
+
+def on_stream_end(response, callback):
+    """Appelle `callback()` une seule fois, à la fin du corps de `response` (en streaming)."""
+    wrapper = _AsyncStreamEnd if response.is_async else _SyncStreamEnd
+    response.streaming_content = wrapper(response.streaming_content, callback)
+    return response
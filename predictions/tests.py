@@ -1,3 +1,995 @@
-from django.test import TestCase
+import base64
+import csv
+import gzip
+import json
+import tempfile
+from importlib import import_module
+from datetime import datetime, timezone
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.http import JsonResponse
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+
+from .models import OlympicGame, Athlete, Country, Medal, CountryPrediction
+from .cache_backends import BoundedLocMemCache
+from .changes import track_changes
+from .instrumentation import QueryBudgetExceeded
+from .middleware import QueryBudgetMiddleware
+from .concurrency import run_query
+from .compression import negotiate_encoding
+from .query_plans import find_full_scans
+from .pagination import AthleteCursorPagination, MedalCursorPagination
+from .rankings import country_rank_history
+from .renderers import ORJSONRenderer
+from .response_cache import warm_response_cache
+from .search import rebuild_search_index
+from .stats import rebuild_athlete_medal_counts, rebuild_country_game_stats
+from .throttling import heavy_requests, latencies, reset_admission_state
+from .timeseries import medal_timeseries
+from .serializers import (
+    OlympicGameSerializer, AthleteSerializer, CountrySerializer,
+    MedalSerializer, CountryPredictionSerializer
+)
+from .versioning import bump_data_version, get_data_version
+
+
+def create_sample_data():
+    """Crée deux jeux, deux pays, deux athlètes et quelques médailles."""
+    start = datetime(2020, 7, 23, tzinfo=timezone.utc)
+    tokyo = OlympicGame.objects.create(
+        game_slug='tokyo-2020', game_name='Tokyo 2020', game_year=2020,
+        game_season='Summer', game_location='Japan',
+        game_start_date=start, game_end_date=start,
+    )
+    beijing = OlympicGame.objects.create(
+        game_slug='beijing-2022', game_name='Beijing 2022', game_year=2022,
+        game_season='Winter', game_location='China',
+        game_start_date=start, game_end_date=start,
+    )
+    france = Country.objects.create(country_name='France', country_code='FR', country_3_letter_code='FRA')
+    italy = Country.objects.create(country_name='Italy', country_code='IT', country_3_letter_code='ITA')
+    riner = Athlete.objects.create(athlete_full_name='Teddy RINER', athlete_url='https://olympics.com/en/athletes/teddy-riner')
+    constantini = Athlete.objects.create(athlete_full_name='Stefania CONSTANTINI', athlete_url='https://olympics.com/en/athletes/stefania-constantini')
+
+    medals = [
+        (tokyo, france, riner, 'Judo', 'GOLD'),
+        (tokyo, france, None, 'Judo', 'SILVER'),
+        (tokyo, italy, None, 'Cycling Track', 'GOLD'),
+        (beijing, italy, constantini, 'Curling', 'GOLD'),
+        (beijing, france, None, 'Biathlon', 'BRONZE'),
+    ]
+    for game, country, athlete, discipline, medal_type in medals:
+        Medal.objects.create(
+            discipline_title=discipline, slug_game=game.game_slug,
+            event_title=f'{discipline} event', event_gender='Mixed',
+            medal_type=medal_type, participant_type='Athlete',
+            participant_title=athlete.athlete_full_name if athlete else None,
+            athlete=athlete, country=country, game=game,
+        )
+
+    for country in (france, italy):
+        medals = Medal.objects.filter(country=country)
+        country.total_gold_medals = medals.filter(medal_type='GOLD').count()
+        country.total_silver_medals = medals.filter(medal_type='SILVER').count()
+        country.total_bronze_medals = medals.filter(medal_type='BRONZE').count()
+        country.total_medals = medals.count()
+        country.save()
+
+    rebuild_country_game_stats()
+    rebuild_athlete_medal_counts()
+    bump_data_version()
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class SampleDataTestCase(TestCase):
+    """
+    Caches vidés et jeu de données d'exemple créé avant chaque test ; une vue
+    dépassant son budget de requêtes SQL fait échouer le test.
+    """
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        reset_admission_state()
+        create_sample_data()
+
+
+class QueryPlanTests(TestCase):
+    """Les requêtes chaudes doivent toutes s'appuyer sur un index."""
+
+    def test_hot_queries_use_indexes(self):
+        out = StringIO()
+        call_command('check_query_plans', stdout=out)
+        self.assertIn('aucun parcours complet', out.getvalue())
+
+    def test_index_scans_are_full_scans(self):
+        plan = [
+            'SCAN predictions_countrygamestats USING INDEX predictions_countrygamestats_game_id_3ff52f44',
+            'SCAN predictions_medal',
+            'SEARCH predictions_country USING INTEGER PRIMARY KEY (rowid=?)',
+        ]
+        self.assertEqual(find_full_scans(plan), ['predictions_countrygamestats', 'predictions_medal'])
+        self.assertEqual(find_full_scans(plan, pk_ordered={'predictions_medal'}), ['predictions_countrygamestats'])
+        self.assertEqual(find_full_scans(
+            ['SCAN predictions_athlete USING INDEX athlete_name_idx'],
+            index_ordered={'predictions_athlete': 'athlete_name_idx'},
+        ), [])
+
+
+class StatsOverviewTests(SampleDataTestCase):
+
+
+    def test_overview_is_cached_per_data_version(self):
+        expected = {
+            'total_games': 2, 'total_athletes': 2, 'total_countries': 2,
+            'total_medals': 5, 'gold_medals': 3, 'silver_medals': 1, 'bronze_medals': 1,
+        }
+        response = self.client.get('/api/stats/overview/')
+        self.assertEqual(response.json(), expected)
+
+        # Requête suivante : lecture de la version puis du cache
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/stats/overview/')
+        self.assertEqual(response.json(), expected)
+
+        Country.objects.filter(country_name='France').update(total_gold_medals=2, total_medals=4)
+        bump_data_version()
+        response = self.client.get('/api/stats/overview/')
+        self.assertEqual(response.json()['gold_medals'], 4)
+
+
+class CursorPaginationTests(SampleDataTestCase):
+
+
+    def test_medals_pages_follow_cursor_without_count(self):
+        data = self.client.get('/api/medals/').json()
+        self.assertNotIn('count', data)
+        ids = [medal['id'] for medal in data['results']]
+        self.assertEqual(ids, sorted(ids, reverse=True))
+
+    def test_athletes_cursor_walks_alphabetically(self):
+        with mock.patch.object(AthleteCursorPagination, 'page_size', 1):
+            first = self.client.get('/api/athletes/').json()
+            second = self.client.get(first['next']).json()
+        self.assertEqual(first['results'][0]['athlete_full_name'], 'Stefania CONSTANTINI')
+        self.assertEqual(second['results'][0]['athlete_full_name'], 'Teddy RINER')
+        self.assertIsNone(second['next'])
+
+    def walk(self, url):
+        """Identifiants de toutes les pages en suivant `next`, puis en revenant par `previous`."""
+        pages = [self.client.get(url).json()]
+        while pages[-1]['next']:
+            pages.append(self.client.get(pages[-1]['next']).json())
+        backwards = [pages[-1]]
+        while backwards[-1]['previous']:
+            backwards.append(self.client.get(backwards[-1]['previous']).json())
+        forward = [athlete['id'] for page in pages for athlete in page['results']]
+        backward = [athlete['id'] for page in reversed(backwards) for athlete in page['results']]
+        return forward, backward
+
+    def test_athletes_cursor_survives_homonyms(self):
+        Athlete.objects.bulk_create(
+            Athlete(athlete_full_name='Jean MARTIN', athlete_url=f'https://olympics.com/en/athletes/jean-martin-{i}')
+            for i in range(1300)
+        )
+        with mock.patch.object(AthleteCursorPagination, 'page_size', 100):
+            forward, backward = self.walk('/api/athletes/')
+        self.assertEqual(len(forward), Athlete.objects.count())
+        self.assertEqual(len(set(forward)), len(forward))
+        self.assertEqual(backward, forward)
+
+    def test_forged_cursors_are_not_found(self):
+        def cursor(position):
+            payload = json.dumps({'p': position, 'r': 0}).encode('utf-8')
+            return base64.urlsafe_b64encode(payload).decode('ascii')
+
+        for url, position in [
+            ('/api/medals/?', ['abc']),
+            ('/api/medals/?', [{'a': 1}]),
+            ('/api/medals/?', [None]),
+            ('/api/athletes/?', [None, 5]),
+            ('/api/athletes/?', ['Teddy RINER', 'x']),
+            ('/api/athletes/?ordering=-total_medals&', ['abc', 1]),
+        ]:
+            with self.subTest(url=url, position=position):
+                response = self.client.get(f'{url}cursor={cursor(position)}')
+                self.assertEqual(response.status_code, 404)
+
+        response = self.client.get(f"/api/athletes/?cursor={cursor(['A', '1'])}")
+        self.assertEqual(response.status_code, 200)
+
+    def test_count_is_optional(self):
+        response = self.client.get('/api/medals/?country=%d&count=1' % Country.objects.get(country_name='France').id)
+        self.assertEqual(response.json()['count'], 3)
+
+
+class DetailPayloadTests(SampleDataTestCase):
+    """Les fiches pays et jeu renvoient une page bornée de médailles, sans N+1."""
+
+    def setUp(self):
+        super().setUp()
+        self.tokyo = OlympicGame.objects.get(game_slug='tokyo-2020')
+        self.france = Country.objects.get(country_name='France')
+
+    def add_medals(self, count):
+        athlete = Athlete.objects.first()
+        Medal.objects.bulk_create([
+            Medal(
+                discipline_title='Fencing', slug_game='tokyo-2020', event_title=f'Event {i}',
+                event_gender='Men', medal_type='BRONZE', participant_type='Athlete',
+                athlete=athlete, country=self.france, game=self.tokyo,
+            )
+            for i in range(count)
+        ])
+        bump_data_version()
+
+    def test_game_detail_query_count_is_constant(self):
+        # Version des données, jeu, page de médailles
+        with self.assertNumQueries(3):
+            self.client.get(f'/api/games/{self.tokyo.id}/')
+        self.add_medals(80)
+        with self.assertNumQueries(3):
+            data = self.client.get(f'/api/games/{self.tokyo.id}/').json()
+        self.assertEqual(len(data['medals']), 50)
+        self.assertEqual(data['medals'][0]['country_name'], 'France')
+
+        next_page = self.client.get(data['medals_next']).json()
+        self.assertEqual(len(next_page['medals']), 83 - 50)
+        self.assertIsNone(next_page['medals_next'])
+
+    def test_country_detail_query_count_is_constant(self):
+        self.add_medals(80)
+        with self.assertNumQueries(4):
+            data = self.client.get(f'/api/countries/{self.france.id}/').json()
+        self.assertEqual(len(data['medals']), 50)
+        self.assertEqual(data['medals_by_discipline'][0], {'discipline_title': 'Fencing', 'count': 80})
+
+
+class ExportTests(SampleDataTestCase):
+
+
+    def test_medals_export_streams_ndjson_with_filters(self):
+        italy = Country.objects.get(country_name='Italy')
+        response = self.client.get(f'/api/medals/export/?country={italy.id}')
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[0])['athlete_name'], 'Stefania CONSTANTINI')
+
+    def test_medals_export_csv(self):
+        response = self.client.get('/api/medals/export/?format=csv&type=gold')
+        rows = list(csv.reader(b''.join(response.streaming_content).decode().splitlines()))
+        self.assertEqual(rows[0][:2], ['id', 'discipline_title'])
+        self.assertEqual(len(rows), 1 + 3)
+
+
+class FastListTests(SampleDataTestCase):
+    """Le chemin rapide des listes produit exactement la sortie des ModelSerializers."""
+
+    def setUp(self):
+        super().setUp()
+        CountryPrediction.objects.create(
+            country=Country.objects.get(country_name='France'), predicted_game='Paris 2024',
+            predicted_gold=1, predicted_silver=1, predicted_bronze=1, predicted_total=3,
+            confidence_score=0.685,
+        )
+
+    def test_lists_match_model_serializers(self):
+        endpoints = [
+            ('/api/games/', OlympicGame, OlympicGameSerializer),
+            ('/api/athletes/', Athlete, AthleteSerializer),
+            ('/api/countries/', Country, CountrySerializer),
+            ('/api/medals/', Medal, MedalSerializer),
+            ('/api/predictions/', CountryPrediction, CountryPredictionSerializer),
+        ]
+        for url, model, serializer_class in endpoints:
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_ACCEPT='application/json')
+                results = json.loads(response.content)['results']
+                ids = [item['id'] for item in results]
+                objects = model.objects.in_bulk(ids)
+                expected = serializer_class([objects[pk] for pk in ids], many=True).data
+                self.assertEqual(
+                    response.content.split(b'"results":')[1][:-1],
+                    JSONRenderer().render(expected),
+                )
+
+    def test_orjson_renderer_matches_json_renderer(self):
+        medals = MedalSerializer(Medal.objects.select_related('country', 'athlete', 'game'), many=True).data
+        predictions = CountryPredictionSerializer(CountryPrediction.objects.all(), many=True).data
+        for data in (medals, predictions, {'detail': 'Non trouvé.'}, {'detail': 'ligne\u2028paragraphe\u2029'}):
+            self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+
+class SparseFieldsTests(SampleDataTestCase):
+
+    def test_fields_trim_output_and_joins(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get('/api/medals/?fields=medal_type,country_name').json()
+        self.assertEqual(set(data['results'][0]), {'medal_type', 'country_name'})
+        sql = queries.captured_queries[-1]['sql']
+        self.assertIn('predictions_country', sql)
+        self.assertNotIn('predictions_athlete', sql)
+        self.assertNotIn('predictions_olympicgame', sql)
+
+        # Le curseur reste utilisable sans `id` dans la sélection
+        with mock.patch.object(MedalCursorPagination, 'page_size', 2):
+            first = self.client.get('/api/medals/?fields=medal_type').json()
+            second = self.client.get(first['next']).json()
+        self.assertEqual(len(second['results']), 2)
+
+    def test_null_relations_are_still_omitted(self):
+        results = self.client.get('/api/medals/?fields=id,athlete_name').json()['results']
+        self.assertEqual(sum('athlete_name' in medal for medal in results), 2)
+
+    def test_unknown_field_is_rejected(self):
+        self.assertEqual(self.client.get('/api/medals/?fields=id,nope').status_code, 400)
+
+    def test_columnar_format_round_trips(self):
+        rows = self.client.get('/api/medals/').json()['results']
+        data = self.client.get('/api/medals/?format=columnar').json()['results']
+        self.assertEqual(data['length'], len(rows))
+        disciplines = data['columns']['discipline_title']
+        self.assertEqual(len(disciplines['dictionary']), 4)
+        self.assertEqual(
+            [disciplines['dictionary'][code] for code in disciplines['codes']],
+            [row['discipline_title'] for row in rows],
+        )
+        self.assertEqual(data['columns']['id'], [row['id'] for row in rows])
+        athletes = data['columns']['athlete_name']
+        self.assertEqual(
+            [None if code is None else athletes['dictionary'][code] for code in athletes['codes']],
+            [row.get('athlete_name') for row in rows],
+        )
+
+
+class BatchAndPageTests(SampleDataTestCase):
+
+    def test_batch_cost_is_constant_per_resource(self):
+        france, italy = Country.objects.get(country_name='France'), Country.objects.get(country_name='Italy')
+        game = OlympicGame.objects.get(game_slug='tokyo-2020')
+        # Version des données puis une requête par type de ressource
+        with self.assertNumQueries(3):
+            data = self.client.get(f'/api/batch/?countries={italy.id},{france.id},999&games={game.id}').json()
+        self.assertEqual([country['country_name'] for country in data['countries']], ['Italy', 'France'])
+        self.assertEqual(data['games'][0]['game_name'], 'Tokyo 2020')
+        self.assertEqual(data['missing'], {'countries': [999]})
+        self.assertNotIn('athletes', data)
+
+    def test_batch_rejects_invalid_ids(self):
+        self.assertEqual(self.client.get('/api/batch/?countries=1,x').status_code, 400)
+        ids = ','.join(str(i) for i in range(101))
+        self.assertEqual(self.client.get(f'/api/batch/?athletes={ids}').status_code, 400)
+
+    def test_page_payloads(self):
+        home = self.client.get('/api/pages/home/').json()
+        self.assertEqual(home['stats']['total_medals'], 5)
+        self.assertEqual(len(home['top_countries']), 2)
+        self.assertEqual(home['recent_games'][0]['game_name'], 'Beijing 2022')
+
+        france = Country.objects.get(country_name='France')
+        page = self.client.get(f'/api/pages/countries/{france.id}/').json()
+        self.assertEqual(page['country'], self.client.get(f'/api/countries/{france.id}/').json())
+
+        game = OlympicGame.objects.get(game_slug='tokyo-2020')
+        page = self.client.get(f'/api/pages/games/{game.id}/').json()
+        self.assertEqual(len(page['game']['medals']), 3)
+        self.assertEqual(page['top_countries'][0], {'country__country_name': 'France', 'country__id': france.id, 'medal_count': 2})
+        self.assertEqual(self.client.get('/api/pages/games/999/').status_code, 404)
+
+
+class AsyncViewTests(TransactionTestCase):
+    """Les vues async (requêtes dans le pool de threads) répondent comme les vues synchrones."""
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        reset_admission_state()
+        create_sample_data()
+
+    async def test_async_endpoints_match_sync_endpoints(self):
+        france = await Country.objects.aget(country_name='France')
+        tokyo = await OlympicGame.objects.aget(game_slug='tokyo-2020')
+        endpoints = [
+            ('/api/async/stats/overview/', '/api/stats/overview/'),
+            (f'/api/async/countries/{france.id}/', f'/api/countries/{france.id}/'),
+            (f'/api/async/games/{tokyo.id}/', f'/api/pages/games/{tokyo.id}/'),
+        ]
+        for async_url, sync_url in endpoints:
+            with self.subTest(url=async_url):
+                response = await self.async_client.get(async_url)
+                self.assertEqual(response.status_code, 200)
+                expected = await self.async_client.get(sync_url)
+                self.assertEqual(response.json(), expected.json())
+
+        response = await self.async_client.get(f'/api/async/countries/{france.id}/')
+        response = await self.async_client.get(
+            f'/api/async/countries/{france.id}/', headers={'If-None-Match': response['ETag']}
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual((await self.async_client.get('/api/async/games/999/')).status_code, 404)
+
+    async def test_pool_connections_are_checked_around_each_call(self):
+        with mock.patch('predictions.concurrency.close_old_connections') as close_old:
+            self.assertEqual(await run_query(Country.objects.count), 2)
+        self.assertEqual(close_old.call_count, 2)
+
+
+class MedalTableTests(SampleDataTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tokyo = OlympicGame.objects.get(game_slug='tokyo-2020')
+        self.beijing = OlympicGame.objects.get(game_slug='beijing-2022')
+        self.france = Country.objects.get(country_name='France')
+        self.italy = Country.objects.get(country_name='Italy')
+
+    def test_gold_first_ranking_with_ties(self):
+        # Tokyo : France 1 or + 1 argent, Italie 1 or -> France devant malgré l'égalité en or
+        table = self.client.get(f'/api/games/{self.tokyo.id}/medal_table/').json()
+        self.assertEqual(
+            [(row['country_name'], row['rank'], row['gold'], row['silver'], row['bronze']) for row in table],
+            [('France', 1, 1, 1, 0), ('Italy', 2, 1, 0, 0)],
+        )
+
+        Medal.objects.create(
+            discipline_title='Judo', slug_game='tokyo-2020', event_title='Judo team',
+            event_gender='Mixed', medal_type='SILVER', participant_type='GameTeam',
+            country=self.italy, game=self.tokyo,
+        )
+        rebuild_country_game_stats()
+        bump_data_version()
+        table = self.client.get(f'/api/games/{self.tokyo.id}/medal_table/').json()
+        self.assertEqual([(row['country_code'], row['rank']) for row in table], [('FRA', 1), ('ITA', 1)])
+
+    def test_rank_history_in_one_query(self):
+        # Beijing : Italie 1 or, France 1 bronze
+        with self.assertNumQueries(1):
+            history = country_rank_history(self.france)
+        self.assertEqual(
+            [(row['game_name'], row['rank'], row['ranked_countries']) for row in history],
+            [('Tokyo 2020', 1, 2), ('Beijing 2022', 2, 2)],
+        )
+        response = self.client.get(f'/api/countries/{self.italy.id}/rank_history/').json()
+        self.assertEqual([row['rank'] for row in response], [2, 1])
+
+
+class TimeseriesTests(SampleDataTestCase):
+
+    def test_series_are_aligned_to_the_game_calendar(self):
+        france = Country.objects.get(country_name='France')
+        # Calendrier, pays, matrice
+        with self.assertNumQueries(3):
+            data = medal_timeseries([france.id])
+        self.assertEqual([game['game_name'] for game in data['games']], ['Tokyo 2020', 'Beijing 2022'])
+        self.assertEqual(data['countries'], [{
+            'id': france.id, 'country_name': 'France',
+            'gold': [1, 0], 'silver': [1, 0], 'bronze': [0, 1], 'total': [2, 1],
+        }])
+
+        data = self.client.get(f'/api/countries/{france.id}/timeseries/?season=winter').json()
+        self.assertEqual([game['game_name'] for game in data['games']], ['Beijing 2022'])
+        self.assertEqual(data['countries'][0]['bronze'], [1])
+
+    def test_multi_country_series(self):
+        italy, france = Country.objects.get(country_name='Italy'), Country.objects.get(country_name='France')
+        data = self.client.get(f'/api/countries/timeseries/?countries={italy.id},{france.id},999').json()
+        self.assertEqual([(country['country_name'], country['gold']) for country in data['countries']],
+                         [('Italy', [1, 1]), ('France', [1, 0])])
+        ids = ','.join(str(i) for i in range(21))
+        self.assertEqual(self.client.get(f'/api/countries/timeseries/?countries={ids}').status_code, 400)
+        self.assertEqual(self.client.get('/api/countries/timeseries/?countries=1&season=spring').status_code, 400)
+
+
+class CompareTests(SampleDataTestCase):
+
+    def test_compare_is_aligned_and_constant_in_queries(self):
+        france, italy = Country.objects.get(country_name='France'), Country.objects.get(country_name='Italy')
+        # Version, calendrier, pays, matrice pays × jeu, disciplines
+        with self.assertNumQueries(5):
+            data = self.client.get(f'/api/compare/?countries={france.id},{italy.id}').json()
+        self.assertEqual([country['country_name'] for country in data['countries']], ['France', 'Italy'])
+        self.assertEqual(data['by_game']['gold'], [[1, 0], [1, 1]])
+
+        disciplines = data['by_discipline']['disciplines']
+        self.assertEqual(disciplines[0], 'Judo')
+        judo = disciplines.index('Judo')
+        curling = disciplines.index('Curling')
+        self.assertEqual([row[judo] for row in data['by_discipline']['total']], [2, 0])
+        self.assertEqual([row[curling] for row in data['by_discipline']['gold']], [0, 1])
+
+    def test_season_filter(self):
+        france = Country.objects.get(country_name='France')
+        data = self.client.get(f'/api/compare/?countries={france.id}&season=winter').json()
+        self.assertEqual(data['by_discipline']['disciplines'], ['Biathlon'])
+        self.assertEqual(data['by_game']['bronze'], [[1]])
+
+
+class AthleteLeaderboardTests(SampleDataTestCase):
+
+    def setUp(self):
+        super().setUp()
+        riner = Athlete.objects.get(athlete_full_name='Teddy RINER')
+        beijing = OlympicGame.objects.get(game_slug='beijing-2022')
+        Medal.objects.create(
+            discipline_title='Judo', slug_game='beijing-2022', event_title='Judo team', event_gender='Mixed',
+            medal_type='BRONZE', participant_type='Athlete', athlete=riner, game=beijing,
+            country=Country.objects.get(country_name='France'),
+        )
+        self.assertEqual(rebuild_athlete_medal_counts(), [riner.id])
+        self.assertEqual(rebuild_athlete_medal_counts(), [])
+        bump_data_version()
+
+    def test_counts_and_leaderboard(self):
+        with self.assertNumQueries(2):
+            data = self.client.get('/api/athletes/leaderboard/').json()
+        riner = data[0]
+        self.assertEqual(riner['athlete_full_name'], 'Teddy RINER')
+        self.assertEqual(
+            [riner[field] for field in ('total_gold_medals', 'total_bronze_medals', 'total_medals')], [1, 1, 2]
+        )
+        self.assertEqual((riner['medal_country_name'], riner['medal_discipline']), ('France', 'Judo'))
+
+        italy = Country.objects.get(country_name='Italy')
+        data = self.client.get(f'/api/athletes/leaderboard/?country={italy.id}&limit=5').json()
+        self.assertEqual([athlete['athlete_full_name'] for athlete in data], ['Stefania CONSTANTINI'])
+        self.assertEqual(self.client.get('/api/athletes/leaderboard/?limit=500').status_code, 400)
+
+    def test_html_pages(self):
+        response = self.client.get('/athletes/')
+        self.assertEqual(
+            [athlete.athlete_full_name for athlete in response.context['athletes']],
+            ['Stefania CONSTANTINI', 'Teddy RINER'],
+        )
+        response = self.client.get('/athletes/leaderboard/')
+        self.assertEqual(
+            [athlete.athlete_full_name for athlete in response.context['athletes']],
+            ['Teddy RINER', 'Stefania CONSTANTINI'],
+        )
+        self.assertContains(response, '<td class="text-center"><strong class="text-primary">2</strong></td>', html=True)
+
+    def test_list_ordering(self):
+        with mock.patch.object(AthleteCursorPagination, 'page_size', 1):
+            first = self.client.get('/api/athletes/?ordering=-total_medals').json()
+            second = self.client.get(first['next']).json()
+        self.assertEqual(first['results'][0]['total_medals'], 2)
+        self.assertEqual(second['results'][0]['athlete_full_name'], 'Stefania CONSTANTINI')
+        self.assertEqual(self.client.get('/api/athletes/?ordering=athlete_url').status_code, 400)
+
+    def test_list_ordering_survives_medal_ties(self):
+        Athlete.objects.bulk_create(
+            Athlete(athlete_full_name=f'Athlete {i}', athlete_url=f'https://olympics.com/en/athletes/a-{i}')
+            for i in range(1300)
+        )
+        results, url = [], '/api/athletes/?ordering=-total_medals'
+        with mock.patch.object(AthleteCursorPagination, 'page_size', 100):
+            while url:
+                data = self.client.get(url).json()
+                results += data['results']
+                url = data['next']
+        self.assertEqual(len({athlete['id'] for athlete in results}), Athlete.objects.count())
+        self.assertEqual(len(results), Athlete.objects.count())
+        totals = [athlete['total_medals'] for athlete in results]
+        self.assertEqual(totals, sorted(totals, reverse=True))
+
+
+class NestedQueryTests(SampleDataTestCase):
+
+    def test_levels_are_batched(self):
+        france, italy = Country.objects.get(country_name='France'), Country.objects.get(country_name='Italy')
+        # Version, pays, jeux, médailles, athlètes
+        with self.assertNumQueries(5):
+            response = self.client.get(
+                f'/api/query/?resource=countries&ids={italy.id},{france.id}&include=games:1.medals.athlete'
+            )
+        results = response.json()['results']
+        self.assertEqual([country['country_name'] for country in results], ['Italy', 'France'])
+        self.assertEqual([game['game_name'] for game in results[1]['games']], ['Beijing 2022'])
+        medals = results[1]['games'][0]['medals']
+        self.assertEqual(len(medals), 2)
+        self.assertEqual(
+            {medal['athlete']['athlete_full_name'] for medal in medals if medal['athlete']},
+            {'Stefania CONSTANTINI'},
+        )
+
+    def test_reverse_relations_and_limits(self):
+        tokyo = OlympicGame.objects.get(game_slug='tokyo-2020')
+        data = self.client.get(f'/api/query/?resource=games&ids={tokyo.id}&include=countries,medals:2.country').json()
+        game = data['results'][0]
+        self.assertEqual([country['country_name'] for country in game['countries']], ['France', 'Italy'])
+        self.assertEqual(len(game['medals']), 2)
+        self.assertIn(game['medals'][0]['country']['country_name'], ('France', 'Italy'))
+
+    def test_budgets_and_validation(self):
+        france = Country.objects.get(country_name='France')
+        url = f'/api/query/?resource=countries&ids={france.id}&include='
+        self.assertEqual(self.client.get(url + 'medals.athlete.medals.country').status_code, 400)
+        self.assertEqual(self.client.get(url + 'flags').status_code, 400)
+        self.assertEqual(self.client.get(url + 'medals.athlete:2').status_code, 400)
+        self.assertEqual(self.client.get('/api/query/?resource=users&ids=1').status_code, 400)
+        with mock.patch('predictions.api_views.NestedQueryViewSet.max_rows', 3):
+            self.assertEqual(self.client.get(url + 'medals').status_code, 400)
+            self.assertEqual(self.client.get(url + 'medals:2').status_code, 200)
+
+
+class DisciplineMatrixTests(SampleDataTestCase):
+
+    def cells(self, data):
+        """Cases {(pays, discipline): (médailles, part)} de l'encodage creux."""
+        cells = data['cells']
+        return {
+            (data['countries'][i]['country_name'], data['disciplines'][j]): (medals, share)
+            for i, j, medals, share in zip(cells['country'], cells['discipline'], cells['medals'], cells['share'])
+        }
+
+    def test_full_range(self):
+        data = self.client.get('/api/analytics/discipline-matrix/').json()
+        self.assertEqual(data['games'], 2)
+        self.assertEqual([country['country_name'] for country in data['countries']], ['France', 'Italy'])
+        self.assertEqual(data['disciplines'], ['Biathlon', 'Curling', 'Cycling Track', 'Judo'])
+        self.assertEqual(self.cells(data)[('France', 'Judo')], (2, 1.0))
+        self.assertEqual(len(data['cells']['medals']), 4)
+
+    def test_slices_are_subtracted(self):
+        start = datetime(2024, 7, 26, tzinfo=timezone.utc)
+        paris = OlympicGame.objects.create(
+            game_slug='paris-2024', game_name='Paris 2024', game_year=2024, game_season='Summer',
+            game_location='France', game_start_date=start, game_end_date=start,
+        )
+        Medal.objects.create(
+            discipline_title='Judo', slug_game='paris-2024', event_title='Judo event', event_gender='Mixed',
+            medal_type='GOLD', participant_type='Athlete', country=Country.objects.get(country_name='Italy'),
+            game=paris,
+        )
+        bump_data_version()
+
+        data = self.client.get('/api/analytics/discipline-matrix/?season=summer&year_from=2021').json()
+        self.assertEqual(data['games'], 1)
+        self.assertEqual(self.cells(data), {('Italy', 'Judo'): (1, 1.0)})
+
+        data = self.client.get('/api/analytics/discipline-matrix/?season=summer&metric=gold').json()
+        self.assertEqual(self.cells(data)[('France', 'Judo')], (1, 0.5))
+        self.assertEqual(data['games'], 2)
+
+        data = self.client.get('/api/analytics/discipline-matrix/?year_to=2022&year_from=2022').json()
+        self.assertEqual(data['disciplines'], ['Biathlon', 'Curling'])
+
+    def test_validation(self):
+        url = '/api/analytics/discipline-matrix/'
+        self.assertEqual(self.client.get(url + '?metric=points').status_code, 400)
+        self.assertEqual(self.client.get(url + '?year_from=2020&year_to=2000').status_code, 400)
+        self.assertEqual(self.client.get(url + '?year_from=abc').status_code, 400)
+
+
+class ChangesTests(SampleDataTestCase):
+
+    def test_changes_are_net_per_resource(self):
+        since = get_data_version()
+        france = Country.objects.get(country_name='France')
+        with track_changes() as changes:
+            germany = Country.objects.create(country_name='Germany', country_code='DE', country_3_letter_code='GER')
+            germany.total_medals = 3
+            germany.save()
+            france.total_medals = 10
+            france.save()
+            ghost = Country.objects.create(country_name='Ghost', country_code='GH', country_3_letter_code='GHO')
+            ghost.delete()
+            bump_data_version(changes=changes)
+        with track_changes() as changes:
+            Athlete.objects.filter(athlete_full_name='Teddy RINER').delete()
+            bump_data_version(changes=changes)
+
+        data = self.client.get(f'/api/changes/?since={since}').json()
+        self.assertEqual(data['version'], since + 2)
+        self.assertFalse(data['full_resync'])
+        countries = data['changes']['countries']
+        self.assertEqual([(c['country_name'], c['total_medals']) for c in countries['created']], [('Germany', 3)])
+        self.assertEqual([c['id'] for c in countries['updated']], [france.id])
+        self.assertEqual(countries['deleted'], [])
+        self.assertEqual(len(data['changes']['athletes']['deleted']), 1)
+
+        latest = self.client.get(f'/api/changes/?since={since + 1}').json()
+        self.assertEqual(list(latest['changes']), ['athletes'])
+        self.assertEqual(self.client.get(f'/api/changes/?since={since + 2}').json()['changes'], {})
+
+    def test_resync_and_validation(self):
+        version = get_data_version()
+        self.assertTrue(self.client.get(f'/api/changes/?since={version + 1}').json()['full_resync'])
+        with self.settings(CHANGELOG_RETENTION_VERSIONS=1):
+            bump_data_version()
+            self.assertTrue(self.client.get(f'/api/changes/?since={version - 1}').json()['full_resync'])
+        self.assertEqual(self.client.get('/api/changes/').status_code, 400)
+        self.assertEqual(self.client.get('/api/changes/?since=-1').status_code, 400)
+
+
+class ThrottlingTests(SampleDataTestCase):
+    heavy_url = '/api/query/?resource=countries&ids=1'
+
+    def test_token_bucket_rejects_heavy_requests_first(self):
+        with self.settings(API_THROTTLE={'RATE': 1, 'BURST': 30}):
+            self.assertEqual(self.client.get(self.heavy_url).status_code, 200)
+            response = self.client.get(self.heavy_url + ',2')
+            self.assertEqual(response.status_code, 429)
+            self.assertGreaterEqual(int(response['Retry-After']), 10)
+            self.assertEqual(self.client.get('/api/countries/').status_code, 200)
+
+    def test_heavy_concurrency_cap(self):
+        with self.settings(API_THROTTLE={'MAX_HEAVY': 1, 'QUEUE_TIMEOUT': 0}):
+            heavy_requests.acquire(1, 0)
+            try:
+                response = self.client.get(self.heavy_url)
+                self.assertEqual(response.status_code, 429)
+                self.assertEqual(response['Retry-After'], '1')
+                self.assertEqual(self.client.get('/api/countries/').status_code, 200)
+            finally:
+                heavy_requests.release()
+            self.assertEqual(self.client.get(self.heavy_url).status_code, 200)
+            self.assertEqual(heavy_requests.active, 0)
+
+    def test_cost_follows_observed_latency(self):
+        latencies.record('CountryViewSet.list', 2.0)
+        with self.settings(API_THROTTLE={'MAX_HEAVY': 0, 'QUEUE_TIMEOUT': 0}):
+            self.assertEqual(self.client.get('/api/countries/').status_code, 429)
+            self.assertEqual(self.client.get('/api/games/').status_code, 200)
+
+    def test_streaming_export_holds_heavy_slot(self):
+        response = self.client.get('/api/medals/export/')
+        self.assertEqual(response.status_code, 200)
+        chunks = iter(response.streaming_content)
+        next(chunks)
+        self.assertEqual(heavy_requests.active, 1)
+        self.assertNotIn('MedalViewSet.export', latencies.latencies)
+        b''.join(chunks)
+        self.assertEqual(heavy_requests.active, 0)
+        self.assertIn('MedalViewSet.export', latencies.latencies)
+
+
+class QueryBudgetTests(SampleDataTestCase):
+
+    def test_server_timing_header(self):
+        response = self.client.get('/api/countries/')
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="3 queries", ser;dur=[\d.]+, app;dur=')
+
+    def test_budget_is_enforced(self):
+        with self.settings(QUERY_BUDGET=1):
+            with self.assertRaisesMessage(QueryBudgetExceeded, 'CountryViewSet : 3 requêtes SQL (budget 1)'):
+                self.client.get('/api/countries/')
+            with self.settings(QUERY_BUDGET_STRICT=False), self.assertLogs('predictions.queries', 'WARNING'):
+                self.assertEqual(self.client.get('/api/games/').status_code, 200)
+
+    def test_repeated_queries_are_reported(self):
+        def n_plus_one(request):
+            return JsonResponse({'countries': [str(medal.country) for medal in Medal.objects.all()]})
+        n_plus_one.query_budget = 3
+
+        def get_response(request):
+            middleware.process_view(request, n_plus_one, (), {})
+            return n_plus_one(request)
+        middleware = QueryBudgetMiddleware(get_response)
+
+        with self.assertRaisesMessage(QueryBudgetExceeded, 'n_plus_one : 6 requêtes SQL (budget 3)') as raised:
+            middleware(RequestFactory().get('/'))
+        self.assertIn('5× SELECT', str(raised.exception))
+
+    def test_streaming_queries_are_counted(self):
+        response = self.client.get('/api/medals/export/')
+        self.assertNotIn('Server-Timing', response)
+        queries_before_body = response.request_timing.query_count
+        self.assertEqual(len(b''.join(response.streaming_content).splitlines()), 5)
+        self.assertGreater(response.request_timing.query_count, queries_before_body)
+
+        with self.settings(QUERY_BUDGET=1):
+            response = self.client.get('/api/medals/export/')
+            with self.assertRaisesMessage(QueryBudgetExceeded, 'MedalViewSet'):
+                b''.join(response.streaming_content)
+
+
+class ProfilingTests(SampleDataTestCase):
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        settings = self.settings(PROFILING={'DIRECTORY': directory.name, 'ALLOWED_IPS': ['127.0.0.1']})
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_debug_header_from_allowed_ip(self):
+        france = Country.objects.get(country_name='France')
+        self.client.get(f'/api/countries/{france.id}/', HTTP_X_PROFILE='1', REMOTE_ADDR='10.0.0.1')
+        self.client.get(f'/api/countries/{france.id}/')
+        self.assertEqual(list(self.directory.iterdir()), [])
+
+        self.client.get(f'/api/countries/{france.id}/', HTTP_X_PROFILE='1')
+        [metadata_path] = self.directory.glob('*.json')
+        self.assertTrue(metadata_path.with_suffix('.prof').exists())
+        metadata = json.loads(metadata_path.read_text())
+        self.assertEqual(metadata['endpoint'], 'predictions.api_views.CountryViewSet.retrieve')
+        self.assertEqual(metadata['reason'], 'header')
+        self.assertEqual(metadata['query_count'], len(metadata['queries']))
+        self.assertGreater(metadata['query_count'], 0)
+
+    def test_report_aggregates_by_endpoint(self):
+        with self.settings(PROFILING={'DIRECTORY': str(self.directory), 'SAMPLE_RATE': 1.0}):
+            self.client.get('/api/countries/')
+            self.client.get('/api/countries/?page=1')
+            self.client.get('/api/games/')
+
+        out = StringIO()
+        call_command('profile_report', directory=str(self.directory), limit=5, stdout=out)
+        report = out.getvalue()
+        self.assertIn('CountryViewSet.list', report)
+        self.assertIn('2 profil(s)', report)
+        self.assertIn('OlympicGameViewSet.list', report)
+
+
+class ConditionalGetTests(SampleDataTestCase):
+
+
+    def test_api_answers_304_before_running_queries(self):
+        response = self.client.get('/api/countries/?page=1')
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/countries/?page=1', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        other = self.client.get('/api/countries/?page=2', HTTP_IF_NONE_MATCH=etag)
+        self.assertNotEqual(other.status_code, 304)
+
+        bump_data_version()
+        response = self.client.get('/api/countries/?page=1', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_html_pages_are_conditional(self):
+        response = self.client.get('/countries/')
+        response = self.client.get('/countries/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+
+class ResponseCacheTests(SampleDataTestCase):
+
+    def test_retrieve_is_served_from_cache_until_data_changes(self):
+        france = Country.objects.get(country_name='France')
+        first = self.client.get(f'/api/countries/{france.id}/')
+        self.assertNotIn('X-Cache', first)
+
+        # Seule la version des données est lue
+        with self.assertNumQueries(1):
+            second = self.client.get(f'/api/countries/{france.id}/')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.content, first.content)
+
+        bump_data_version()
+        self.assertNotIn('X-Cache', self.client.get(f'/api/countries/{france.id}/'))
+
+    def test_warm_up_bypasses_throttling(self):
+        # Cache froid, seaux minuscules et aucune place lourde : tout est quand même mis en cache
+        with self.settings(API_THROTTLE={'BURST': 5, 'MAX_HEAVY': 0, 'QUEUE_TIMEOUT': 0}):
+            self.assertEqual(warm_response_cache(hosts=['testserver']), 9)
+        self.assertEqual(heavy_requests.active, 0)
+        self.assertEqual(self.client.get('/api/countries/top/')['X-Cache'], 'HIT')
+
+    def test_query_parameters_are_normalized(self):
+        self.client.get('/api/medals/?type=gold&country=1')
+        self.assertEqual(self.client.get('/api/medals/?country=1&type=gold')['X-Cache'], 'HIT')
+
+    def test_browsable_api_is_not_cached(self):
+        self.client.get('/api/countries/top/', HTTP_ACCEPT='text/html')
+        self.assertNotIn('X-Cache', self.client.get('/api/countries/top/', HTTP_ACCEPT='text/html'))
+
+    def test_cached_responses_are_precompressed(self):
+        first = self.client.get('/api/countries/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(first['Content-Encoding'], 'gzip')
+        plain = gzip.decompress(first.content)
+
+        with mock.patch('predictions.compression.compress_string') as compress_string:
+            hit = self.client.get('/api/countries/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        compress_string.assert_not_called()
+        self.assertEqual(hit['X-Cache'], 'HIT')
+        self.assertEqual(hit['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', hit['Vary'])
+        self.assertEqual(gzip.decompress(hit.content), plain)
+
+        identity = self.client.get('/api/countries/', HTTP_ACCEPT_ENCODING='identity')
+        self.assertFalse(identity.has_header('Content-Encoding'))
+        self.assertEqual(identity.content, plain)
+
+    def test_encoding_negotiation(self):
+        self.assertEqual(negotiate_encoding('gzip, br', ('br', 'gzip')), 'br')
+        self.assertEqual(negotiate_encoding('br;q=0.5, gzip', ('br', 'gzip')), 'gzip')
+        self.assertEqual(negotiate_encoding('*', ('gzip',)), 'gzip')
+        self.assertIsNone(negotiate_encoding('identity', ('br', 'gzip')))
+        self.assertIsNone(negotiate_encoding(None, ('gzip',)))
+
+
+class SearchTests(SampleDataTestCase):
+
+    def setUp(self):
+        super().setUp()
+        rebuild_search_index()
+
+    def test_search_returns_ranked_typed_hits(self):
+        results = self.client.get('/api/search/?q=riner').json()['results']
+        self.assertEqual(results[0]['type'], 'athlete')
+        self.assertEqual(results[0]['object']['athlete_full_name'], 'Teddy RINER')
+        # La médaille de l'athlète est aussi trouvée, avec un score plus faible
+        self.assertEqual(results[1]['type'], 'medal')
+        self.assertGreater(results[0]['score'], results[1]['score'])
+
+        results = self.client.get('/api/search/?q=riner&type=medal').json()['results']
+        self.assertEqual([hit['type'] for hit in results], ['medal'])
+
+    def test_limit_must_be_positive(self):
+        self.assertEqual(len(self.client.get('/api/search/?q=riner&limit=1').json()['results']), 1)
+        for limit in ('0', '-1'):
+            self.assertEqual(self.client.get(f'/api/search/?q=riner&limit={limit}').status_code, 400)
+
+    def test_discipline_filter_matches_word_prefixes(self):
+        results = self.client.get('/api/medals/?discipline=jud').json()['results']
+        self.assertEqual({medal['discipline_title'] for medal in results}, {'Judo'})
+        self.assertEqual(len(results), 2)
+        results = self.client.get('/api/medals/?discipline=track').json()['results']
+        self.assertEqual([medal['discipline_title'] for medal in results], ['Cycling Track'])
+
+    def test_migration_fills_empty_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM predictions_search')
+        self.assertEqual(self.client.get('/api/medals/?discipline=jud').json()['results'], [])
+
+        caches['api'].clear()
+        migration = import_module('predictions.migrations.0008_fill_search_index')
+        migration.fill_search_index(None, mock.Mock(connection=connection))
+        self.assertEqual(len(self.client.get('/api/medals/?discipline=jud').json()['results']), 2)
+
+
+class AutocompleteTests(SampleDataTestCase):
+
+    def suggest(self, query, **params):
+        response = self.client.get('/api/autocomplete/', {'q': query, **params})
+        return [(hit['type'], hit['name']) for hit in response.json()['results']]
+
+    def test_matches_name_word_and_substring(self):
+        self.assertEqual(self.suggest('ted'), [('athlete', 'Teddy RINER')])
+        self.assertEqual(self.suggest('riner'), [('athlete', 'Teddy RINER')])
+        self.assertEqual(self.suggest('tal'), [('country', 'Italy')])
+        self.assertEqual(self.suggest('consta'), [('athlete', 'Stefania CONSTANTINI')])
+
+    def test_ranks_name_prefix_first_and_filters_by_type(self):
+        Athlete.objects.create(athlete_full_name='Franck FRANCE', athlete_url='https://olympics.com/en/athletes/x')
+        bump_data_version()
+        self.assertEqual(self.suggest('fran'), [('country', 'France'), ('athlete', 'Franck FRANCE')])
+        self.assertEqual(self.suggest('fran', type='athlete'), [('athlete', 'Franck FRANCE')])
+        self.assertEqual(self.suggest('fran', limit=1), [('country', 'France')])
+        # Début de nom avant début de mot
+        self.assertEqual(self.suggest('france', type='athlete'), [('athlete', 'Franck FRANCE')])
+        self.assertEqual(self.suggest('france'), [('country', 'France'), ('athlete', 'Franck FRANCE')])
+
+    def test_input_is_normalized(self):
+        self.assertEqual(self.suggest('  ÍTAL '), [('country', 'Italy')])
+        self.assertEqual(self.client.get('/api/autocomplete/?q=a&type=game').status_code, 400)
+
+
+class BoundedLocMemCacheTests(TestCase):
+
+    def test_evicts_least_recently_used_entries_over_byte_limit(self):
+        cache = BoundedLocMemCache('test-bounded', {'OPTIONS': {'MAX_BYTES': 2000, 'MAX_ENTRIES': 100}})
+        cache.clear()
+        cache.set('a', b'x' * 800)
+        cache.set('b', b'x' * 800)
+        cache.get('a')
+        cache.set('c', b'x' * 800)
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+        self.assertLessEqual(cache.size_in_bytes, 2000)
@@ -0,0 +1,176 @@
+"""
+Contrôle d'admission des requêtes de l'API.
+
+Chaque requête a un coût en jetons, estimé par la vue (voir
+`mixins.AdmissionControlMixin`) à partir de l'action, de ses paramètres et de
+la latence observée des requêtes précédentes sur le même endpoint.
+`CostThrottle` débite ce coût d'un seau à jetons par client (mémoire du
+processus) et plafonne le nombre de requêtes lourdes exécutées en même
+temps : une requête lourde attend brièvement qu'une place se libère, sinon
+elle est refusée (429 avec `Retry-After`). La place est rendue par
+`AdmissionControlMixin.finalize_response`.
+
+Les réponses servies depuis le cache (`CachedResponseMixin`) ou par un 304
+n'atteignent pas le throttle : seul le calcul effectif est compté.
+
+Réglages (`settings.API_THROTTLE`) : voir `DEFAULTS`.
+"""
+
+import math
+import threading
+import time
+
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+
+DEFAULTS = {
+    'RATE': 50,             # jetons rendus par seconde à chaque client
+    'BURST': 200,           # capacité du seau d'un client
+    'HEAVY_COST': 20,       # coût à partir duquel une requête est lourde
+    'MAX_HEAVY': 4,         # requêtes lourdes simultanées par processus
+    'QUEUE_TIMEOUT': 0.5,   # attente maximale d'une place (secondes)
+    'MS_PER_TOKEN': 50,     # latence observée convertie en jetons
+    'LATENCY_WEIGHT': 0.2,  # poids d'une nouvelle mesure dans la moyenne mobile
+}
+
+
+def throttle_setting(name):
+    return getattr(settings, 'API_THROTTLE', {}).get(name, DEFAULTS[name])
+
+
+class TokenBuckets:
+    """Seaux à jetons par client : `take` débite un coût ou indique l'attente nécessaire."""
+
+    def __init__(self):
+        self.buckets = {}  # client -> (jetons, instant de la dernière mise à jour)
+        self.lock = threading.Lock()
+
+    def take(self, ident, cost, now=None):
+        """Débite `cost` jetons ; retourne 0 ou le nombre de secondes à attendre."""
+        rate, burst = throttle_setting('RATE'), throttle_setting('BURST')
+        now = time.monotonic() if now is None else now
+        cost = min(cost, burst)  # une requête plus chère que le seau reste possible seau plein
+        with self.lock:
+            tokens, updated = self.buckets.get(ident, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            if tokens < cost:
+                self.buckets[ident] = (tokens, now)
+                return (cost - tokens) / rate
+            self.buckets[ident] = (tokens - cost, now)
+            if len(self.buckets) > 10000:
+                self._prune(now, burst / rate)
+            return 0
+
+    def refund(self, ident, cost):
+        """Rend les jetons d'une requête finalement refusée."""
+        burst = throttle_setting('BURST')
+        with self.lock:
+            if ident in self.buckets:
+                tokens, updated = self.buckets[ident]
+                self.buckets[ident] = (min(burst, tokens + min(cost, burst)), updated)
+
+    def _prune(self, now, refill_time):
+        """Oublie les clients dont le seau est de nouveau plein."""
+        self.buckets = {
+            ident: bucket for ident, bucket in self.buckets.items() if now - bucket[1] < refill_time
+        }
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class ConcurrencyLimiter:
+    """Nombre de requêtes lourdes en cours, borné ; attente limitée d'une place."""
+
+    def __init__(self):
+        self.active = 0
+        self.condition = threading.Condition()
+
+    def acquire(self, limit, timeout):
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while self.active >= limit:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+            self.active += 1
+            return True
+
+    def release(self):
+        with self.condition:
+            self.active -= 1
+            self.condition.notify()
+
+
+class LatencyTracker:
+    """Moyenne mobile exponentielle de la durée des requêtes par endpoint."""
+
+    def __init__(self):
+        self.latencies = {}
+        self.lock = threading.Lock()
+
+    def record(self, key, seconds):
+        weight = throttle_setting('LATENCY_WEIGHT')
+        with self.lock:
+            previous = self.latencies.get(key)
+            self.latencies[key] = seconds if previous is None else previous + weight * (seconds - previous)
+
+    def estimate(self, key):
+        """Durée moyenne observée (0 si aucune mesure)."""
+        return self.latencies.get(key, 0.0)
+
+    def clear(self):
+        with self.lock:
+            self.latencies.clear()
+
+
+buckets = TokenBuckets()
+heavy_requests = ConcurrencyLimiter()
+latencies = LatencyTracker()
+
+
+def latency_cost(key):
+    """Coût en jetons correspondant à la latence observée de l'endpoint."""
+    return math.ceil(latencies.estimate(key) * 1000 / throttle_setting('MS_PER_TOKEN'))
+
+
+def reset_admission_state():
+    """Vide les seaux et les latences mesurées (tests)."""
+    buckets.clear()
+    latencies.clear()
+
+
+class CostThrottle(BaseThrottle):
+    """
+    Throttle DRF au coût. Le coût vient de `view.get_request_cost(request)`
+    (1 pour les vues sans `AdmissionControlMixin`).
+
+    Les requêtes internes (`request.admission_exempt`, posé par
+    `response_cache.warm_response_cache`) ne sont ni décomptées ni limitées.
+    """
+    retry_after_heavy = 1
+
+    def allow_request(self, request, view):
+        if getattr(request, 'admission_exempt', False):
+            return True
+        get_cost = getattr(view, 'get_request_cost', None)
+        cost = get_cost(request) if get_cost is not None else 1
+        ident = self.get_ident(request)
+
+        self.wait_time = buckets.take(ident, cost)
+        if self.wait_time:
+            return False
+
+        if cost >= throttle_setting('HEAVY_COST'):
+            if not heavy_requests.acquire(throttle_setting('MAX_HEAVY'), throttle_setting('QUEUE_TIMEOUT')):
+                buckets.refund(ident, cost)
+                self.wait_time = self.retry_after_heavy
+                return False
+            request.admission_slot = True
+        return True
+
+    def wait(self):
+        return math.ceil(self.wait_time)
@@ -0,0 +1,55 @@
+"""
+Séries temporelles de médailles par pays.
+
+Les séries sont alignées sur le calendrier des jeux (`OlympicGame` par
+année) : la i-ème valeur de chaque tableau correspond au i-ème jeu de
+`games`, 0 si le pays n'y a pas été médaillé. Les valeurs viennent de la
+matrice précalculée `CountryGameStats` : une lecture indexée par
+(country, game) pour l'ensemble des pays demandés.
+"""
+
+from .models import OlympicGame, Country, CountryGameStats
+
+
+SEASONS = {'summer': 'Summer', 'winter': 'Winter'}
+SERIES = ('gold', 'silver', 'bronze', 'total')
+
+
+def game_calendar(season=None):
+    """Jeux dans l'ordre chronologique, éventuellement d'une seule saison."""
+    games = OlympicGame.objects.order_by('game_year', 'game_start_date')
+    if season is not None:
+        games = games.filter(game_season=SEASONS[season])
+    return list(games.values('id', 'game_name', 'game_year', 'game_season'))
+
+
+def medal_timeseries(country_ids, season=None):
+    """
+    Séries or / argent / bronze / total des pays demandés (dans l'ordre de
+    `country_ids`, pays inconnus ignorés).
+    """
+    games = game_calendar(season)
+    positions = {game['id']: index for index, game in enumerate(games)}
+
+    names = dict(Country.objects.filter(id__in=country_ids).values_list('id', 'country_name'))
+    series = {
+        country_id: {name: [0] * len(games) for name in SERIES}
+        for country_id in country_ids if country_id in names
+    }
+    rows = CountryGameStats.objects.filter(
+        country_id__in=list(series)
+    ).values_list('country_id', 'game_id', *SERIES)
+    for country_id, game_id, *values in rows:
+        index = positions.get(game_id)
+        if index is None:  # jeu d'une autre saison
+            continue
+        for name, value in zip(SERIES, values):
+            series[country_id][name][index] = value
+
+    return {
+        'games': games,
+        'countries': [
+            {'id': country_id, 'country_name': names[country_id], **values}
+            for country_id, values in series.items()
+        ],
+    }
@@ -13,5 +13,6 @@ urlpatterns = [
     path('games/', views.games_list, name='games_list'),
     path('games/<int:game_id>/', views.game_detail, name='game_detail'),
     path('athletes/', views.athletes_list, name='athletes_list'),
+    path('athletes/leaderboard/', views.athletes_leaderboard, name='athletes_leaderboard'),
     path('predictions/', views.predictions_list, name='predictions_list'),
 ]
@@ -0,0 +1,75 @@
+"""
+Gestion de la version globale des données.
+
+Les données ne changent que lors de l'exécution de `import_data.py` ou de
+`generate_predictions.py` : ces scripts appellent `bump_data_version()`.
+Les vues utilisent `get_data_version()` pour construire leurs clés de cache
+et leurs en-têtes ETag / Last-Modified.
+
+Pendant une requête HTTP (voir `middleware.DataVersionMiddleware`), la
+version n'est lue qu'une seule fois en base puis mémorisée pour la requête.
+"""
+
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models import F
+
+from .models import DataVersion
+
+
+DATA_VERSION_PK = 1
+
+# Mémo de la version pour la requête en cours (None hors requête)
+_request_memo = ContextVar('data_version_memo', default=None)
+
+
+def begin_request_scope():
+    """Ouvre un mémo de version pour la requête courante ; retourne le jeton de reset."""
+    return _request_memo.set({})
+
+
+def end_request_scope(token):
+    """Ferme le mémo ouvert par `begin_request_scope`."""
+    _request_memo.reset(token)
+
+
+def get_data_version_info():
+    """Retourne le couple (version, date de mise à jour) ; (0, None) avant le premier import."""
+    memo = _request_memo.get()
+    if memo is not None and 'info' in memo:
+        return memo['info']
+    
+    row = DataVersion.objects.filter(pk=DATA_VERSION_PK).values_list(
+        'version', 'updated_at'
+    ).first()
+    info = row if row is not None else (0, None)
+    if memo is not None:
+        memo['info'] = info
+    return info
+
+
+def get_data_version():
+    """Retourne la version courante des données (0 avant le premier import)."""
+    return get_data_version_info()[0]
+
+
+def bump_data_version(changes=None):
+    """
+    Incrémente la version des données et retourne la nouvelle valeur.
+    `changes` (un `changes.ChangeTracker`) est enregistré sous la nouvelle
+    version dans la même transaction.
+    """
+    with transaction.atomic():
+        DataVersion.objects.get_or_create(pk=DATA_VERSION_PK)
+        data_version = DataVersion.objects.select_for_update().get(pk=DATA_VERSION_PK)
+        data_version.version = F('version') + 1
+        data_version.save(update_fields=['version', 'updated_at'])
+        data_version.refresh_from_db(fields=['version'])
+        if changes is not None:
+            changes.save(data_version.version)
+    
+    memo = _request_memo.get()
+    if memo is not None:
+        memo.clear()
+    return data_version.version
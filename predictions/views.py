@@ -1,23 +1,28 @@
 from django.shortcuts import render, get_object_or_404
 from django.db.models import Count, Q
 from .models import OlympicGame, Athlete, Country, Medal, CountryPrediction
+from .conditional import conditional_on_data_version
+from .stats import get_overview
 
 
+@conditional_on_data_version
 def home(request):
     """
     Vue principale affichant les statistiques globales.
     """
+    overview = get_overview()
     context = {
-        'total_games': OlympicGame.objects.count(),
-        'total_athletes': Athlete.objects.count(),
-        'total_countries': Country.objects.count(),
-        'total_medals': Medal.objects.count(),
+        'total_games': overview['total_games'],
+        'total_athletes': overview['total_athletes'],
+        'total_countries': overview['total_countries'],
+        'total_medals': overview['total_medals'],
         'top_countries': Country.objects.all()[:10],
         'recent_games': OlympicGame.objects.all()[:5],
     }
     return render(request, 'predictions/home.html', context)
 
 
+@conditional_on_data_version
 def countries_list(request):
     """
     Vue listant tous les pays avec leurs statistiques.
@@ -29,6 +34,7 @@ def countries_list(request):
     return render(request, 'predictions/countries_list.html', context)
 
 
+@conditional_on_data_version
 def country_detail(request, country_id):
     """
     Vue détaillée d'un pays avec ses médailles.
@@ -49,6 +55,7 @@ def country_detail(request, country_id):
     return render(request, 'predictions/country_detail.html', context)
 
 
+@conditional_on_data_version
 def games_list(request):
     """
     Vue listant tous les jeux olympiques.
@@ -60,6 +67,7 @@ def games_list(request):
     return render(request, 'predictions/games_list.html', context)
 
 
+@conditional_on_data_version
 def game_detail(request, game_id):
     """
     Vue détaillée d'un jeu olympique avec les médailles.
@@ -82,6 +90,7 @@ def game_detail(request, game_id):
     return render(request, 'predictions/game_detail.html', context)
 
 
+@conditional_on_data_version
 def athletes_list(request):
     """
     Vue listant les athlètes.
@@ -93,6 +102,21 @@ def athletes_list(request):
     return render(request, 'predictions/athletes_list.html', context)
 
 
+@conditional_on_data_version
+def athletes_leaderboard(request):
+    """
+    Vue listant les 100 athlètes les plus médaillés (index du palmarès).
+    """
+    athletes = Athlete.objects.filter(total_medals__gt=0).select_related(
+        'medal_country'
+    ).order_by('-total_medals', 'id')[:100]
+    context = {
+        'athletes': athletes,
+    }
+    return render(request, 'predictions/athletes_leaderboard.html', context)
+
+
+@conditional_on_data_version
 def predictions_list(request):
     """
     Vue affichant les prédictions pour les prochains jeux.